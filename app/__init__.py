@@ -1,7 +1,22 @@
 from flask import Flask, render_template, jsonify
 
 from .config import get_config
-from .extensions import jwt, close_db
+from .db_pool import PoolTimeoutError
+from .extensions import (
+    jwt,
+    db_pool,
+    invalidation_bus,
+    login_log_buffer,
+    metrics,
+    model_cache,
+    password_hasher,
+    query_auditor,
+    token_cache,
+    account_cache,
+    partner_directory,
+    close_db,
+)
+from .hashing import HashingBusyError
 from .models.login_log_model import is_token_active
 from flask_jwt_extended import (
     JWTManager,
@@ -16,6 +31,34 @@ def create_app():
 
     # Initialize extensions
     jwt.init_app(app)
+    db_pool.init_app(app)
+    password_hasher.init_app(app)
+    login_log_buffer.init_app(app)
+    metrics.init_app(app)
+    query_auditor.init_app(app)
+    model_cache.init_app(app)
+    token_cache.configure(
+        maxsize=app.config["TOKEN_CACHE_SIZE"], ttl=app.config["TOKEN_CACHE_TTL"]
+    )
+    account_cache.configure(
+        maxsize=app.config["ACCOUNT_CACHE_SIZE"], ttl=app.config["ACCOUNT_CACHE_TTL"]
+    )
+    partner_directory.configure(
+        maxsize=app.config["PARTNER_DIRECTORY_SIZE"],
+        ttl=app.config["PARTNER_DIRECTORY_TTL"],
+    )
+
+    # Per-process caches; their write paths publish invalidations through
+    # the bus so every worker drops the entry.
+    invalidation_bus.init_app(app)
+    invalidation_bus.register("token", token_cache.invalidate, token_cache.clear)
+    invalidation_bus.register("account", account_cache.invalidate, account_cache.clear)
+    invalidation_bus.register(
+        "partner_directory", lambda key: partner_directory.clear(), partner_directory.clear
+    )
+    if model_cache.enabled and not getattr(model_cache.backend, "shared", False):
+        invalidation_bus.register("model_cache", model_cache.bump, model_cache.clear)
+        model_cache.publisher = lambda tags: invalidation_bus.publish("model_cache", tags)
 
     # JWT token blacklist / error handlers using login_logs
     @jwt.token_in_blocklist_loader
@@ -55,6 +98,11 @@ def create_app():
     # DB teardown
     app.teardown_appcontext(close_db)
 
+    # CLI commands (`flask stats ...`)
+    from .cli import register_commands
+
+    register_commands(app)
+
     # Blueprints
     from .auth.routes import auth_bp
     from .admin.routes import admin_bp
@@ -80,5 +128,13 @@ def create_app():
     def internal_error(error):
         return render_template("errors/500.html"), 500
 
+    @app.errorhandler(PoolTimeoutError)
+    @app.errorhandler(HashingBusyError)
+    def service_busy(error):
+        return (
+            jsonify({"msg": "Service is busy. Please retry shortly."}),
+            503,
+        )
+
     return app
 
@@ -1,33 +1,87 @@
 from datetime import datetime
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash
-from flask_jwt_extended import jwt_required
+from flask import (
+    Blueprint,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
+from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from ..auth.decorators import admin_required
 from ..models.partner_model import (
     list_partners,
+    count_partners,
     create_partner,
     update_partner_profile_admin,
     set_partner_status,
     soft_delete_partner,
     get_partner_by_id,
-    count_active_partners,
+    get_partner_name,
+    lookup_partners,
 )
 from ..models.lead_model import (
     list_leads_admin,
+    iter_leads_admin,
     get_lead_by_id,
     update_lead_status,
-    get_admin_lead_metrics,
-    get_partner_performance,
+    bulk_update_lead_status,
+    iter_partner_performance,
 )
 from ..models.payment_model import (
     list_payments_admin,
+    iter_payments_admin,
     mark_payment_released,
-    get_admin_payment_metrics,
 )
+from ..models.pagination import clamp_page_size
+from ..reports.snapshot import get_admin_dashboard_snapshot
+from .export import export_response
 
 admin_bp = Blueprint("admin", __name__, template_folder="../templates/admin")
 
+LEAD_STATUSES = {"Pending", "In-Process", "Converted", "Not Converted"}
+
+LEAD_EXPORT_COLUMNS = [
+    "id",
+    "partner_id",
+    "student_name",
+    "mobile",
+    "email",
+    "address",
+    "current_status",
+    "lead_status",
+    "created_at",
+    "conversion_date",
+]
+PAYMENT_EXPORT_COLUMNS = [
+    "id",
+    "partner_id",
+    "lead_id",
+    "amount",
+    "status",
+    "due_date",
+    "released_date",
+    "created_at",
+]
+PERFORMANCE_EXPORT_COLUMNS = [
+    "partner_id",
+    "partner_name",
+    "total_leads",
+    "converted_leads",
+    "pending_amount",
+    "released_amount",
+]
+
+
+def _date_arg(name: str):
+    """Parse a YYYY-MM-DD query arg; returns (raw, datetime or None)."""
+    raw = request.args.get(name) or None
+    return raw, datetime.strptime(raw, "%Y-%m-%d") if raw else None
+
 
 @admin_bp.get("/dashboard")
 @jwt_required()
@@ -36,17 +90,28 @@ def dashboard():
     """
     Admin analytics dashboard.
     """
-    total_partners = count_active_partners()
-    lead_metrics = get_admin_lead_metrics()
-    payment_metrics = get_admin_payment_metrics()
-    partner_perf = get_partner_performance()
+    snapshot = get_admin_dashboard_snapshot()
 
     return render_template(
         "admin/dashboard.html",
-        total_partners=total_partners,
-        lead_metrics=lead_metrics,
-        payment_metrics=payment_metrics,
-        partner_performance=partner_perf,
+        total_partners=snapshot["total_partners"],
+        lead_metrics=snapshot["lead_metrics"],
+        payment_metrics=snapshot["payment_metrics"],
+        partner_performance=snapshot["partner_performance"],
+        partial=snapshot["partial"],
+    )
+
+
+@admin_bp.get("/performance/export")
+@jwt_required()
+@admin_required
+def performance_export():
+    """Stream partner-wise performance as CSV / NDJSON."""
+    return export_response(
+        iter_partner_performance(),
+        PERFORMANCE_EXPORT_COLUMNS,
+        request.args.get("format", "csv"),
+        "partner_performance",
     )
 
 
@@ -59,24 +124,42 @@ def dashboard():
 @jwt_required()
 @admin_required
 def partners_list():
-    page = max(int(request.args.get("page", 1)), 1)
-    status_filter = request.args.get("status") or None
-
-    partners, total = list_partners(page=page, per_page=20, status=status_filter)
-    has_next = total > page * 20
-    has_prev = page > 1
+    status_filter = request.args.get("status")
+    if status_filter not in {"active", "inactive"}:
+        status_filter = None
+    q = (request.args.get("q") or "").strip()
+    per_page = clamp_page_size(request.args.get("per_page", type=int))
+
+    partners, next_cursor, prev_cursor = list_partners(
+        status=status_filter,
+        search=q or None,
+        after=request.args.get("after") or None,
+        before=request.args.get("before") or None,
+        limit=per_page,
+    )
+    # The rollup has no per-prefix counts, so searches show no total.
+    total = None if q else count_partners(status_filter)
 
     return render_template(
         "admin/partners.html",
         partners=partners,
         total=total,
-        page=page,
-        has_next=has_next,
-        has_prev=has_prev,
         status_filter=status_filter,
+        q=q,
+        per_page=per_page,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
     )
 
 
+@admin_bp.get("/partners/lookup")
+@jwt_required()
+@admin_required
+def partners_lookup():
+    """Typeahead for the partner filters: ?q=<name or mobile prefix>."""
+    return jsonify({"partners": lookup_partners(request.args.get("q", ""))}), 200
+
+
 @admin_bp.post("/partners/create")
 @jwt_required()
 @admin_required
@@ -182,32 +265,53 @@ def partners_delete(partner_id: int):
 def leads_list():
     partner_id = request.args.get("partner_id", type=int)
     status = request.args.get("status") or None
-    date_from_raw = request.args.get("date_from") or None
-    date_to_raw = request.args.get("date_to") or None
+    q = (request.args.get("q") or "").strip()
+    date_from_raw, date_from = _date_arg("date_from")
+    date_to_raw, date_to = _date_arg("date_to")
+    per_page = clamp_page_size(request.args.get("per_page", type=int))
 
-    date_from = (
-        datetime.strptime(date_from_raw, "%Y-%m-%d") if date_from_raw else None
-    )
-    date_to = datetime.strptime(date_to_raw, "%Y-%m-%d") if date_to_raw else None
-
-    leads = list_leads_admin(
+    leads, next_cursor, prev_cursor = list_leads_admin(
         partner_id=partner_id,
         status=status,
         date_from=date_from,
         date_to=date_to,
+        after=request.args.get("after") or None,
+        before=request.args.get("before") or None,
+        limit=per_page,
+        search=q or None,
     )
 
-    # For filter dropdowns we reuse partners list (first page only)
-    partners, _ = list_partners(page=1, per_page=100)
-
     return render_template(
         "admin/leads.html",
         leads=leads,
-        partners=partners,
         partner_id=partner_id,
+        partner_name=get_partner_name(partner_id) if partner_id else None,
         status=status,
+        q=q,
         date_from=date_from_raw,
         date_to=date_to_raw,
+        per_page=per_page,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+
+
+@admin_bp.get("/leads/export")
+@jwt_required()
+@admin_required
+def leads_export():
+    """Stream all leads matching the list filters as CSV / NDJSON."""
+    _, date_from = _date_arg("date_from")
+    _, date_to = _date_arg("date_to")
+    rows = iter_leads_admin(
+        partner_id=request.args.get("partner_id", type=int),
+        status=request.args.get("status") or None,
+        date_from=date_from,
+        date_to=date_to,
+        search=(request.args.get("q") or "").strip() or None,
+    )
+    return export_response(
+        rows, LEAD_EXPORT_COLUMNS, request.args.get("format", "csv"), "leads"
     )
 
 
@@ -216,9 +320,8 @@ def leads_list():
 @admin_required
 def leads_update_status(lead_id: int):
     new_status = request.form.get("status") or ""
-    allowed_statuses = {"Pending", "In-Process", "Converted", "Not Converted"}
 
-    if new_status not in allowed_statuses:
+    if new_status not in LEAD_STATUSES:
         flash("Invalid status.", "error")
         return redirect(url_for("admin.leads_list"))
 
@@ -254,6 +357,68 @@ def leads_update_status(lead_id: int):
     return redirect(url_for("admin.leads_list"))
 
 
+@admin_bp.post("/leads/bulk-status")
+@jwt_required()
+@admin_required
+def leads_bulk_status():
+    """
+    Set the status of many leads at once.
+
+    JSON body {"lead_ids": [...], "status": "..."} returns per-lead outcomes;
+    the leads page form (checked `lead_ids` + `status`) gets a flash summary.
+    """
+    if request.is_json:
+        data = request.get_json(silent=True) or {}
+        raw_ids = data.get("lead_ids") or []
+        new_status = data.get("status") or ""
+        # bool is an int subclass, and a string would be split into digits.
+        if not isinstance(raw_ids, list) or not all(
+            isinstance(i, int) and not isinstance(i, bool) for i in raw_ids
+        ):
+            return jsonify({"msg": "`lead_ids` must be a list of integers"}), 400
+    else:
+        raw_ids = request.form.getlist("lead_ids")
+        new_status = request.form.get("status") or ""
+
+    try:
+        lead_ids = [int(lead_id) for lead_id in raw_ids]
+    except (TypeError, ValueError):
+        lead_ids = None
+    max_leads = current_app.config["LEAD_BULK_STATUS_MAX"]
+
+    error = None
+    if new_status not in LEAD_STATUSES:
+        error = "Invalid status."
+    elif not lead_ids:
+        error = "Select at least one lead."
+    elif len(lead_ids) > max_leads:
+        error = f"At most {max_leads} leads can be updated at once."
+    if error:
+        if request.is_json:
+            return jsonify({"msg": error}), 400
+        flash(error, "error")
+        return redirect(url_for("admin.leads_list"))
+
+    identity = get_jwt_identity() or {}
+    outcome = bulk_update_lead_status(
+        lead_ids=lead_ids,
+        new_status=new_status,
+        changed_by_type="admin",
+        changed_by_id=identity.get("id") or 0,
+    )
+
+    if request.is_json:
+        return jsonify(outcome), 200
+
+    skipped = len(outcome["results"]) - outcome["updated"]
+    flash(
+        f"{outcome['updated']} lead(s) updated, {skipped} skipped, "
+        f"{outcome['payments_created']} payment(s) created.",
+        "success",
+    )
+    return redirect(url_for("admin.leads_list"))
+
+
 # -------------------------
 # Payment management
 # -------------------------
@@ -265,30 +430,48 @@ def leads_update_status(lead_id: int):
 def payments_list():
     partner_id = request.args.get("partner_id", type=int)
     status = request.args.get("status") or None
-    due_from_raw = request.args.get("due_from") or None
-    due_to_raw = request.args.get("due_to") or None
-
-    due_from = (
-        datetime.strptime(due_from_raw, "%Y-%m-%d") if due_from_raw else None
-    )
-    due_to = datetime.strptime(due_to_raw, "%Y-%m-%d") if due_to_raw else None
+    due_from_raw, due_from = _date_arg("due_from")
+    due_to_raw, due_to = _date_arg("due_to")
+    per_page = clamp_page_size(request.args.get("per_page", type=int))
 
-    payments = list_payments_admin(
+    payments, next_cursor, prev_cursor = list_payments_admin(
         partner_id=partner_id,
         status=status,
         due_from=due_from,
         due_to=due_to,
+        after=request.args.get("after") or None,
+        before=request.args.get("before") or None,
+        limit=per_page,
     )
-    partners, _ = list_partners(page=1, per_page=100)
-
     return render_template(
         "admin/payments.html",
         payments=payments,
-        partners=partners,
         partner_id=partner_id,
+        partner_name=get_partner_name(partner_id) if partner_id else None,
         status=status,
         due_from=due_from_raw,
         due_to=due_to_raw,
+        per_page=per_page,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+
+
+@admin_bp.get("/payments/export")
+@jwt_required()
+@admin_required
+def payments_export():
+    """Stream all payments matching the list filters as CSV / NDJSON."""
+    _, due_from = _date_arg("due_from")
+    _, due_to = _date_arg("due_to")
+    rows = iter_payments_admin(
+        partner_id=request.args.get("partner_id", type=int),
+        status=request.args.get("status") or None,
+        due_from=due_from,
+        due_to=due_to,
+    )
+    return export_response(
+        rows, PAYMENT_EXPORT_COLUMNS, request.args.get("format", "csv"), "payments"
     )
 
 
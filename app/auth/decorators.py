@@ -37,20 +37,14 @@ def _role_required(required_role: str):
             # Extra safety: ensure underlying user account is still active.
             user_id = identity.get("id")
             if required_role == "admin":
-                from ..models.admin_model import get_admin_by_id
+                from ..models.admin_model import is_admin_active
 
-                admin = get_admin_by_id(user_id)
-                if not admin or not admin.get("is_active"):
+                if not is_admin_active(user_id):
                     return jsonify({"msg": "Admin account is inactive."}), 403
             elif required_role == "partner":
-                from ..models.partner_model import get_partner_by_id
-
-                partner = get_partner_by_id(user_id)
-                if (
-                    not partner
-                    or partner.get("is_deleted")
-                    or partner.get("status") != "active"
-                ):
+                from ..models.partner_model import is_partner_active
+
+                if not is_partner_active(user_id):
                     return jsonify({"msg": "Partner account is inactive."}), 403
 
             return fn(*args, **kwargs)
@@ -6,15 +6,33 @@ from flask_jwt_extended import (
     get_jwt_identity,
     jwt_required,
     decode_token,
+    set_access_cookies,
+    unset_jwt_cookies,
 )
 
-from ..extensions import check_password
-from ..models.admin_model import get_admin_by_email
-from ..models.partner_model import get_partner_by_mobile
+from ..extensions import check_password, hash_password, password_needs_rehash
+from ..hashing import HashingBusyError
+from ..models.admin_model import get_admin_by_email, update_admin_password_hash
+from ..models.partner_model import get_partner_by_mobile, update_partner_password_hash
 from ..models.login_log_model import log_login, deactivate_session, is_token_active
 
 auth_bp = Blueprint("auth", __name__)
 
+
+def _rehash_if_needed(stored_hash: str, password: str, save) -> None:
+    """
+    Re-hash a just-verified password when BCRYPT_ROUNDS changed.
+
+    Best effort: a saturated bcrypt pool just postpones it to a later login.
+    """
+    if not password_needs_rehash(stored_hash):
+        return
+    try:
+        save(hash_password(password))
+    except HashingBusyError:
+        pass
+
+
 @auth_bp.get("/admin-login")
 def admin_login_page():
     return render_template("auth/admin_login.html")
@@ -40,6 +58,11 @@ def admin_login():
 
     if not check_password(password, admin["password_hash"]):
         return jsonify({"msg": "Invalid credentials"}), 401
+    _rehash_if_needed(
+        admin["password_hash"],
+        password,
+        lambda new_hash: update_admin_password_hash(admin["id"], new_hash),
+    )
 
     identity = {"id": admin["id"], "role": "admin"}
     additional_claims = {"role": "admin"}
@@ -60,21 +83,20 @@ def admin_login():
     if jti:
         log_login("admin", admin["id"], ip, ua, jti)
 
-    return (
-        jsonify(
-            {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "user": {
-                    "id": admin["id"],
-                    "name": admin.get("name"),
-                    "email": admin["email"],
-                    "role": "admin",
-                },
-            }
-        ),
-        200,
+    response = jsonify(
+        {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "user": {
+                "id": admin["id"],
+                "name": admin.get("name"),
+                "email": admin["email"],
+                "role": "admin",
+            },
+        }
     )
+    set_access_cookies(response, access_token)
+    return response, 200
 
 
 @auth_bp.get("/partner-login")
@@ -99,6 +121,11 @@ def partner_login():
 
     if not check_password(password, partner["password_hash"]):
         return jsonify({"msg": "Invalid credentials"}), 401
+    _rehash_if_needed(
+        partner["password_hash"],
+        password,
+        lambda new_hash: update_partner_password_hash(partner["id"], new_hash),
+    )
 
     identity = {"id": partner["id"], "role": "partner"}
     additional_claims = {"role": "partner"}
@@ -117,21 +144,20 @@ def partner_login():
     if jti:
         log_login("partner", partner["id"], ip, ua, jti)
 
-    return (
-        jsonify(
-            {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "user": {
-                    "id": partner["id"],
-                    "name": partner.get("name"),
-                    "mobile": partner["mobile"],
-                    "role": "partner",
-                },
-            }
-        ),
-        200,
+    response = jsonify(
+        {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "user": {
+                "id": partner["id"],
+                "name": partner.get("name"),
+                "mobile": partner["mobile"],
+                "role": "partner",
+            },
+        }
     )
+    set_access_cookies(response, access_token)
+    return response, 200
 
 
 @auth_bp.post("/refresh")
@@ -159,7 +185,9 @@ def logout():
     jti = get_jwt().get("jti")
     if jti:
         deactivate_session(jti)
-    return jsonify({"msg": "Logged out successfully"}), 200
+    response = jsonify({"msg": "Logged out successfully"})
+    unset_jwt_cookies(response)
+    return response, 200
 
 
 @auth_bp.get("/me")
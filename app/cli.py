@@ -0,0 +1,95 @@
+import click
+from flask.cli import AppGroup
+
+stats_cli = AppGroup("stats", help="Maintain reporting rollup tables.")
+db_cli = AppGroup("db", help="Schema migrations and query plan checks.")
+
+
+@stats_cli.command("rebuild")
+def rebuild_stats():
+    """Rebuild the reporting rollups from their source tables."""
+    from .models.lead_model import rebuild_lead_daily_stats
+    from .models.partner_model import rebuild_partner_counts
+    from .models.partner_stats_model import rebuild_partner_stats
+
+    days = rebuild_lead_daily_stats()
+    click.echo(f"lead_daily_stats rebuilt ({days} days).")
+    statuses = rebuild_partner_counts()
+    click.echo(f"partner_counts rebuilt ({statuses} statuses).")
+    partners = rebuild_partner_stats()
+    click.echo(f"partner_stats rebuilt ({partners} partners).")
+
+
+@db_cli.command("upgrade")
+@click.option("--target", type=int, default=None, help="Stop at this version.")
+def db_upgrade(target):
+    """Apply pending schema migrations."""
+    from .migrations import upgrade
+
+    applied = upgrade(target=target, echo=click.echo)
+    click.echo(f"Applied {len(applied)} migration(s).")
+
+
+@db_cli.command("current")
+def db_current():
+    """Show applied and pending migrations."""
+    from .migrations import applied_versions, available_migrations
+
+    done = applied_versions()
+    for version, name, _ in available_migrations():
+        state = "applied" if version in done else "pending"
+        click.echo(f"{version:04d}_{name}: {state}")
+
+
+@db_cli.command("check")
+@click.option("--verbose", is_flag=True, help="Print every statement checked.")
+def db_check(verbose):
+    """EXPLAIN every model query and flag full scans (exit 1 on table scans)."""
+    from .migrations.explain import run_checks, scan_problems
+
+    full_scans = 0
+    for finding in run_checks():
+        problems = scan_problems(finding["plan"])
+        if problems or verbose:
+            status = "FLAG" if problems else "ok"
+            click.echo(f"[{status}] {finding['check']}: {finding['statement'][:160]}")
+        for problem in problems:
+            click.echo(f"    {problem}")
+            if problem.startswith("FULL TABLE SCAN"):
+                full_scans += 1
+    click.echo(f"{full_scans} full table scan(s) found.")
+    if full_scans:
+        raise SystemExit(1)
+
+
+@click.command("seed")
+@click.option("--partners", default=1000, show_default=True, help="Partners to create.")
+@click.option("--leads", default=100000, show_default=True, help="Leads to create.")
+@click.option("--login-logs", default=100000, show_default=True, help="login_logs rows.")
+@click.option("--days", default=365, show_default=True, help="Spread rows over this many days.")
+@click.option("--skew", default=1.1, show_default=True, help="Zipf exponent of leads per partner.")
+@click.option("--batch-size", default=5000, show_default=True, help="Rows per INSERT / commit.")
+@click.option("--seed", "seed_value", default=42, show_default=True, help="Random seed.")
+def seed_command(partners, leads, login_logs, days, skew, batch_size, seed_value):
+    """Append synthetic data at scale (local / benchmark databases only)."""
+    from .seed import BENCH_ADMIN_EMAIL, SEED_PASSWORD, seed
+
+    counts = seed(
+        partners=partners,
+        leads=leads,
+        login_logs=login_logs,
+        days=days,
+        skew=skew,
+        batch_size=max(batch_size, 1),
+        seed_value=seed_value,
+        echo=click.echo,
+    )
+    click.echo(", ".join(f"{table}: {n}" for table, n in counts.items()))
+    click.echo(f"Admin login: {BENCH_ADMIN_EMAIL} / {SEED_PASSWORD}")
+
+
+def register_commands(app) -> None:
+    """Attach the project's `flask` CLI command groups to `app`."""
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(seed_command)
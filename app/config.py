@@ -20,12 +20,89 @@ class Config:
     MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "0522nivesh#")
     MYSQL_DB = os.getenv("MYSQL_DB", "admission_partner_portal")
 
-    # JWT configuration
-    JWT_TOKEN_LOCATION = ["headers"]
+    # Connection pool (per worker process)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))  # seconds
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds, 0 = never
+
+    # JWT configuration. API clients send the Authorization header; logins
+    # also set the access token as an HttpOnly cookie so same-origin page
+    # scripts (e.g. the partner typeahead) are authenticated without
+    # handling the token. Unsafe methods via the cookie need the CSRF header.
+    JWT_TOKEN_LOCATION = ["headers", "cookies"]
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=7)
     JWT_COOKIE_SECURE = False  # set True in production with HTTPS
 
+    # Write-behind batching of login_logs inserts (off by default). A login
+    # becomes visible to other workers only once flushed, so keep the
+    # interval short in multi-worker deployments.
+    LOGIN_LOG_WRITE_BEHIND = os.getenv("LOGIN_LOG_WRITE_BEHIND", "0") == "1"
+    LOGIN_LOG_BATCH_SIZE = int(os.getenv("LOGIN_LOG_BATCH_SIZE", "200"))
+    LOGIN_LOG_FLUSH_INTERVAL = float(os.getenv("LOGIN_LOG_FLUSH_INTERVAL", "0.5"))  # seconds
+    LOGIN_LOG_QUEUE_SIZE = int(os.getenv("LOGIN_LOG_QUEUE_SIZE", "10000"))
+
+    # Per-worker cache of active JWT IDs. Logouts reach other workers through
+    # the invalidation bus; the TTL is the fallback bound if it is off or
+    # failing. 0 disables the cache.
+    TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "15"))  # seconds
+
+    # bcrypt cost and the per-worker pool that runs it. Logins beyond
+    # BCRYPT_MAX_WORKERS + BCRYPT_MAX_QUEUE in flight get a 503.
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_MAX_WORKERS = int(os.getenv("BCRYPT_MAX_WORKERS", "2"))
+    BCRYPT_MAX_QUEUE = int(os.getenv("BCRYPT_MAX_QUEUE", "8"))
+    BCRYPT_TIMEOUT = float(os.getenv("BCRYPT_TIMEOUT", "10"))  # seconds
+
+    # Per-worker cache of admin/partner account state used by the role checks.
+    ACCOUNT_CACHE_SIZE = int(os.getenv("ACCOUNT_CACHE_SIZE", "10000"))
+    ACCOUNT_CACHE_TTL = float(os.getenv("ACCOUNT_CACHE_TTL", "15"))  # seconds
+
+    # Per-worker cache behind the admin partner typeahead, cleared by partner
+    # writes (on every worker, through the invalidation bus).
+    PARTNER_DIRECTORY_SIZE = int(os.getenv("PARTNER_DIRECTORY_SIZE", "2000"))
+    PARTNER_DIRECTORY_TTL = float(os.getenv("PARTNER_DIRECTORY_TTL", "60"))  # seconds
+
+    # Prometheus metrics on /metrics (per worker process), off by default.
+    # Scrapers must send "Authorization: Bearer <METRICS_TOKEN>", which is
+    # required once enabled. A non-empty METRICS_ALLOWED_IPS additionally
+    # limits the client address (behind a proxy that is the proxy's).
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+    METRICS_ALLOWED_IPS = [
+        ip.strip()
+        for ip in os.getenv("METRICS_ALLOWED_IPS", "").split(",")
+        if ip.strip()
+    ]
+
+    # Opt-in query auditor: slow-query log and N+1 detection per request.
+    # QUERY_AUDIT_REPORT logs every request's statements.
+    QUERY_AUDIT = os.getenv("QUERY_AUDIT", "0") == "1"
+    QUERY_AUDIT_SLOW_MS = float(os.getenv("QUERY_AUDIT_SLOW_MS", "100"))
+    QUERY_AUDIT_REPEAT_THRESHOLD = int(os.getenv("QUERY_AUDIT_REPEAT_THRESHOLD", "3"))
+    QUERY_AUDIT_REPORT = os.getenv("QUERY_AUDIT_REPORT", "0") == "1"
+
+    # Cross-worker cache invalidation (app/invalidation.py): "db" polls the
+    # cache_invalidations table, "none" keeps invalidations in-process
+    # (single worker only), or "module:factory" for another transport.
+    INVALIDATION_TRANSPORT = os.getenv("INVALIDATION_TRANSPORT", "db")
+    INVALIDATION_POLL_INTERVAL = float(os.getenv("INVALIDATION_POLL_INTERVAL", "1"))  # seconds
+    INVALIDATION_RETENTION = float(os.getenv("INVALIDATION_RETENTION", "3600"))  # seconds
+    # How long a skipped id (a publish not committed yet) is looked for.
+    INVALIDATION_GAP_TIMEOUT = float(os.getenv("INVALIDATION_GAP_TIMEOUT", "30"))  # seconds
+
+    # Read-through cache for model reads (app/model_cache.py), invalidated by
+    # the model write paths. MODEL_CACHE_BACKEND is "memory" (per worker,
+    # kept in sync through the invalidation bus), a redis:// URL or
+    # "module:factory".
+    MODEL_CACHE = os.getenv("MODEL_CACHE", "0") == "1"
+    MODEL_CACHE_BACKEND = os.getenv("MODEL_CACHE_BACKEND", "memory")
+    MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "4096"))
+    MODEL_CACHE_TTL = float(os.getenv("MODEL_CACHE_TTL", "30"))  # seconds
+
     # Security headers
     SESSION_COOKIE_SECURE = False  # set True in production with HTTPS
     REMEMBER_COOKIE_SECURE = False
@@ -33,11 +110,31 @@ class Config:
 
     # Business configuration
     DEFAULT_CONVERSION_AMOUNT = float(os.getenv("DEFAULT_CONVERSION_AMOUNT", "10000.0"))
+    LEAD_IMPORT_MAX_ROWS = int(os.getenv("LEAD_IMPORT_MAX_ROWS", "10000"))
+    # Largest request body accepted (lead imports included); Flask answers
+    # bigger ones with 413 before the view runs.
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", str(16 * 1024 * 1024)))  # bytes
+    LEAD_BULK_STATUS_MAX = int(os.getenv("LEAD_BULK_STATUS_MAX", "1000"))
+    # A lead whose mobile another lead (of any partner) already used is
+    # created with a warning ("warn") or refused ("reject"), imports included.
+    LEAD_DUPLICATE_POLICY = os.getenv("LEAD_DUPLICATE_POLICY", "warn")
+
+    # Number of partners shown in the dashboard / summary leaderboard
+    DASHBOARD_TOP_PARTNERS = int(os.getenv("DASHBOARD_TOP_PARTNERS", "10"))
+
+    # Dashboard aggregates run concurrently, each on its own pooled
+    # connection; size DB_POOL_* with DASHBOARD_MAX_WORKERS in mind. Beyond
+    # DASHBOARD_MAX_PENDING queued + running aggregates per worker, new ones
+    # are reported as timed out instead of queued.
+    DASHBOARD_MAX_WORKERS = int(os.getenv("DASHBOARD_MAX_WORKERS", "8"))
+    DASHBOARD_MAX_PENDING = int(os.getenv("DASHBOARD_MAX_PENDING", "32"))
+    DASHBOARD_QUERY_TIMEOUT = float(os.getenv("DASHBOARD_QUERY_TIMEOUT", "5"))  # seconds
 
 
 class DevelopmentConfig(Config):
     FLASK_ENV = "development"
     DEBUG = True
+    QUERY_AUDIT_REPORT = os.getenv("QUERY_AUDIT_REPORT", "1") == "1"
 
 
 class ProductionConfig(Config):
@@ -0,0 +1,216 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Tuple
+
+import mysql.connector
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+class ConnectionPool:
+    """
+    Per-process pool of raw MySQL connections.
+
+    Connections are handed out by `acquire()` and given back with
+    `release()`. Up to `size` idle connections are kept around; up to
+    `max_overflow` extra connections are opened under load and closed
+    again when returned. The pool remembers the PID it was filled in and
+    silently starts over in a forked child (e.g. gunicorn workers with
+    `--preload`), so sockets are never shared between processes.
+    """
+
+    def __init__(self):
+        self._connect_args: Dict[str, Any] = {}
+        self.size = 5
+        self.max_overflow = 10
+        self.timeout = 5.0
+        self.pre_ping = True
+        self.recycle = 1800
+
+        self._lock = threading.Condition(threading.Lock())
+        self._reset_state()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def init_app(self, app) -> None:
+        """Read pool and connection settings from the Flask config."""
+        cfg = app.config
+        self._connect_args = {
+            "host": cfg["MYSQL_HOST"],
+            "port": cfg["MYSQL_PORT"],
+            "user": cfg["MYSQL_USER"],
+            "password": cfg["MYSQL_PASSWORD"],
+            "database": cfg["MYSQL_DB"],
+            "auth_plugin": "mysql_native_password",
+        }
+        self.size = cfg.get("DB_POOL_SIZE", self.size)
+        self.max_overflow = cfg.get("DB_POOL_MAX_OVERFLOW", self.max_overflow)
+        self.timeout = cfg.get("DB_POOL_TIMEOUT", self.timeout)
+        self.pre_ping = cfg.get("DB_POOL_PRE_PING", self.pre_ping)
+        self.recycle = cfg.get("DB_POOL_RECYCLE", self.recycle)
+        app.extensions["db_pool"] = self
+
+    def _reset_state(self) -> None:
+        self._pid = os.getpid()
+        # Idle connections as (connection, created_at) pairs.
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        # id(connection) -> created_at for connections currently checked out.
+        self._in_use: Dict[int, float] = {}
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+
+    def _after_fork(self) -> None:
+        # The lock may have been held by another thread at fork time.
+        self._lock = threading.Condition(threading.Lock())
+        self._reset_state()
+
+    def _check_pid(self) -> None:
+        # Called with the lock held. Connections inherited from the parent
+        # are dropped without closing them, closing would send COM_QUIT on
+        # a socket the parent is still using.
+        if self._pid != os.getpid():
+            self._reset_state()
+
+    @property
+    def _open_count(self) -> int:
+        return len(self._idle) + len(self._in_use)
+
+    def _connect(self):
+        return mysql.connector.connect(**self._connect_args)
+
+    def _is_usable(self, conn, created_at: float) -> bool:
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            return False
+        if self.pre_ping:
+            try:
+                conn.ping(reconnect=False)
+            except mysql.connector.Error:
+                return False
+        return True
+
+    def _discard(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._discarded += 1
+
+    def acquire(self):
+        """
+        Check out a connection, waiting up to `timeout` seconds when all
+        `size + max_overflow` connections are in use.
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._lock:
+            self._check_pid()
+            while not self._idle and self._open_count >= self.size + self.max_overflow:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError("Timed out waiting for a database connection.")
+                self._lock.wait(remaining)
+
+            if self._idle:
+                conn, created_at = self._idle.pop()
+            else:
+                conn, created_at = None, time.monotonic()
+            # Reserve the slot before doing any I/O outside the lock.
+            slot = object()
+            self._in_use[id(slot)] = created_at
+
+        try:
+            if conn is not None and not self._is_usable(conn, created_at):
+                self._discard(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+                created_at = time.monotonic()
+                with self._lock:
+                    self._created += 1
+        except Exception:
+            with self._lock:
+                self._in_use.pop(id(slot), None)
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._in_use.pop(id(slot), None)
+            self._in_use[id(conn)] = created_at
+            waited = time.monotonic() - started
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    def release(self, conn, discard: bool = False) -> None:
+        """
+        Return a connection to the pool.
+
+        Any open transaction is rolled back so the next request starts from
+        a clean snapshot. Broken connections, overflow connections beyond
+        `size` and connections released with `discard=True` (e.g. with an
+        abandoned streaming result still on the wire) are closed instead.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            created_at = self._in_use.pop(id(conn), None)
+        if created_at is None:
+            return
+
+        keep = not discard
+        if keep:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                keep = False
+
+        with self._lock:
+            if keep and len(self._idle) < self.size:
+                self._idle.append((conn, created_at))
+                conn = None
+            self._lock.notify()
+        if conn is not None:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Check out a connection for use outside of a request context."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters used to size the pool."""
+        with self._lock:
+            self._check_pid()
+            checkouts = self._checkouts
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "checkouts": checkouts,
+                "checkout_wait_avg_ms": (
+                    self._wait_total / checkouts * 1000.0 if checkouts else 0.0
+                ),
+                "checkout_wait_max_ms": self._wait_max * 1000.0,
+                "timeouts": self._timeouts,
+                "connections_created": self._created,
+                "connections_discarded": self._discarded,
+            }
+
@@ -1,52 +1,75 @@
-import mysql.connector
-from flask import current_app, g
+from flask import g
 from flask_jwt_extended import JWTManager
-import bcrypt
+
+from .cache import TTLCache
+from .db_pool import ConnectionPool
+from .hashing import PasswordHasher
+from .instrumentation import instrument, unwrap
+from .invalidation import InvalidationBus
+from .metrics import Metrics
+from .model_cache import ModelCache
+from .query_audit import QueryAuditor
+from .write_behind import LoginLogBuffer
 
 jwt = JWTManager()
+db_pool = ConnectionPool()
+password_hasher = PasswordHasher()
+login_log_buffer = LoginLogBuffer()
+metrics = Metrics()
+query_auditor = QueryAuditor()
+# Publishes cache invalidations to the other workers (see app/invalidation.py).
+invalidation_bus = InvalidationBus()
+# Read-through cache for model query functions (see app/model_cache.py).
+model_cache = ModelCache()
+# Active JWT IDs seen by this worker (see login_log_model.is_token_active).
+token_cache = TTLCache()
+# (role, user id) -> account is usable; checked by the role decorators.
+account_cache = TTLCache()
+# Partner typeahead results and names (see partner_model.lookup_partners).
+partner_directory = TTLCache()
 
 
 def get_db():
     """
     Get a per-request MySQL connection.
 
-    Uses raw MySQL connector, no ORM. Connection is stored on `g`
-    so it can be reused within the same request and closed on teardown.
+    Uses raw MySQL connector, no ORM. The connection is checked out of the
+    process-wide pool on first use, stored on `g` so it can be reused within
+    the same request, and handed back to the pool on teardown. While query
+    listeners are registered (metrics, query audit) the connection is
+    wrapped so they see every statement.
     """
     if "db" not in g:
-        cfg = current_app.config
-        g.db = mysql.connector.connect(
-            host=cfg["MYSQL_HOST"],
-            port=cfg["MYSQL_PORT"],
-            user=cfg["MYSQL_USER"],
-            password=cfg["MYSQL_PASSWORD"],
-            database=cfg["MYSQL_DB"],
-            auth_plugin="mysql_native_password",
-        )
+        g.db = instrument(db_pool.acquire())
     return g.db
 
 
 def close_db(e=None):
-    """Close the DB connection at the end of the request."""
+    """Return the DB connection to the pool at the end of the request."""
     db = g.pop("db", None)
     if db is not None:
-        db.close()
+        db_pool.release(unwrap(db))
 
 
 def hash_password(plain_password: str) -> str:
-    """Hash a plain-text password using bcrypt."""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(plain_password.encode("utf-8"), salt)
-    return hashed.decode("utf-8")
+    """Hash a plain-text password using bcrypt (BCRYPT_ROUNDS cost)."""
+    return password_hasher.hash(plain_password)
 
 
 def check_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain-text password against a bcrypt hash."""
+    """
+    Verify a plain-text password against a bcrypt hash.
+
+    Raises HashingBusyError when the bcrypt pool is saturated.
+    """
     try:
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
-        )
+        return password_hasher.verify(plain_password, hashed_password)
     except ValueError:
         # Handles invalid hash formats gracefully
         return False
 
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash uses a different cost than BCRYPT_ROUNDS."""
+    return password_hasher.needs_rehash(hashed_password)
+
@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict
+
+import bcrypt
+
+
+class HashingBusyError(Exception):
+    """Raised when the bcrypt worker pool and its queue are full."""
+
+
+class PasswordHasher:
+    """
+    bcrypt behind a small bounded thread pool.
+
+    bcrypt releases the GIL, so a few threads hash in parallel, while the
+    pool size caps how many CPU cores a login burst can take from the rest
+    of the worker. At most `max_workers + max_queue` operations may be in
+    flight; beyond that callers get HashingBusyError right away instead of
+    queueing behind the burst.
+    """
+
+    def __init__(self):
+        self.rounds = 12
+        self.max_workers = 2
+        self.max_queue = 8
+        self.timeout = 10.0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self.rejected = 0
+
+    def init_app(self, app) -> None:
+        cfg = app.config
+        self.rounds = cfg.get("BCRYPT_ROUNDS", self.rounds)
+        self.max_workers = cfg.get("BCRYPT_MAX_WORKERS", self.max_workers)
+        self.max_queue = cfg.get("BCRYPT_MAX_QUEUE", self.max_queue)
+        self.timeout = cfg.get("BCRYPT_TIMEOUT", self.timeout)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        app.extensions["password_hasher"] = self
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _record(self, op: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._timings.setdefault(
+                op, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            timing["count"] += 1
+            timing["total_ms"] += seconds * 1000.0
+            timing["max_ms"] = max(timing["max_ms"], seconds * 1000.0)
+
+    def _run(self, op: str, fn: Callable[..., Any], *args) -> Any:
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingBusyError("Too many password operations in progress.")
+
+        started = time.monotonic()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        # The slot is freed when the work finishes, even if we stop waiting.
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HashingBusyError("Password operation timed out.") from None
+        finally:
+            self._record(op, time.monotonic() - started)
+
+    def hash(self, plain_password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        hashed = self._run("hash", bcrypt.hashpw, plain_password.encode("utf-8"), salt)
+        return hashed.decode("utf-8")
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(
+            "verify",
+            bcrypt.checkpw,
+            plain_password.encode("utf-8"),
+            hashed_password.encode("utf-8"),
+        )
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """True if the hash was made with a different cost than configured."""
+        try:
+            return int(hashed_password.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            timings = {
+                op: {
+                    **timing,
+                    "avg_ms": timing["total_ms"] / timing["count"] if timing["count"] else 0.0,
+                }
+                for op, timing in self._timings.items()
+            }
+            return {
+                "rounds": self.rounds,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+                "timings": timings,
+            }
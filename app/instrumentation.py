@@ -0,0 +1,142 @@
+"""
+Query hooks around the connection handed out by `get_db()`.
+
+Listeners registered with `add_query_listener` are called after every
+`execute` / `executemany` on a cursor of that connection with a
+`QueryEvent`. With no listener registered `get_db()` returns the raw
+connection, so the hooks cost nothing when unused.
+"""
+
+import sys
+import time
+from typing import Any, Callable, List, Optional
+
+# Query helpers that run statements on behalf of a model function; the
+# call site reported is the model function that called them.
+_MODELS_PREFIX = __name__.rsplit(".", 1)[0] + ".models."
+_HELPER_MODULES = {_MODELS_PREFIX + "pagination", _MODELS_PREFIX + "streaming"}
+
+_listeners: List[Callable[["QueryEvent"], None]] = []
+
+
+class QueryEvent:
+    """
+    One executed statement, as passed to query listeners.
+
+    It references the calling frame; listeners copy what they need instead
+    of keeping the event itself.
+    """
+
+    __slots__ = ("statement", "params", "duration", "many", "_frame", "_caller")
+
+    def __init__(self, statement: str, params: Any, duration: float, many: bool, frame):
+        self.statement = statement
+        self.params = params
+        self.duration = duration
+        self.many = many
+        self._frame = frame
+        self._caller: Optional[str] = None
+
+    @property
+    def caller(self) -> str:
+        """
+        "<module>.<function>" of the model function that ran the statement,
+        or "other" for queries issued outside app.models. Resolved lazily.
+        """
+        if self._caller is None:
+            self._caller = "other"
+            frame = self._frame
+            while frame is not None:
+                module = frame.f_globals.get("__name__", "")
+                if module.startswith(_MODELS_PREFIX) and module not in _HELPER_MODULES:
+                    self._caller = (
+                        f"{module[len(_MODELS_PREFIX):]}.{frame.f_code.co_name}"
+                    )
+                    break
+                frame = frame.f_back
+        return self._caller
+
+    @property
+    def call_site(self) -> str:
+        """file:line that called execute / executemany."""
+        return f"{self._frame.f_code.co_filename}:{self._frame.f_lineno}"
+
+    @property
+    def params_count(self) -> int:
+        """Bound parameters (rows for executemany)."""
+        if self.params is None or isinstance(self.params, (str, bytes)):
+            return 0
+        try:
+            return len(self.params)
+        except TypeError:
+            return 0
+
+
+def add_query_listener(listener: Callable[[QueryEvent], None]) -> None:
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_query_listener(listener: Callable[[QueryEvent], None]) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _notify(statement, params, started: float, many: bool) -> None:
+    event = QueryEvent(
+        statement, params, time.perf_counter() - started, many, sys._getframe(2)
+    )
+    for listener in list(_listeners):
+        listener(event)
+
+
+class InstrumentedCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, operation, params=(), *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            _notify(operation, params, started, False)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            _notify(operation, seq_params, started, True)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    def __init__(self, conn):
+        self.raw = conn
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self.raw.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+def instrument(conn):
+    """Wrap `conn` when any query listener is registered."""
+    return InstrumentedConnection(conn) if _listeners else conn
+
+
+def unwrap(conn):
+    """The pooled connection behind a (possibly) instrumented one."""
+    return conn.raw if isinstance(conn, InstrumentedConnection) else conn
@@ -0,0 +1,295 @@
+"""
+Cross-worker cache invalidation bus.
+
+Each per-process cache registers a handler under a name (see create_app)
+and its write paths call `invalidation_bus.publish(name, key)`. The
+invalidation is applied in this process at once and handed to the
+transport. A poller thread in every worker applies the events published
+by the others, so a change is seen everywhere within
+INVALIDATION_POLL_INTERVAL seconds plus one poll. A key of None drops the
+whole cache.
+
+INVALIDATION_TRANSPORT selects the transport. "db" (the default) appends
+rows to `cache_invalidations`, and the auto-increment id serves as the
+version each worker polls from. "none" keeps invalidations local, which
+is enough for a single worker. "module:factory" plugs in another
+transport with the same publish / latest / poll / purge methods.
+
+Ids are allocated at insert time but become visible at commit, so a lower
+id can appear after a higher one has been read. The poller remembers the
+ids it skipped over and re-reads them until they show up or
+INVALIDATION_GAP_TIMEOUT passes; a new worker likewise starts a few ids
+back from the latest one. Events are applied at most once per id.
+
+Publishing is best effort. The write it describes has already been
+committed, so a failed publish is logged and the other workers fall back
+on their caches' TTLs.
+"""
+
+import importlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (version, cache name, key, origin)
+Event = Tuple[int, str, Any, str]
+
+
+def _encode_key(key: Any) -> Optional[str]:
+    return None if key is None else json.dumps(key, separators=(",", ":"))
+
+
+def _decode_key(raw: Optional[str]) -> Any:
+    def as_hashable(value):
+        return tuple(as_hashable(item) for item in value) if isinstance(value, list) else value
+
+    return None if raw is None else as_hashable(json.loads(raw))
+
+
+class DatabaseTransport:
+    """Invalidations as rows of `cache_invalidations`, polled by id."""
+
+    def publish(self, cache: str, key: Any, origin: str) -> None:
+        from .extensions import db_pool
+
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO cache_invalidations (cache_name, cache_key, origin, created_at)
+                VALUES (%s, %s, %s, %s)
+                """,
+                (cache, _encode_key(key), origin, datetime.utcnow()),
+            )
+            conn.commit()
+            cursor.close()
+
+    def latest(self) -> int:
+        from .extensions import db_pool
+
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM cache_invalidations")
+            (version,) = cursor.fetchone()
+            cursor.close()
+        return int(version)
+
+    def poll(self, after: int, limit: int, missing: Sequence[int] = ()) -> List[Event]:
+        """Events with an id above `after` or in `missing`, by id."""
+        from .extensions import db_pool
+
+        where = "id > %s"
+        params: List[Any] = [after]
+        if missing:
+            where += " OR id IN (" + ", ".join(["%s"] * len(missing)) + ")"
+            params.extend(missing)
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT id, cache_name, cache_key, origin
+                FROM cache_invalidations
+                WHERE {where}
+                ORDER BY id
+                LIMIT %s
+                """,
+                (*params, limit),
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        return [(int(id_), cache, _decode_key(key), origin) for id_, cache, key, origin in rows]
+
+    def purge(self, before: datetime) -> int:
+        from .extensions import db_pool
+
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM cache_invalidations WHERE created_at < %s LIMIT 10000",
+                (before,),
+            )
+            deleted = cursor.rowcount
+            conn.commit()
+            cursor.close()
+        return deleted
+
+
+def load_transport(spec: str):
+    """Transport from INVALIDATION_TRANSPORT; None for "none" (local only)."""
+    if not spec or spec == "none":
+        return None
+    if spec == "db":
+        return DatabaseTransport()
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+class InvalidationBus:
+    # Events read per poll; a backlog is drained over consecutive polls.
+    BATCH = 1000
+    # Purge old rows every this many polls.
+    PURGE_EVERY = 300
+    # A new worker starts this many ids before the latest one, so events
+    # still being committed below it are not skipped.
+    START_LOOKBACK = 100
+    # Skipped ids tracked at most; beyond that the oldest are given up.
+    MAX_GAPS = 1000
+
+    def __init__(self):
+        self.transport: Any = None
+        self.poll_interval = 1.0
+        self.retention = 3600.0
+        self.gap_timeout = 30.0
+        self._handlers: Dict[str, Tuple[Callable[[Any], None], Callable[[], None]]] = {}
+        self._lock = threading.Lock()
+        self._thread_pid: Optional[int] = None
+        self._origin = ""
+        self._version: Optional[int] = None
+        # Skipped ids not seen yet -> monotonic time to stop looking for them.
+        self._gaps: Dict[int, float] = {}
+        self._last_ok = 0.0
+        self._polls = 0
+        self.published = 0
+        self.applied = 0
+        self.failures = 0
+
+    def init_app(self, app) -> None:
+        cfg = app.config
+        self.transport = load_transport(cfg.get("INVALIDATION_TRANSPORT", "db"))
+        self.poll_interval = cfg.get("INVALIDATION_POLL_INTERVAL", self.poll_interval)
+        self.retention = cfg.get("INVALIDATION_RETENTION", self.retention)
+        self.gap_timeout = cfg.get("INVALIDATION_GAP_TIMEOUT", self.gap_timeout)
+        app.extensions["invalidation_bus"] = self
+        if self.transport is not None:
+            app.before_request(self._ensure_thread)
+
+    def register(
+        self, name: str, invalidate: Callable[[Any], None], clear: Callable[[], None]
+    ) -> None:
+        """Handlers applying `name` events: invalidate(key), or clear() for key None."""
+        self._handlers[name] = (invalidate, clear)
+
+    def publish(self, name: str, key: Any = None) -> None:
+        """Invalidate `key` of cache `name` here and on every other worker."""
+        self._apply(name, key)
+        if self.transport is None:
+            return
+        self._ensure_thread()
+        try:
+            self.transport.publish(name, key, self._origin)
+            self.published += 1
+        except Exception:
+            logger.exception("Publishing cache invalidation %s %r failed", name, key)
+            self.failures += 1
+
+    def _apply(self, name: str, key: Any) -> None:
+        handlers = self._handlers.get(name)
+        if handlers is None:
+            return
+        invalidate, clear = handlers
+        if key is None:
+            clear()
+        else:
+            invalidate(key)
+
+    def _clear_all(self) -> None:
+        for _, clear in self._handlers.values():
+            clear()
+
+    def _ensure_thread(self) -> None:
+        # Threads do not survive a fork, so each worker starts its own poller
+        # (from its first request) and gets its own origin id.
+        if self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+            self._origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+            self._version = None
+            try:
+                # This process cached nothing before now, so only events
+                # around the current version concern it.
+                self._start_from(self.transport.latest())
+                self._last_ok = time.monotonic()
+            except Exception:
+                logger.exception("Reading the cache invalidation version failed")
+            thread = threading.Thread(
+                target=self._run, name="cache-invalidation-poller", daemon=True
+            )
+            thread.start()
+
+    def _start_from(self, latest: int) -> None:
+        # Re-applying a few old events is harmless; the ids in the window
+        # that are not committed yet become gaps on the first poll.
+        self._version = max(latest - self.START_LOOKBACK, 0)
+        self._gaps = {}
+
+    def _run(self) -> None:
+        pid = os.getpid()
+        while self._thread_pid == pid:
+            try:
+                drained = self.poll_once()
+            except Exception:
+                logger.exception("Polling cache invalidations failed")
+                self.failures += 1
+                drained = True
+            if drained:
+                time.sleep(self.poll_interval)
+
+    def poll_once(self) -> bool:
+        """
+        Apply other workers' events since the last poll. Returns False when
+        more are waiting. A worker that could not poll for longer than the
+        retention may have missed purged events, so it clears every cache.
+        """
+        now = time.monotonic()
+        if self._version is None or now - self._last_ok > self.retention:
+            latest = self.transport.latest()
+            self._clear_all()
+            self._start_from(latest)
+            self._last_ok = now
+            return True
+
+        for gap, deadline in list(self._gaps.items()):
+            if deadline <= now:
+                del self._gaps[gap]
+
+        events = self.transport.poll(self._version, self.BATCH, sorted(self._gaps))
+        for version, name, key, origin in events:
+            if version <= self._version:
+                if self._gaps.pop(version, None) is None:
+                    continue  # applied already
+            else:
+                for gap in range(max(self._version + 1, version - self.MAX_GAPS), version):
+                    self._gaps[gap] = now + self.gap_timeout
+                self._version = version
+            if origin != self._origin:
+                self._apply(name, key)
+                self.applied += 1
+        while len(self._gaps) > self.MAX_GAPS:
+            del self._gaps[min(self._gaps)]
+        self._last_ok = now
+
+        self._polls += 1
+        if self._polls % self.PURGE_EVERY == 0:
+            self.transport.purge(datetime.utcnow() - timedelta(seconds=self.retention))
+        return len(events) < self.BATCH
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "transport": type(self.transport).__name__ if self.transport else None,
+            "version": self._version,
+            "gaps": len(self._gaps),
+            "published": self.published,
+            "applied": self.applied,
+            "failures": self.failures,
+        }
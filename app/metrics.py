@@ -0,0 +1,244 @@
+"""
+Request and query metrics in the Prometheus text exposition format.
+
+Collected in-process (no client library needed) by request hooks and a
+query listener on the `get_db()` connection, and served on `/metrics`.
+Counters live in the worker process, so a scrape reports the worker that
+answered it; label targets per worker and aggregate in Prometheus.
+"""
+
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+from flask import Response, current_app, g, has_app_context, jsonify, request
+
+from .instrumentation import QueryEvent, add_query_listener
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        names = self.labelnames + ("le",)
+        with self._lock:
+            values = sorted(
+                (labels, [list(entry[0]), entry[1], entry[2]])
+                for labels, entry in self._values.items()
+            )
+        for labels, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{_labels(names, labels + (_number(bound),))} {cumulative}"
+                )
+            suffix = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_number(total)}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+class Metrics:
+    """
+    Per-worker request / query metrics and the `/metrics` endpoint.
+
+    `/metrics` answers clients sending `Authorization: Bearer <METRICS_TOKEN>`
+    (and, if METRICS_ALLOWED_IPS is set, connecting from one of those
+    addresses); everyone else gets a 403. Enabling metrics without a token
+    is a configuration error.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.token = None
+        self.allowed_ips = frozenset()
+
+        self.requests = Counter(
+            "http_requests_total",
+            "HTTP requests by route and status.",
+            ("blueprint", "endpoint", "method", "status"),
+        )
+        self.request_duration = Histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route.",
+            ("blueprint", "endpoint", "method"),
+            REQUEST_BUCKETS,
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries",
+            "Database statements run on the request connection, per request.",
+            ("blueprint", "endpoint"),
+            COUNT_BUCKETS,
+        )
+        self.query_duration = Histogram(
+            "db_query_duration_seconds",
+            "Database statement latency by calling model function.",
+            ("caller",),
+            QUERY_BUCKETS,
+        )
+
+    def init_app(self, app) -> None:
+        cfg = app.config
+        self.enabled = cfg.get("METRICS_ENABLED", False)
+        self.token = cfg.get("METRICS_TOKEN")
+        self.allowed_ips = frozenset(cfg.get("METRICS_ALLOWED_IPS", ()))
+        if not self.enabled:
+            return
+        if not self.token:
+            raise RuntimeError("METRICS_ENABLED requires METRICS_TOKEN to be set")
+
+        add_query_listener(self._on_query)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule("/metrics", "metrics", self._metrics_view)
+        app.extensions["metrics"] = self
+
+    def _on_query(self, event: QueryEvent) -> None:
+        self.query_duration.observe((event.caller,), event.duration)
+        # Only the request's own connection counts; background app contexts
+        # (e.g. the dashboard fan-out) have their own `g`.
+        if has_app_context() and "_metrics_queries" in g:
+            g._metrics_queries += 1
+
+    def _before_request(self) -> None:
+        g._metrics_started = time.perf_counter()
+        g._metrics_queries = 0
+
+    def _after_request(self, response):
+        started = g.pop("_metrics_started", None)
+        if started is None:
+            return response
+        blueprint = request.blueprint or ""
+        # Unmatched URLs share one label so random paths cannot blow up
+        # the number of series.
+        endpoint = request.endpoint or "<unmatched>"
+        method = request.method
+        self.requests.inc((blueprint, endpoint, method, str(response.status_code)))
+        self.request_duration.observe(
+            (blueprint, endpoint, method), time.perf_counter() - started
+        )
+        self.request_queries.observe((blueprint, endpoint), g.pop("_metrics_queries", 0))
+        return response
+
+    def _authorized(self) -> bool:
+        if not self.token:
+            return False
+        if self.allowed_ips and request.remote_addr not in self.allowed_ips:
+            return False
+        supplied = request.headers.get("Authorization", "")
+        return hmac.compare_digest(supplied.encode(), f"Bearer {self.token}".encode())
+
+    def _pool_lines(self) -> List[str]:
+        pool = current_app.extensions.get("db_pool")
+        if pool is None:
+            return []
+        stats = pool.stats()
+        lines = [
+            "# HELP db_pool_connections Pooled connections by state.",
+            "# TYPE db_pool_connections gauge",
+            f'db_pool_connections{{state="in_use"}} {stats["in_use"]}',
+            f'db_pool_connections{{state="idle"}} {stats["idle"]}',
+        ]
+        for key, name, documentation in (
+            ("checkouts", "db_pool_checkouts_total", "Connection checkouts."),
+            ("timeouts", "db_pool_timeouts_total", "Checkouts that timed out."),
+            ("connections_created", "db_pool_connections_created_total", "Connections opened."),
+            ("connections_discarded", "db_pool_connections_discarded_total", "Connections closed."),
+        ):
+            lines += [
+                f"# HELP {name} {documentation}",
+                f"# TYPE {name} counter",
+                f"{name} {stats[key]}",
+            ]
+        return lines
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in (
+            self.requests,
+            self.request_duration,
+            self.request_queries,
+            self.query_duration,
+        ):
+            lines += metric.render()
+        lines += self._pool_lines()
+        return "\n".join(lines) + "\n"
+
+    def _metrics_view(self):
+        if not self._authorized():
+            return jsonify({"msg": "Forbidden"}), 403
+        return Response(self.render(), content_type=CONTENT_TYPE)
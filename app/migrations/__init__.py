@@ -0,0 +1,125 @@
+"""
+Versioned SQL schema migrations.
+
+Each file in `versions/` is named `<version>_<name>.sql` and applied once,
+in version order, by `flask db upgrade`. Applied versions are recorded in
+`schema_migrations`.
+"""
+
+import os
+import re
+from datetime import datetime
+from typing import Callable, List, Optional, Set, Tuple
+
+import mysql.connector
+
+from ..extensions import db_pool
+
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), "versions")
+
+_FILENAME_RE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+# "Duplicate column" / "duplicate key name": the object a statement creates
+# already exists, e.g. on a database that was set up by hand before
+# migrations were introduced; "can't DROP": the object a statement drops is
+# already gone. Such statements are treated as applied.
+_ALREADY_APPLIED_ERRNOS = {1060, 1061, 1091}
+
+
+def available_migrations() -> List[Tuple[int, str, str]]:
+    """(version, name, path) for every migration file, in version order."""
+    found = []
+    for filename in os.listdir(VERSIONS_DIR):
+        match = _FILENAME_RE.match(filename)
+        if match:
+            found.append(
+                (int(match.group(1)), match.group(2), os.path.join(VERSIONS_DIR, filename))
+            )
+    return sorted(found)
+
+
+def split_statements(sql: str) -> List[str]:
+    """
+    Split a migration file into statements.
+
+    Full-line `--` comments are dropped and statements end with a `;` at
+    the end of a line, which is all the migration files use.
+    """
+    statements = []
+    current: List[str] = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("--"):
+            continue
+        current.append(line)
+        if stripped.endswith(";"):
+            statements.append("\n".join(current).rstrip().rstrip(";"))
+            current = []
+    if current:
+        statements.append("\n".join(current))
+    return statements
+
+
+def _ensure_version_table(cursor) -> None:
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+          version INT UNSIGNED NOT NULL,
+          name VARCHAR(255) NOT NULL,
+          applied_at DATETIME NOT NULL,
+          PRIMARY KEY (version)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """
+    )
+
+
+def applied_versions() -> Set[int]:
+    """Versions recorded in schema_migrations."""
+    with db_pool.connection() as conn:
+        cursor = conn.cursor()
+        _ensure_version_table(cursor)
+        cursor.execute("SELECT version FROM schema_migrations")
+        versions = {row[0] for row in cursor.fetchall()}
+        cursor.close()
+    return versions
+
+
+def upgrade(
+    target: Optional[int] = None, echo: Callable[[str], None] = print
+) -> List[int]:
+    """
+    Apply pending migrations up to `target` (default: latest).
+
+    MySQL commits DDL implicitly, so each file is recorded as applied right
+    after its last statement succeeds; a failure part-way through a file
+    leaves that version unrecorded and the next run retries it. Returns the
+    versions applied.
+    """
+    done = applied_versions()
+    applied = []
+    with db_pool.connection() as conn:
+        cursor = conn.cursor()
+        for version, name, path in available_migrations():
+            if version in done or (target is not None and version > target):
+                continue
+            echo(f"Applying {version:04d}_{name} ...")
+            with open(path, encoding="utf-8") as fh:
+                statements = split_statements(fh.read())
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                except mysql.connector.Error as exc:
+                    if exc.errno not in _ALREADY_APPLIED_ERRNOS:
+                        raise
+                    echo(f"  skipped (already applied): {exc.msg}")
+            cursor.execute(
+                """
+                INSERT INTO schema_migrations (version, name, applied_at)
+                VALUES (%s, %s, %s)
+                """,
+                (version, name, datetime.utcnow()),
+            )
+            conn.commit()
+            applied.append(version)
+        cursor.close()
+    return applied
@@ -0,0 +1,191 @@
+"""
+EXPLAIN every query the model layer issues and flag full table scans.
+
+The model functions are called for real against the configured database,
+on a connection whose cursors run `EXPLAIN <statement>` before each
+SELECT / UPDATE / DELETE. `commit()` is disabled on that connection and
+everything is rolled back at the end, so write functions leave no trace.
+Meanwhile the invalidation bus keeps its events in-process (other workers
+must not drop their caches for writes that are rolled back) and the model
+cache is off, so cached reads still reach the database.
+Run it against a database with realistic volumes (see `flask seed`):
+on near-empty tables MySQL happily picks full scans.
+"""
+
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
+from flask import g
+
+from ..extensions import db_pool, invalidation_bus, model_cache
+
+# Statement kinds MySQL can EXPLAIN and that read existing rows.
+_EXPLAINABLE = {"SELECT", "UPDATE", "DELETE"}
+
+
+class _ExplainingCursor:
+    def __init__(self, conn, cursor, findings: List[Dict[str, Any]], label: List[str]):
+        self._conn = conn
+        self._cursor = cursor
+        self._findings = findings
+        self._label = label
+
+    def execute(self, operation, params=()):
+        verb = operation.lstrip().split(None, 1)[0].upper()
+        if verb in _EXPLAINABLE:
+            explain = self._conn.cursor(dictionary=True, buffered=True)
+            explain.execute("EXPLAIN " + operation, params)
+            self._findings.append(
+                {
+                    "check": self._label[0],
+                    "statement": " ".join(operation.split()),
+                    "plan": explain.fetchall(),
+                }
+            )
+            explain.close()
+        return self._cursor.execute(operation, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _ExplainingConnection:
+    def __init__(self, conn, findings: List[Dict[str, Any]], label: List[str]):
+        self._conn = conn
+        self._findings = findings
+        self._label = label
+
+    def cursor(self, *args, **kwargs):
+        return _ExplainingCursor(
+            self._conn, self._conn.cursor(*args, **kwargs), self._findings, self._label
+        )
+
+    def commit(self):
+        # Everything is rolled back once all checks have run.
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _sample_ids(conn) -> Dict[str, Any]:
+    cursor = conn.cursor()
+    ids: Dict[str, Any] = {}
+    for key, sql in (
+        ("admin_id", "SELECT MIN(id) FROM admins"),
+        ("partner_id", "SELECT MIN(id) FROM partners"),
+        ("lead_id", "SELECT MIN(id) FROM leads"),
+        ("payment_id", "SELECT MIN(id) FROM payments"),
+    ):
+        cursor.execute(sql)
+        ids[key] = cursor.fetchone()[0] or 1
+    cursor.close()
+    return ids
+
+
+def model_checks(ids: Dict[str, Any]) -> List[Tuple[Callable[..., Any], tuple, dict]]:
+    """(function, args, kwargs) for every model query worth checking."""
+    from ..models import admin_model, data_version_model, lead_model, login_log_model
+    from ..models import partner_model, payment_model
+    from ..models.pagination import encode_cursor
+
+    partner_id = ids["partner_id"]
+    lead_id = ids["lead_id"]
+    jti = uuid.uuid4().hex  # never cached, so the lookup really hits the DB
+
+    return [
+        (admin_model.get_admin_by_email, ("nobody@example.com",), {}),
+        (admin_model.get_admin_by_id, (ids["admin_id"],), {}),
+        (partner_model.get_partner_by_mobile, ("0000000000",), {}),
+        (partner_model.get_partner_by_id, (partner_id,), {}),
+        (partner_model.list_partners, (), {}),
+        (partner_model.list_partners, (), {"status": "active"}),
+        (partner_model.list_partners, (), {"search": "Sha"}),
+        (partner_model.list_partners, (), {"search": "98765"}),
+        (partner_model.list_partners, (), {"after": encode_cursor(None, partner_id)}),
+        (partner_model.count_partners, (), {}),
+        (partner_model.count_partners, ("active",), {}),
+        (partner_model.lookup_partners, ("Sha",), {}),
+        (partner_model.lookup_partners, ("98765",), {}),
+        (partner_model.get_partner_name, (partner_id,), {}),
+        (partner_model.set_partner_status, (partner_id, "active"), {}),
+        (lead_model.list_leads_admin, (), {}),
+        (lead_model.list_leads_admin, (), {"status": "Pending"}),
+        (lead_model.list_leads_admin, (), {"partner_id": partner_id}),
+        (lead_model.list_leads_admin, (), {"search": "98765"}),
+        (lead_model.list_leads_admin, (), {"search": "Sharma"}),
+        (lead_model.list_leads_for_partner, (partner_id,), {}),
+        (lead_model.list_leads_for_partner, (partner_id,), {"search": "98765"}),
+        (lead_model.list_leads_for_partner, (partner_id,), {"search": "Sharma"}),
+        (lead_model.get_mobile_owner, ("0000000000",), {}),
+        (
+            lead_model.create_lead_for_partner,
+            (partner_id, "Explain Check", "0000000000", None, None, "Study"),
+            {},
+        ),
+        (lead_model.get_lead_by_id, (lead_id,), {}),
+        (lead_model.update_lead_status, (lead_id, "In-Process", "admin", 0), {}),
+        (lead_model.get_admin_lead_metrics, (), {}),
+        (lead_model.get_partner_leaderboard, (), {}),
+        (lead_model.get_partner_lead_metrics, (partner_id,), {}),
+        (payment_model.payment_exists_for_lead, (lead_id,), {}),
+        (payment_model.list_payments_admin, (), {}),
+        (payment_model.list_payments_admin, (), {"status": "Pending"}),
+        (payment_model.list_payments_admin, (), {"partner_id": partner_id}),
+        (payment_model.mark_payment_released, (ids["payment_id"],), {}),
+        (payment_model.list_payments_for_partner, (partner_id,), {}),
+        (payment_model.get_admin_payment_metrics, (), {}),
+        (payment_model.get_partner_payment_metrics, (partner_id,), {}),
+        (login_log_model.is_token_active, (jti,), {}),
+        (login_log_model.deactivate_session, (jti,), {}),
+        (data_version_model.get_data_versions, (["leads", "payments"],), {}),
+    ]
+
+
+def _check_label(fn: Callable[..., Any], kwargs: dict) -> str:
+    module = fn.__module__.rsplit(".", 1)[-1]
+    suffix = f"({', '.join(kwargs)})" if kwargs else ""
+    return f"{module}.{fn.__name__}{suffix}"
+
+
+def scan_problems(plan: List[Dict[str, Any]]) -> List[str]:
+    """Human-readable problems in one EXPLAIN result."""
+    problems = []
+    for row in plan:
+        table = row.get("table") or ""
+        if table.startswith("<"):
+            # Derived / union temp tables are always read in full.
+            continue
+        access = row.get("type")
+        if access == "ALL":
+            problems.append(f"FULL TABLE SCAN on {table}")
+        elif access == "index":
+            problems.append(f"full index scan on {table} (key {row.get('key')})")
+    return problems
+
+
+def run_checks() -> List[Dict[str, Any]]:
+    """
+    Run every model check and return the EXPLAIN findings.
+
+    Must be called inside an app context.
+    """
+    findings: List[Dict[str, Any]] = []
+    label = [""]
+    transport, cache_enabled = invalidation_bus.transport, model_cache.enabled
+    invalidation_bus.transport = None
+    model_cache.enabled = False
+    conn = db_pool.acquire()
+    try:
+        ids = _sample_ids(conn)
+        g.db = _ExplainingConnection(conn, findings, label)
+        for fn, args, kwargs in model_checks(ids):
+            label[0] = _check_label(fn, kwargs)
+            fn(*args, **kwargs)
+    finally:
+        g.pop("db", None)
+        conn.rollback()
+        db_pool.release(conn)
+        invalidation_bus.transport = transport
+        model_cache.enabled = cache_enabled
+    return findings
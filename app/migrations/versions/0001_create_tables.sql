@@ -0,0 +1,100 @@
+-- Tables used by app/models. Secondary indexes live in 0002 so that
+-- databases created before migrations existed can adopt them as-is.
+
+CREATE TABLE IF NOT EXISTS admins (
+  id INT UNSIGNED NOT NULL AUTO_INCREMENT,
+  email VARCHAR(255) NOT NULL,
+  password_hash VARCHAR(255) NOT NULL,
+  name VARCHAR(255) NULL,
+  is_active TINYINT(1) NOT NULL DEFAULT 1,
+  created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS partners (
+  id INT UNSIGNED NOT NULL AUTO_INCREMENT,
+  name VARCHAR(255) NOT NULL,
+  email VARCHAR(255) NULL,
+  mobile VARCHAR(20) NOT NULL,
+  password_hash VARCHAR(255) NOT NULL,
+  status VARCHAR(16) NOT NULL DEFAULT 'active',
+  is_deleted TINYINT(1) NOT NULL DEFAULT 0,
+  shop_name VARCHAR(255) NULL,
+  profession VARCHAR(255) NULL,
+  address VARCHAR(500) NULL,
+  created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS leads (
+  id INT UNSIGNED NOT NULL AUTO_INCREMENT,
+  partner_id INT UNSIGNED NOT NULL,
+  student_name VARCHAR(255) NOT NULL,
+  mobile VARCHAR(20) NOT NULL,
+  email VARCHAR(255) NULL,
+  address VARCHAR(500) NULL,
+  current_status VARCHAR(32) NULL,
+  lead_status VARCHAR(32) NOT NULL DEFAULT 'Pending',
+  created_at DATETIME NOT NULL,
+  conversion_date DATETIME NULL,
+  PRIMARY KEY (id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS lead_status_history (
+  id INT UNSIGNED NOT NULL AUTO_INCREMENT,
+  lead_id INT UNSIGNED NOT NULL,
+  old_status VARCHAR(32) NULL,
+  new_status VARCHAR(32) NOT NULL,
+  changed_by_type VARCHAR(16) NOT NULL,
+  changed_by_id INT UNSIGNED NOT NULL,
+  changed_at DATETIME NOT NULL,
+  PRIMARY KEY (id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS payments (
+  id INT UNSIGNED NOT NULL AUTO_INCREMENT,
+  partner_id INT UNSIGNED NOT NULL,
+  lead_id INT UNSIGNED NOT NULL,
+  amount DECIMAL(12, 2) NOT NULL,
+  status VARCHAR(16) NOT NULL DEFAULT 'Pending',
+  due_date DATETIME NOT NULL,
+  released_date DATETIME NULL,
+  created_at DATETIME NOT NULL,
+  PRIMARY KEY (id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS login_logs (
+  id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+  user_type VARCHAR(16) NOT NULL,
+  user_id INT UNSIGNED NOT NULL,
+  ip_address VARCHAR(45) NOT NULL DEFAULT '',
+  user_agent VARCHAR(255) NOT NULL DEFAULT '',
+  jti VARCHAR(64) NOT NULL,
+  login_time DATETIME NOT NULL,
+  logout_time DATETIME NULL,
+  is_active TINYINT(1) NOT NULL DEFAULT 1,
+  PRIMARY KEY (id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS lead_daily_stats (
+  stat_date DATE NOT NULL,
+  created_count INT NOT NULL DEFAULT 0,
+  pending_count INT NOT NULL DEFAULT 0,
+  in_process_count INT NOT NULL DEFAULT 0,
+  converted_count INT NOT NULL DEFAULT 0,
+  not_converted_count INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (stat_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Backfill the rollup for databases that already hold leads.
+INSERT IGNORE INTO lead_daily_stats
+  (stat_date, created_count, pending_count, in_process_count,
+   converted_count, not_converted_count)
+SELECT DATE(created_at),
+       COUNT(*),
+       SUM(lead_status = 'Pending'),
+       SUM(lead_status = 'In-Process'),
+       SUM(lead_status = 'Converted'),
+       SUM(lead_status = 'Not Converted')
+FROM leads
+GROUP BY DATE(created_at);
@@ -0,0 +1,44 @@
+-- Indexes backing every WHERE / ORDER BY in app/models.
+-- Re-running on a database that already has an index of the same name is
+-- harmless: the runner skips "duplicate key name" errors.
+
+-- admin_model.get_admin_by_email
+CREATE UNIQUE INDEX uq_admins_email ON admins (email);
+
+-- partner_model.get_partner_by_mobile, admin partner create uniqueness check
+CREATE UNIQUE INDEX uq_partners_mobile ON partners (mobile);
+-- partner_model.list_partners / count_active_partners (is_deleted = 0 ORDER BY id)
+CREATE INDEX idx_partners_deleted_id ON partners (is_deleted, id);
+-- partner_model.list_partners with a status filter
+CREATE INDEX idx_partners_deleted_status_id ON partners (is_deleted, status, id);
+
+-- lead_model.list_leads_admin: keyset on (created_at, id)
+CREATE INDEX idx_leads_created_id ON leads (created_at, id);
+-- list_leads_admin with a status filter
+CREATE INDEX idx_leads_status_created_id ON leads (lead_status, created_at, id);
+-- list_leads_admin with a partner filter, list_leads_for_partner,
+-- get_partner_lead_metrics (total + monthly trend)
+CREATE INDEX idx_leads_partner_created_id ON leads (partner_id, created_at, id);
+-- per-partner mobile lookup (since replaced by lead_mobiles; dropped in 0009)
+CREATE INDEX idx_leads_partner_mobile ON leads (partner_id, mobile);
+-- get_partner_lead_metrics (converted), leaderboard per-partner aggregate
+CREATE INDEX idx_leads_partner_status ON leads (partner_id, lead_status);
+
+-- update_lead_status history lookups per lead
+CREATE INDEX idx_lead_status_history_lead ON lead_status_history (lead_id, changed_at);
+
+-- payment_model.payment_exists_for_lead; also enforces one payment per lead
+CREATE UNIQUE INDEX uq_payments_lead ON payments (lead_id);
+-- list_payments_admin: keyset on (due_date, id)
+CREATE INDEX idx_payments_due_id ON payments (due_date, id);
+-- list_payments_admin with a status filter, get_admin_payment_metrics
+CREATE INDEX idx_payments_status_due_id ON payments (status, due_date, id);
+-- list_payments_admin with a partner filter, list_payments_for_partner
+CREATE INDEX idx_payments_partner_due_id ON payments (partner_id, due_date, id);
+-- get_partner_payment_metrics, leaderboard per-partner aggregate (covering)
+CREATE INDEX idx_payments_partner_status_amount ON payments (partner_id, status, amount);
+
+-- login_log_model.is_token_active / deactivate_session
+CREATE UNIQUE INDEX uq_login_logs_jti ON login_logs (jti);
+-- per-user session history
+CREATE INDEX idx_login_logs_user ON login_logs (user_type, user_id, login_time);
@@ -0,0 +1,9 @@
+-- Change counters per data scope ("leads", "payments", "partners",
+-- "partner:<id>"), bumped by model write paths in their own transaction
+-- and read to build ETags for the report endpoints.
+
+CREATE TABLE IF NOT EXISTS data_versions (
+  scope VARCHAR(64) NOT NULL,
+  version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  PRIMARY KEY (scope)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
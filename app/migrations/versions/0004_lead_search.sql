@@ -0,0 +1,19 @@
+-- Lead search (lead_model._search_filter): a normalized mobile column for
+-- prefix / exact matching and a FULLTEXT index on student names.
+-- Needs MySQL 8.0+ (REGEXP_REPLACE). The backfill rewrites every lead in
+-- one statement; on large tables run it off-peak.
+
+ALTER TABLE leads
+  ADD COLUMN mobile_normalized VARCHAR(10) NOT NULL DEFAULT '' AFTER mobile;
+
+-- Same rule as lead_model.normalize_mobile: digits only, last 10 kept.
+UPDATE leads
+SET mobile_normalized = RIGHT(REGEXP_REPLACE(mobile, '[^0-9]', ''), 10)
+WHERE mobile_normalized = '';
+
+-- list_leads_admin(search=<digits>)
+CREATE INDEX idx_leads_mobile_normalized ON leads (mobile_normalized);
+-- list_leads_for_partner(search=<digits>)
+CREATE INDEX idx_leads_partner_mobile_normalized ON leads (partner_id, mobile_normalized);
+-- list_leads_admin / list_leads_for_partner (search=<name>)
+CREATE FULLTEXT INDEX ft_leads_student_name ON leads (student_name);
@@ -0,0 +1,23 @@
+-- Global lead deduplication: one row per normalized mobile, owned by the
+-- partner whose lead first used it. lead_model claims a mobile with
+-- INSERT IGNORE in the same transaction as the lead insert, so the primary
+-- key decides concurrent submissions. first_seen_at keeps microseconds so
+-- an import can tell the claims it just made from older ones.
+
+CREATE TABLE IF NOT EXISTS lead_mobiles (
+  mobile_normalized VARCHAR(10) NOT NULL,
+  partner_id INT UNSIGNED NOT NULL,
+  first_seen_at DATETIME(6) NOT NULL,
+  PRIMARY KEY (mobile_normalized)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Existing leads: the earliest lead per mobile owns it.
+INSERT IGNORE INTO lead_mobiles (mobile_normalized, partner_id, first_seen_at)
+SELECT l.mobile_normalized, l.partner_id, l.created_at
+FROM leads l
+JOIN (
+  SELECT mobile_normalized, MIN(id) AS first_id
+  FROM leads
+  WHERE mobile_normalized <> ''
+  GROUP BY mobile_normalized
+) f ON f.first_id = l.id;
@@ -0,0 +1,3 @@
+-- Partner typeahead (partner_model.lookup_partners): name prefix search
+-- over non-deleted partners. Mobile prefixes use uq_partners_mobile.
+CREATE INDEX idx_partners_deleted_name ON partners (is_deleted, name);
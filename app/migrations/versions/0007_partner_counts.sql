@@ -0,0 +1,17 @@
+-- Rollup of non-deleted partners per status, maintained by the
+-- partner_model write paths (see _bump_partner_counts) so the admin
+-- partners list and dashboard do not COUNT(*) the table on every request.
+-- `flask stats rebuild` recomputes it.
+
+CREATE TABLE IF NOT EXISTS partner_counts (
+  status VARCHAR(32) NOT NULL,
+  partner_count INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (status)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT INTO partner_counts (status, partner_count)
+SELECT status, COUNT(*)
+FROM partners
+WHERE is_deleted = 0
+GROUP BY status
+ON DUPLICATE KEY UPDATE partner_count = VALUES(partner_count);
@@ -0,0 +1,14 @@
+-- Cross-worker cache invalidation log (app/invalidation.py). Writers append
+-- one row per invalidation; every worker polls for ids above the last one
+-- it applied. Rows older than INVALIDATION_RETENTION are purged by the
+-- pollers.
+
+CREATE TABLE IF NOT EXISTS cache_invalidations (
+  id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+  cache_name VARCHAR(64) NOT NULL,
+  cache_key TEXT NULL,
+  origin VARCHAR(128) NOT NULL,
+  created_at DATETIME NOT NULL,
+  PRIMARY KEY (id),
+  KEY idx_cache_invalidations_created (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
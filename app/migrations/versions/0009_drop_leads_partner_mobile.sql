@@ -0,0 +1,5 @@
+-- Duplicate mobiles are found through lead_mobiles (0005) and
+-- idx_leads_partner_mobile_normalized (0004); nothing reads
+-- idx_leads_partner_mobile any more, but every lead insert maintained it.
+
+DROP INDEX idx_leads_partner_mobile ON leads;
@@ -0,0 +1,32 @@
+-- Per-partner lead and payment totals for the partner leaderboard,
+-- maintained by the lead / payment write paths (see
+-- partner_stats_model.bump_partner_stats) so a leaderboard page reads one
+-- row per partner instead of aggregating all of leads and payments.
+-- `flask stats rebuild` recomputes it.
+
+CREATE TABLE IF NOT EXISTS partner_stats (
+  partner_id INT UNSIGNED NOT NULL,
+  total_leads INT NOT NULL DEFAULT 0,
+  converted_leads INT NOT NULL DEFAULT 0,
+  pending_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+  released_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (partner_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT INTO partner_stats (partner_id, total_leads, converted_leads)
+SELECT partner_id, COUNT(*), SUM(lead_status = 'Converted')
+FROM leads
+GROUP BY partner_id
+ON DUPLICATE KEY UPDATE
+  total_leads = VALUES(total_leads),
+  converted_leads = VALUES(converted_leads);
+
+INSERT INTO partner_stats (partner_id, pending_amount, released_amount)
+SELECT partner_id,
+       SUM(CASE WHEN status = 'Pending' THEN amount ELSE 0 END),
+       SUM(CASE WHEN status = 'Released' THEN amount ELSE 0 END)
+FROM payments
+GROUP BY partner_id
+ON DUPLICATE KEY UPDATE
+  pending_amount = VALUES(pending_amount),
+  released_amount = VALUES(released_amount);
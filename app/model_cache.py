@@ -0,0 +1,314 @@
+"""
+Read-through cache for model query functions (MODEL_CACHE=1).
+
+    @model_cache.cached(ttl=30, tags=("partner:{partner_id}",))
+    def get_partner_lead_metrics(partner_id): ...
+
+    @model_cache.invalidates()
+    def mark_payment_released(payment_id): ...
+
+Entries are keyed by function and bound arguments. Tags are data_versions
+scopes ("leads", "payments", "partners", "partner:<id>"), formatted from
+the arguments. Every entry stores the version of each of its tags as they
+were before the value was read, and is a miss once any tag has moved on.
+
+A function decorated with `invalidates` bumps the scopes it passes to
+bump_data_versions (plus any tags given to the decorator) after it
+returns, i.e. after its commit, so a concurrent reader cannot cache
+pre-commit data under the new tag versions.
+
+The memory backend keeps tag versions per worker process; create_app
+routes its invalidations through the invalidation bus so the other
+workers bump them too. A shared backend (MODEL_CACHE_BACKEND) needs no bus.
+
+A miss must not be filled from a snapshot older than the tag versions it
+is stored under. Before running the query the request connection's open
+read transaction (REPEATABLE READ) is ended, and calls made inside an
+`invalidates` function, whose transaction may hold its own writes, bypass
+the cache.
+"""
+
+import copy
+import functools
+import importlib
+import inspect
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from flask import g, has_app_context
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    """Thread-safe LRU with per-entry expiry and in-process tag versions."""
+
+    shared = False
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._tags: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+        # Callers may mutate what they get back; keep the cached copy intact.
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        with self._lock:
+            return [self._tags.get(tag, 0) for tag in tags]
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+
+    def size(self) -> int:
+        return len(self._data)
+
+
+class RedisBackend:
+    """
+    Shared backend on Redis (needs the `redis` package). Values are pickled,
+    so only point it at a Redis instance the app alone can write to. Size
+    is bounded by the server's maxmemory policy (use allkeys-lru).
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "model_cache:"):
+        import redis  # optional dependency, only needed for this backend
+
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Any:
+        raw = self._redis.get(self._prefix + key)
+        return _MISSING if raw is None else pickle.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._redis.set(self._prefix + key, pickle.dumps(value), px=max(int(ttl * 1000), 1))
+
+    def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        if not tags:
+            return []
+        values = self._redis.mget([f"{self._prefix}tag:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        pipe = self._redis.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(f"{self._prefix}tag:{tag}")
+        pipe.execute()
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(match=self._prefix + "*"):
+            self._redis.delete(key)
+
+    def size(self) -> int:
+        return -1  # not tracked for a shared backend
+
+
+def load_backend(spec: str, maxsize: int):
+    """
+    Backend from MODEL_CACHE_BACKEND: "memory", a redis:// / rediss:// URL,
+    or "package.module:factory" (called with no arguments).
+    """
+    if not spec or spec == "memory":
+        return MemoryBackend(maxsize=maxsize)
+    if spec.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(spec)
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+def _end_read_snapshot() -> None:
+    # A transaction opened by an earlier read in this request would let the
+    # query see data older than the versions just read. Committing ends it;
+    # write paths commit their own transactions, so nothing is pending.
+    if not has_app_context():
+        return
+    db = g.get("db")
+    if db is not None and db.in_transaction:
+        db.commit()
+
+
+class ModelCache:
+    def __init__(self):
+        self.enabled = False
+        self.default_ttl = 30.0
+        self.backend: Any = MemoryBackend()
+        self.hits = 0
+        self.misses = 0
+        # Replaces the local tag bump for invalidations made by write
+        # functions (create_app points it at the invalidation bus).
+        self.publisher: Optional[Callable[[List[str]], None]] = None
+        self._pending: ContextVar[Optional[List[str]]] = ContextVar(
+            "model_cache_pending", default=None
+        )
+
+    def init_app(self, app) -> None:
+        cfg = app.config
+        self.enabled = cfg.get("MODEL_CACHE", False)
+        self.default_ttl = cfg.get("MODEL_CACHE_TTL", self.default_ttl)
+        if self.enabled:
+            self.backend = load_backend(
+                cfg.get("MODEL_CACHE_BACKEND", "memory"), cfg.get("MODEL_CACHE_SIZE", 4096)
+            )
+        app.extensions["model_cache"] = self
+
+    # -- reads ---------------------------------------------------------------
+
+    def cached(
+        self, ttl: Optional[float] = None, tags: Sequence[str] = ()
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """
+        Cache the decorated function's result per bound arguments for `ttl`
+        seconds (MODEL_CACHE_TTL by default). `tags` are str.format
+        templates over the argument names, e.g. "partner:{partner_id}".
+        """
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            signature = inspect.signature(fn)
+            name = f"{fn.__module__}.{fn.__qualname__}"
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or self._pending.get() is not None:
+                    return fn(*args, **kwargs)
+
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = bound.arguments
+                key = f"{name}{tuple(arguments.items())!r}"
+                entry_tags = [tag.format(**arguments) for tag in tags]
+
+                # Versions are read before the query: a write committed
+                # meanwhile bumps them and makes this entry stale at once.
+                versions = self.backend.tag_versions(entry_tags)
+                entry = self.backend.get(key)
+                if entry is not _MISSING and entry[0] == versions:
+                    self.hits += 1
+                    return entry[1]
+
+                self.misses += 1
+                _end_read_snapshot()
+                value = fn(*args, **kwargs)
+                self.backend.set(
+                    key, (versions, value), ttl if ttl is not None else self.default_ttl
+                )
+                return value
+
+            wrapper.uncached = fn
+            return wrapper
+
+        return decorator
+
+    # -- writes ----------------------------------------------------------------
+
+    def invalidates(self, *tags: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """
+        Invalidate, once the decorated write function returns, every scope
+        it bumped through bump_data_versions plus `tags` (templates like in
+        `cached`). Nested decorated calls are flushed by the outermost one.
+        """
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+
+                static: List[str] = []
+                if tags:
+                    bound = signature.bind(*args, **kwargs)
+                    bound.apply_defaults()
+                    static = [tag.format(**bound.arguments) for tag in tags]
+
+                outer = self._pending.get()
+                if outer is not None:
+                    outer.extend(static)
+                    return fn(*args, **kwargs)
+
+                pending: List[str] = list(static)
+                token = self._pending.set(pending)
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._pending.reset(token)
+                    # Also after a failure: a spurious miss is harmless.
+                    self._invalidate(pending)
+
+            return wrapper
+
+        return decorator
+
+    def record(self, tags: Iterable[str]) -> None:
+        """
+        Note scopes written by the current transaction (called by
+        bump_data_versions). Outside an `invalidates` call they are bumped
+        right away.
+        """
+        if not self.enabled:
+            return
+        pending = self._pending.get()
+        if pending is not None:
+            pending.extend(tags)
+        else:
+            self._invalidate(tags)
+
+    def _invalidate(self, tags: Iterable[str]) -> None:
+        unique = sorted(set(tags))
+        if not self.enabled or not unique:
+            return
+        if self.publisher is not None:
+            self.publisher(unique)
+        else:
+            self.bump(unique)
+
+    def bump(self, tags: Iterable[str]) -> None:
+        """Bump tag versions in the backend (no publishing)."""
+        if self.enabled:
+            self.backend.bump_tags(tags)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
@@ -1,13 +1,13 @@
 from typing import Optional, Dict, Any
 
-from ..extensions import get_db
+from ..extensions import get_db, account_cache
 
 
 def get_admin_by_email(email: str) -> Optional[Dict[str, Any]]:
     """
     Fetch an admin row by email.
 
-    Expected table schema (adjust as needed):
+    Table schema (see app/migrations):
       admins(id, email, password_hash, name, is_active, created_at)
     """
     db = get_db()
@@ -42,3 +42,36 @@ def get_admin_by_id(admin_id: int) -> Optional[Dict[str, Any]]:
     return admin
 
 
+def is_admin_active(admin_id: int) -> bool:
+    """
+    Whether the admin account exists and is active.
+
+    Backed by the per-worker account cache; misses only read `is_active`.
+    """
+    key = ("admin", admin_id)
+    cached = account_cache.get(key)
+    if cached is not None:
+        return cached
+
+    generation = account_cache.generation()
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
+    cursor.execute("SELECT is_active FROM admins WHERE id = %s", (admin_id,))
+    row = cursor.fetchone()
+    cursor.close()
+
+    active = bool(row and row["is_active"])
+    account_cache.set(key, active, generation=generation)
+    return active
+
+
+def update_admin_password_hash(admin_id: int, password_hash: str) -> None:
+    """Replace an admin's stored hash (e.g. after a bcrypt cost change)."""
+    db = get_db()
+    cursor = db.cursor()
+    cursor.execute(
+        "UPDATE admins SET password_hash = %s WHERE id = %s",
+        (password_hash, admin_id),
+    )
+    db.commit()
+    cursor.close()
@@ -0,0 +1,93 @@
+import logging
+from typing import Dict, Iterable
+
+from ..extensions import get_db, model_cache
+
+logger = logging.getLogger(__name__)
+
+
+def partner_scope(partner_id: int) -> str:
+    """Data-version scope for one partner's leads and payments."""
+    return f"partner:{partner_id}"
+
+
+def bump_data_versions(cursor, scopes: Iterable[str]) -> None:
+    """
+    Increment the change counter of each scope.
+
+    Runs on the caller's cursor so the bump commits (or rolls back) with
+    the write it describes. Scopes are sorted to keep row-lock order stable.
+    The same scopes are handed to the model cache as invalidation tags.
+
+    Meant for per-partner scopes: the repo-wide ones ("leads", "payments",
+    "partners") are one row each, and holding that lock until commit would
+    serialize every write of the kind. Bump those with
+    bump_global_versions once the write has committed.
+
+    Table schema (see app/migrations):
+      data_versions(scope PK, version)
+    """
+    unique = sorted(set(scopes))
+    if not unique:
+        return
+    _upsert_versions(cursor, unique)
+    model_cache.record(unique)
+
+
+def bump_global_versions(scopes: Iterable[str]) -> None:
+    """
+    Increment repo-wide scopes right after the write's commit, in a
+    transaction of their own that holds the row locks only for the upsert.
+
+    A reader may briefly see the new data under the old version, which
+    only costs it a refetch once the version moves; it never sees the new
+    version without the data. A failure is logged, not raised: the write
+    it describes has committed already.
+    """
+    unique = sorted(set(scopes))
+    if not unique:
+        return
+    db = get_db()
+    cursor = db.cursor()
+    try:
+        _upsert_versions(cursor, unique)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Bumping data versions %s failed", unique)
+    finally:
+        cursor.close()
+    model_cache.record(unique)
+
+
+def _upsert_versions(cursor, unique) -> None:
+    cursor.execute(
+        f"""
+        INSERT INTO data_versions (scope, version)
+        VALUES {", ".join(["(%s, 1)"] * len(unique))}
+        ON DUPLICATE KEY UPDATE version = version + 1
+        """,
+        unique,
+    )
+
+
+def get_data_versions(scopes: Iterable[str]) -> Dict[str, int]:
+    """Current counter per scope (0 for scopes never written)."""
+    wanted = sorted(set(scopes))
+    versions = {scope: 0 for scope in wanted}
+    if not wanted:
+        return versions
+    db = get_db()
+    cursor = db.cursor()
+    cursor.execute(
+        f"""
+        SELECT scope, version
+        FROM data_versions
+        WHERE scope IN ({", ".join(["%s"] * len(wanted))})
+        """,
+        wanted,
+    )
+    for scope, version in cursor.fetchall():
+        versions[scope] = version
+    cursor.close()
+    return versions
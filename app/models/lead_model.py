@@ -1,9 +1,154 @@
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..extensions import get_db, model_cache
+from .data_version_model import bump_data_versions, bump_global_versions, partner_scope
+from .pagination import DEFAULT_PAGE_SIZE, fetch_keyset_page
+from .partner_model import count_partners
+from .partner_stats_model import bump_partner_stats
+from .streaming import stream_rows
+
+# lead_status -> per-status counter column in lead_daily_stats
+_STATUS_COUNT_COLUMNS = {
+    "Pending": "pending_count",
+    "In-Process": "in_process_count",
+    "Converted": "converted_count",
+    "Not Converted": "not_converted_count",
+}
+
+# Searches with at least this many digits (and nothing but digits and
+# phone punctuation) match on mobile; anything else searches names.
+_MOBILE_SEARCH_MIN_DIGITS = 3
+_MOBILE_SEARCH = re.compile(r"^[\d\s()+.-]+$")
+_NAME_TOKEN = re.compile(r"\w+", re.UNICODE)
+_NAME_SEARCH_MAX_TOKENS = 8
+
+# A mobile needs this many digits after normalization to be accepted.
+MOBILE_DIGITS = 10
+# "warn": create the lead and report the existing owner; "reject": don't.
+DUPLICATE_POLICIES = ("warn", "reject")
+
+
+def normalize_mobile(mobile: str) -> str:
+    """
+    Canonical form of a mobile number: digits only, last 10 kept, so
+    "+91 98765-43210", "098765 43210" and "9876543210" all compare equal.
+
+    Mirrored in SQL by migration 0004 (RIGHT(REGEXP_REPLACE(...), 10)).
+    """
+    return re.sub(r"\D", "", mobile or "")[-10:]
+
+
+def _search_filter(
+    search: Optional[str], alias: str = ""
+) -> Tuple[Optional[str], List[str], List[Any]]:
+    """
+    (kind, WHERE fragments, params) for a free-text lead search.
+
+    kind is "mobile" (prefix match on the normalized mobile, exact once
+    all 10 digits are given), "name" (FULLTEXT boolean match on
+    student_name, every word as a prefix) or None for an empty search.
+    """
+    search = (search or "").strip()
+    if not search:
+        return None, [], []
+
+    digits = normalize_mobile(search)
+    if _MOBILE_SEARCH.match(search) and len(digits) >= _MOBILE_SEARCH_MIN_DIGITS:
+        if len(digits) == 10:
+            return "mobile", [f"{alias}mobile_normalized = %s"], [digits]
+        return "mobile", [f"{alias}mobile_normalized LIKE %s"], [digits + "%"]
+
+    tokens = _NAME_TOKEN.findall(search)[:_NAME_SEARCH_MAX_TOKENS]
+    if not tokens:
+        return None, [], []
+    query = " ".join(f"+{token}*" for token in tokens)
+    return "name", [f"MATCH({alias}student_name) AGAINST (%s IN BOOLEAN MODE)"], [query]
+
+
+def _claim_mobiles(cursor, partner_id: int, mobiles: List[str], seen_at: datetime) -> int:
+    """
+    Claim unowned normalized mobiles for `partner_id` in `lead_mobiles`.
+
+    The primary key makes this safe under concurrent submissions: a second
+    transaction claiming the same number waits for the first and is then
+    ignored. Returns the number of mobiles claimed.
+    """
+    cursor.executemany(
+        """
+        INSERT IGNORE INTO lead_mobiles (mobile_normalized, partner_id, first_seen_at)
+        VALUES (%s, %s, %s)
+        """,
+        [(mobile, partner_id, seen_at) for mobile in mobiles],
+    )
+    return cursor.rowcount
+
+
+def _mobile_owners(cursor, mobiles: List[str], lock: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    normalized mobile -> {"partner_id", "partner_name", "first_seen_at"}.
+
+    With `lock`, a shared-lock read: sees claims committed after this
+    transaction's snapshot, as needed right after `_claim_mobiles`.
+    """
+    if not mobiles:
+        return {}
+    cursor.execute(
+        f"""
+        SELECT lm.mobile_normalized, lm.partner_id, p.name, lm.first_seen_at
+        FROM lead_mobiles lm
+        LEFT JOIN partners p ON p.id = lm.partner_id
+        WHERE lm.mobile_normalized IN ({", ".join(["%s"] * len(mobiles))})
+        {"LOCK IN SHARE MODE" if lock else ""}
+        """,
+        tuple(mobiles),
+    )
+    return {
+        mobile: {"partner_id": owner, "partner_name": name, "first_seen_at": seen_at}
+        for mobile, owner, name, seen_at in cursor.fetchall()
+    }
+
+
+def _bump_daily_stats(
+    cursor,
+    stat_date,
+    created: int = 0,
+    status_deltas: Optional[Dict[str, int]] = None,
+) -> None:
+    """
+    Apply deltas to the `lead_daily_stats` rollup row for `stat_date`.
 
-from ..extensions import get_db
+    Must run in the same transaction as the lead write it accounts for.
+    Leads are bucketed by the day they were created, so a status change
+    moves one lead between the status columns of its creation day.
 
+    Expected schema:
+      lead_daily_stats(
+        stat_date PK, created_count, pending_count, in_process_count,
+        converted_count, not_converted_count
+      )
+    """
+    deltas = {col: 0 for col in _STATUS_COUNT_COLUMNS.values()}
+    for status, delta in (status_deltas or {}).items():
+        column = _STATUS_COUNT_COLUMNS.get(status)
+        if column:
+            deltas[column] += delta
 
+    columns = ["created_count", *deltas]
+    cursor.execute(
+        f"""
+        INSERT INTO lead_daily_stats (stat_date, {", ".join(columns)})
+        VALUES (%s, {", ".join(["%s"] * len(columns))})
+        ON DUPLICATE KEY UPDATE
+          {", ".join(f"{col} = {col} + VALUES({col})" for col in columns)}
+        """,
+        (stat_date, created, *deltas.values()),
+    )
+
+
+@model_cache.invalidates()
 def create_lead_for_partner(
     partner_id: int,
     student_name: str,
@@ -11,75 +156,320 @@ def create_lead_for_partner(
     email: Optional[str],
     address: Optional[str],
     current_status: str,
-) -> int:
+    duplicate_policy: str = "warn",
+) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
     """
     Create a new lead for a partner.
 
-    Expected `leads` schema (adapt as needed):
+    The normalized mobile is claimed in `lead_mobiles` in the same
+    transaction. Returns (lead_id, duplicate): `duplicate` is None for a
+    new number, else the existing owner as returned by get_mobile_owner.
+    With duplicate_policy "reject" a duplicate is not created (lead_id is
+    None).
+
+    `leads` schema (see app/migrations):
       leads(
-        id, partner_id, student_name, mobile, email, address,
-        current_status, lead_status, created_at, conversion_date
+        id, partner_id, student_name, mobile, mobile_normalized, email,
+        address, current_status, lead_status, created_at, conversion_date
       )
     """
+    if duplicate_policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate policy: {duplicate_policy}")
+
+    mobile_normalized = normalize_mobile(mobile)
     db = get_db()
     cursor = db.cursor()
     now = datetime.utcnow()
-    cursor.execute(
-        """
-        INSERT INTO leads
-          (partner_id, student_name, mobile, email, address,
-           current_status, lead_status, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """,
-        (
-            partner_id,
-            student_name,
-            mobile,
-            email,
-            address,
-            current_status,
-            "Pending",
-            now,
-        ),
-    )
-    db.commit()
-    lead_id = cursor.lastrowid
-    cursor.close()
-    return lead_id
+    try:
+        duplicate = None
+        if not _claim_mobiles(cursor, partner_id, [mobile_normalized], now):
+            duplicate = _mobile_owners(cursor, [mobile_normalized], lock=True).get(
+                mobile_normalized
+            )
+            if duplicate_policy == "reject":
+                db.rollback()
+                return None, duplicate
+
+        cursor.execute(
+            """
+            INSERT INTO leads
+              (partner_id, student_name, mobile, mobile_normalized, email, address,
+               current_status, lead_status, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """,
+            (
+                partner_id,
+                student_name,
+                mobile,
+                mobile_normalized,
+                email,
+                address,
+                current_status,
+                "Pending",
+                now,
+            ),
+        )
+        lead_id = cursor.lastrowid
+        _bump_daily_stats(cursor, now.date(), created=1, status_deltas={"Pending": 1})
+        bump_partner_stats(cursor, {partner_id: {"total_leads": 1}})
+        bump_data_versions(cursor, [partner_scope(partner_id)])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+    bump_global_versions(["leads"])
+    return lead_id, duplicate
 
 
-def list_leads_admin(
-    partner_id: Optional[int] = None,
-    status: Optional[str] = None,
-    date_from: Optional[datetime] = None,
-    date_to: Optional[datetime] = None,
+# Rows per multi-row INSERT / IN (...) list in the bulk paths.
+_BULK_CHUNK = 500
+
+# VARCHAR widths of the `leads` columns an import writes.
+_IMPORT_COLUMN_WIDTHS = {
+    "student_name": 255,
+    "mobile": 20,
+    "email": 255,
+    "address": 500,
+    "current_status": 32,
+}
+
+
+def _chunks(items: List[Any], size: int = _BULK_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+@model_cache.invalidates()
+def import_leads_for_partner(
+    partner_id: int,
+    rows: List[Dict[str, Any]],
+    skip_duplicates: bool = True,
 ) -> List[Dict[str, Any]]:
     """
-    Admin view of all leads with optional filters.
+    Bulk-create leads for a partner in a single transaction.
+
+    Each input row needs `student_name` and `mobile`; `email`, `address`
+    and `current_status` are optional. New mobiles are claimed in
+    `lead_mobiles` per chunk; mobiles already owned by any partner (or
+    repeated within `rows`) are skipped unless `skip_duplicates` is False,
+    in which case they are created and reported as duplicates, as single
+    creation does.
+
+    Returns one report entry per input row:
+      {"row": n, "status": "created" | "duplicate" | "invalid", ...}
+    Duplicate rows also carry "own" (whether this partner owns the mobile)
+    and "first_seen_at".
     """
+    report: List[Dict[str, Any]] = []
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    for index, raw in enumerate(rows, start=1):
+        student_name = str(raw.get("student_name") or "").strip()
+        mobile = str(raw.get("mobile") or "").strip()
+        if not student_name or not mobile:
+            report.append(
+                {
+                    "row": index,
+                    "status": "invalid",
+                    "error": "student_name and mobile are required",
+                }
+            )
+            continue
+        lead = {
+            "student_name": student_name,
+            "mobile": mobile,
+            "mobile_normalized": normalize_mobile(mobile),
+            "email": str(raw.get("email") or "").strip() or None,
+            "address": str(raw.get("address") or "").strip() or None,
+            "current_status": str(raw.get("current_status") or "Study").strip(),
+        }
+        too_long = [
+            column
+            for column, width in _IMPORT_COLUMN_WIDTHS.items()
+            if len(lead[column] or "") > width
+        ]
+        if too_long:
+            report.append(
+                {
+                    "row": index,
+                    "status": "invalid",
+                    "error": f"{', '.join(too_long)} too long",
+                }
+            )
+            continue
+        if len(lead["mobile_normalized"]) < MOBILE_DIGITS:
+            report.append(
+                {
+                    "row": index,
+                    "status": "invalid",
+                    "error": f"mobile must have {MOBILE_DIGITS} digits",
+                }
+            )
+            continue
+        valid.append((index, lead))
+
     db = get_db()
-    cursor = db.cursor(dictionary=True)
+    cursor = db.cursor()
+    now = datetime.utcnow()
+    try:
+        # Claim every mobile, then read the owners back: the ones owned by
+        # this partner with this call's timestamp are the ones just claimed.
+        owners: Dict[str, Dict[str, Any]] = {}
+        mobiles = sorted({lead["mobile_normalized"] for _, lead in valid})
+        for chunk in _chunks(mobiles):
+            _claim_mobiles(cursor, partner_id, chunk, now)
+            owners.update(_mobile_owners(cursor, chunk, lock=True))
+        claimed = {
+            mobile
+            for mobile, owner in owners.items()
+            if owner["partner_id"] == partner_id and owner["first_seen_at"] == now
+        }
+
+        to_insert = []
+        for index, lead in valid:
+            mobile = lead["mobile_normalized"]
+            duplicate = mobile not in claimed
+            claimed.discard(mobile)
+            entry = {"row": index, "mobile": lead["mobile"], "duplicate": duplicate}
+            if duplicate:
+                owner = owners.get(mobile) or {}
+                entry["own"] = owner.get("partner_id", partner_id) == partner_id
+                entry["first_seen_at"] = owner.get("first_seen_at", now)
+            if duplicate and skip_duplicates:
+                report.append({**entry, "status": "duplicate"})
+                continue
+            report.append({**entry, "status": "created"})
+            to_insert.append(
+                (
+                    partner_id,
+                    lead["student_name"],
+                    lead["mobile"],
+                    mobile,
+                    lead["email"],
+                    lead["address"],
+                    lead["current_status"],
+                    "Pending",
+                    now,
+                )
+            )
+
+        # executemany turns each chunk into one multi-row INSERT.
+        for chunk in _chunks(to_insert):
+            cursor.executemany(
+                """
+                INSERT INTO leads
+                  (partner_id, student_name, mobile, mobile_normalized, email, address,
+                   current_status, lead_status, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                chunk,
+            )
+        if to_insert:
+            _bump_daily_stats(
+                cursor,
+                now.date(),
+                created=len(to_insert),
+                status_deltas={"Pending": len(to_insert)},
+            )
+            bump_partner_stats(cursor, {partner_id: {"total_leads": len(to_insert)}})
+            bump_data_versions(cursor, [partner_scope(partner_id)])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+    if to_insert:
+        bump_global_versions(["leads"])
+
+    report.sort(key=lambda entry: entry["row"])
+    return report
+
 
-    filters = ["1=1"]
-    params: List[Any] = []
+def _admin_lead_filters(
+    partner_id: Optional[int],
+    status: Optional[str],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    search: Optional[str] = None,
+) -> Tuple[List[str], List[Any]]:
+    """WHERE fragments + params shared by the admin lead listing and export."""
+    _, filters, params = _search_filter(search, "l.")
+    filters = filters or ["1=1"]
 
     if partner_id:
-        filters.append("partner_id = %s")
+        filters.append("l.partner_id = %s")
         params.append(partner_id)
     if status:
-        filters.append("lead_status = %s")
+        filters.append("l.lead_status = %s")
         params.append(status)
     if date_from:
-        filters.append("created_at >= %s")
+        filters.append("l.created_at >= %s")
         params.append(date_from)
     if date_to:
-        filters.append("created_at <= %s")
+        filters.append("l.created_at <= %s")
         params.append(date_to)
+    return filters, params
+
+
+def _fetch_leads_page(
+    cursor,
+    columns: str,
+    table: str,
+    alias: str,
+    filters: List[str],
+    params: List[Any],
+    search: Optional[str],
+    after: Optional[str],
+    before: Optional[str],
+    limit: int,
+) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Keyset page of leads: best match first for name searches (with the
+    score returned as `relevance`), newest first otherwise.
+    """
+    kind, _, search_params = _search_filter(search, alias)
+    if kind == "name":
+        # The float score would not survive the cursor's round trip exactly,
+        # so rows with equal scores could be skipped or repeated; a fixed
+        # DECIMAL compares the same on both sides.
+        score = (
+            f"CAST(MATCH({alias}student_name) AGAINST (%s IN BOOLEAN MODE)"
+            " AS DECIMAL(20, 10))"
+        )
+        return fetch_keyset_page(
+            cursor,
+            f"SELECT {columns}, {score} AS relevance FROM {table}",
+            filters,
+            [*search_params, *params],
+            sort_column=score,
+            id_column=f"{alias}id",
+            descending=True,
+            after=after,
+            before=before,
+            limit=limit,
+            sort_key="relevance",
+            sort_params=search_params,
+            sort_type=Decimal,
+        )
+    return fetch_keyset_page(
+        cursor,
+        f"SELECT {columns} FROM {table}",
+        filters,
+        params,
+        sort_column=f"{alias}created_at",
+        id_column=f"{alias}id",
+        descending=True,
+        after=after,
+        before=before,
+        limit=limit,
+        sort_key="created_at",
+    )
 
-    where_clause = " AND ".join(filters)
-    cursor.execute(
-        f"""
-        SELECT l.id,
+
+_ADMIN_LEAD_COLUMNS = """
+               l.id,
                l.partner_id,
                l.student_name,
                l.mobile,
@@ -88,25 +478,69 @@ def list_leads_admin(
                l.current_status,
                l.lead_status,
                l.created_at,
-               l.conversion_date
+               l.conversion_date"""
+
+
+def list_leads_admin(
+    partner_id: Optional[int] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    search: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Admin view of all leads with optional filters, newest first.
+
+    `search` matches a mobile prefix (exact once all 10 digits are given)
+    or words in the student name; name matches come best match first.
+    Keyset-paginated: pass the `after` / `before` cursor from a previous
+    page. Returns (rows, next_cursor, prev_cursor).
+    """
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
+
+    filters, params = _admin_lead_filters(partner_id, status, date_from, date_to, search)
+    page = _fetch_leads_page(
+        cursor,
+        _ADMIN_LEAD_COLUMNS,
+        "leads l",
+        "l.",
+        filters,
+        params,
+        search,
+        after,
+        before,
+        limit,
+    )
+    cursor.close()
+    return page
+
+
+def iter_leads_admin(
+    partner_id: Optional[int] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    search: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream every lead matching the admin filters, newest first (exports)."""
+    filters, params = _admin_lead_filters(partner_id, status, date_from, date_to, search)
+    return stream_rows(
+        f"""
+        SELECT {_ADMIN_LEAD_COLUMNS}
         FROM leads l
-        WHERE {where_clause}
-        ORDER BY l.created_at DESC
+        WHERE {" AND ".join(filters)}
+        ORDER BY l.created_at DESC, l.id DESC
         """,
         params,
     )
-    rows = cursor.fetchall()
-    cursor.close()
-    return rows
 
 
-def list_leads_for_partner(partner_id: int) -> List[Dict[str, Any]]:
-    """Partner view of their own leads."""
-    db = get_db()
-    cursor = db.cursor(dictionary=True)
-    cursor.execute(
-        """
-        SELECT id,
+_PARTNER_LEAD_COLUMNS = """
+               id,
                student_name,
                mobile,
                email,
@@ -114,34 +548,53 @@ def list_leads_for_partner(partner_id: int) -> List[Dict[str, Any]]:
                current_status,
                lead_status,
                created_at,
-               conversion_date
-        FROM leads
-        WHERE partner_id = %s
-        ORDER BY created_at DESC
-        """,
-        (partner_id,),
-    )
-    rows = cursor.fetchall()
-    cursor.close()
-    return rows
+               conversion_date"""
+
 
+def list_leads_for_partner(
+    partner_id: int,
+    search: Optional[str] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Partner view of their own leads, newest first.
 
-def has_lead_with_mobile(partner_id: int, mobile: str) -> bool:
-    """Check if this partner already created a lead with the same mobile."""
+    `search` works as in `list_leads_admin`, scoped to this partner.
+    Returns (rows, next_cursor, prev_cursor).
+    """
+    _, filters, params = _search_filter(search)
     db = get_db()
     cursor = db.cursor(dictionary=True)
-    cursor.execute(
-        """
-        SELECT id
-        FROM leads
-        WHERE partner_id = %s AND mobile = %s
-        LIMIT 1
-        """,
-        (partner_id, mobile),
+    page = _fetch_leads_page(
+        cursor,
+        _PARTNER_LEAD_COLUMNS,
+        "leads",
+        "",
+        ["partner_id = %s", *filters],
+        [partner_id, *params],
+        search,
+        after,
+        before,
+        limit,
     )
-    row = cursor.fetchone()
     cursor.close()
-    return row is not None
+    return page
+
+
+def get_mobile_owner(mobile: str) -> Optional[Dict[str, Any]]:
+    """
+    The partner whose lead first used this mobile (any formatting), as
+    {"partner_id", "partner_name", "first_seen_at"}, or None.
+    """
+    mobile_normalized = normalize_mobile(mobile)
+    if not mobile_normalized:
+        return None
+    cursor = get_db().cursor()
+    owner = _mobile_owners(cursor, [mobile_normalized]).get(mobile_normalized)
+    cursor.close()
+    return owner
 
 
 def get_lead_by_id(lead_id: int) -> Optional[Dict[str, Any]]:
@@ -161,6 +614,7 @@ def get_lead_by_id(lead_id: int) -> Optional[Dict[str, Any]]:
     return row
 
 
+@model_cache.invalidates()
 def update_lead_status(
     lead_id: int,
     new_status: str,
@@ -174,66 +628,213 @@ def update_lead_status(
     """
     db = get_db()
     cursor = db.cursor(dictionary=True)
-
-    cursor.execute("SELECT lead_status FROM leads WHERE id = %s", (lead_id,))
-    row = cursor.fetchone()
-    if not row:
-        cursor.close()
-        return None
-
-    old_status = row["lead_status"]
-    if old_status == new_status:
+    try:
+        cursor.execute(
+            "SELECT partner_id, lead_status, created_at FROM leads WHERE id = %s FOR UPDATE",
+            (lead_id,),
+        )
+        row = cursor.fetchone()
+        # Nothing to write: release the row lock before returning.
+        if not row:
+            db.rollback()
+            return None
+        old_status = row["lead_status"]
+        if old_status == new_status:
+            db.rollback()
+            return row
+
+        now = datetime.utcnow()
+        cursor.execute(
+            """
+            UPDATE leads
+            SET lead_status = %s,
+                conversion_date = CASE
+                    WHEN %s = 'Converted' THEN %s
+                    ELSE conversion_date
+                END
+            WHERE id = %s
+            """,
+            (new_status, new_status, now, lead_id),
+        )
+
+        # Log status change in a separate history table
+        cursor.execute(
+            """
+            INSERT INTO lead_status_history
+              (lead_id, old_status, new_status, changed_by_type, changed_by_id, changed_at)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            """,
+            (lead_id, old_status, new_status, changed_by_type, changed_by_id, now),
+        )
+        _bump_daily_stats(
+            cursor,
+            row["created_at"].date(),
+            status_deltas={old_status: -1, new_status: 1},
+        )
+        converted = (new_status == "Converted") - (old_status == "Converted")
+        if converted:
+            bump_partner_stats(cursor, {row["partner_id"]: {"converted_leads": converted}})
+        bump_data_versions(cursor, [partner_scope(row["partner_id"])])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
         cursor.close()
-        return row
-
-    now = datetime.utcnow()
-    cursor.execute(
-        """
-        UPDATE leads
-        SET lead_status = %s,
-            conversion_date = CASE
-                WHEN %s = 'Converted' THEN %s
-                ELSE conversion_date
-            END
-        WHERE id = %s
-        """,
-        (new_status, new_status, now, lead_id),
-    )
-
-    # Log status change in a separate history table
-    cursor.execute(
-        """
-        INSERT INTO lead_status_history
-          (lead_id, old_status, new_status, changed_by_type, changed_by_id, changed_at)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """,
-        (lead_id, old_status, new_status, changed_by_type, changed_by_id, now),
-    )
-
-    db.commit()
+    bump_global_versions(["leads"])
 
+    cursor = db.cursor(dictionary=True)
     cursor.execute("SELECT * FROM leads WHERE id = %s", (lead_id,))
     updated = cursor.fetchone()
     cursor.close()
     return updated
 
 
+@model_cache.invalidates()
+def bulk_update_lead_status(
+    lead_ids: List[int],
+    new_status: str,
+    changed_by_type: str,
+    changed_by_id: int,
+) -> Dict[str, Any]:
+    """
+    Move many leads to `new_status` in one transaction.
+
+    Converted leads are final and are left untouched. The lead UPDATE, the
+    status history rows, the daily rollup and, for conversions, the pending
+    payments are all written set-based and committed together.
+
+    Returns {"results": {lead_id: outcome}, "updated": n,
+    "payments_created": n} where outcome is one of "updated", "unchanged",
+    "converted_final" or "not_found".
+    """
+    from .payment_model import insert_conversion_payments
+
+    ids = list(dict.fromkeys(int(lead_id) for lead_id in lead_ids))
+    results: Dict[int, str] = {lead_id: "not_found" for lead_id in ids}
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
+    try:
+        found: List[Dict[str, Any]] = []
+        for chunk in _chunks(ids):
+            cursor.execute(
+                f"""
+                SELECT id, partner_id, lead_status, created_at
+                FROM leads
+                WHERE id IN ({", ".join(["%s"] * len(chunk))})
+                FOR UPDATE
+                """,
+                chunk,
+            )
+            found.extend(cursor.fetchall())
+
+        to_update: List[Dict[str, Any]] = []
+        for lead in found:
+            if lead["lead_status"] == "Converted":
+                results[lead["id"]] = "converted_final"
+            elif lead["lead_status"] == new_status:
+                results[lead["id"]] = "unchanged"
+            else:
+                results[lead["id"]] = "updated"
+                to_update.append(lead)
+
+        now = datetime.utcnow()
+        payments_created = 0
+        for chunk in _chunks(to_update):
+            chunk_ids = [lead["id"] for lead in chunk]
+            cursor.execute(
+                f"""
+                UPDATE leads
+                SET lead_status = %s,
+                    conversion_date = CASE
+                        WHEN %s = 'Converted' THEN %s
+                        ELSE conversion_date
+                    END
+                WHERE id IN ({", ".join(["%s"] * len(chunk_ids))})
+                """,
+                (new_status, new_status, now, *chunk_ids),
+            )
+            cursor.executemany(
+                """
+                INSERT INTO lead_status_history
+                  (lead_id, old_status, new_status, changed_by_type, changed_by_id, changed_at)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                [
+                    (
+                        lead["id"],
+                        lead["lead_status"],
+                        new_status,
+                        changed_by_type,
+                        changed_by_id,
+                        now,
+                    )
+                    for lead in chunk
+                ],
+            )
+            if new_status == "Converted":
+                payments_created += insert_conversion_payments(cursor, chunk_ids)
+
+        # One rollup upsert per creation day touched.
+        deltas: Dict[Any, Dict[str, int]] = {}
+        for lead in to_update:
+            day = deltas.setdefault(lead["created_at"].date(), {})
+            day[lead["lead_status"]] = day.get(lead["lead_status"], 0) - 1
+            day[new_status] = day.get(new_status, 0) + 1
+        for stat_date, status_deltas in sorted(deltas.items()):
+            _bump_daily_stats(cursor, stat_date, status_deltas=status_deltas)
+        # Converted leads were skipped above, so only conversions count.
+        if new_status == "Converted":
+            converted: Dict[int, Dict[str, Any]] = {}
+            for lead in to_update:
+                stats = converted.setdefault(lead["partner_id"], {"converted_leads": 0})
+                stats["converted_leads"] += 1
+            bump_partner_stats(cursor, converted)
+
+        if to_update:
+            bump_data_versions(
+                cursor, [partner_scope(lead["partner_id"]) for lead in to_update]
+            )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+    if to_update:
+        bump_global_versions(["leads", "payments"] if payments_created else ["leads"])
+
+    return {
+        "results": results,
+        "updated": len(to_update),
+        "payments_created": payments_created,
+    }
+
+
+@model_cache.cached(tags=("leads",))
 def get_admin_lead_metrics() -> Dict[str, Any]:
     """
     Aggregated metrics for admin dashboard.
+
+    Read from the `lead_daily_stats` rollup (one row per day) rather than
+    scanning `leads`; see `_bump_daily_stats` / `rebuild_lead_daily_stats`.
     """
     db = get_db()
     cursor = db.cursor(dictionary=True)
 
     metrics: Dict[str, Any] = {}
 
-    cursor.execute("SELECT COUNT(*) AS total_leads FROM leads")
-    metrics["total_leads"] = cursor.fetchone()["total_leads"]
-
     cursor.execute(
-        "SELECT COUNT(*) AS converted_leads FROM leads WHERE lead_status = 'Converted'"
+        """
+        SELECT CAST(COALESCE(SUM(created_count), 0) AS SIGNED) AS total_leads,
+               CAST(COALESCE(SUM(converted_count), 0) AS SIGNED) AS converted_leads
+        FROM lead_daily_stats
+        """
     )
-    metrics["converted_leads"] = cursor.fetchone()["converted_leads"]
+    row = cursor.fetchone()
+    metrics["total_leads"] = row["total_leads"]
+    metrics["converted_leads"] = row["converted_leads"]
 
     total = metrics["total_leads"] or 0
     converted = metrics["converted_leads"] or 0
@@ -242,10 +843,10 @@ def get_admin_lead_metrics() -> Dict[str, Any]:
     # Monthly trend: group by year-month
     cursor.execute(
         """
-        SELECT DATE_FORMAT(created_at, '%%Y-%%m') AS ym,
-               COUNT(*) AS total,
-               SUM(lead_status = 'Converted') AS converted
-        FROM leads
+        SELECT DATE_FORMAT(stat_date, '%%Y-%%m') AS ym,
+               CAST(SUM(created_count) AS SIGNED) AS total,
+               CAST(SUM(converted_count) AS SIGNED) AS converted
+        FROM lead_daily_stats
         GROUP BY ym
         ORDER BY ym DESC
         LIMIT 6
@@ -257,42 +858,121 @@ def get_admin_lead_metrics() -> Dict[str, Any]:
     return metrics
 
 
-def get_partner_performance() -> List[Dict[str, Any]]:
+@model_cache.invalidates()
+def rebuild_lead_daily_stats() -> int:
     """
-    Partner-wise performance for admin analytics.
+    Recompute `lead_daily_stats` from `leads` (backfill / repair).
 
-    Includes total leads, converted leads, and payment aggregates.
+    Runs as one transaction, so readers see either the old or the new
+    rollup. Lead writes block on the locks it takes until it commits;
+    run it off-peak on large tables. Returns the number of days written.
     """
     db = get_db()
-    cursor = db.cursor(dictionary=True)
+    cursor = db.cursor()
+    cursor.execute("DELETE FROM lead_daily_stats")
     cursor.execute(
         """
+        INSERT INTO lead_daily_stats
+          (stat_date, created_count, pending_count, in_process_count,
+           converted_count, not_converted_count)
+        SELECT DATE(created_at),
+               COUNT(*),
+               SUM(lead_status = 'Pending'),
+               SUM(lead_status = 'In-Process'),
+               SUM(lead_status = 'Converted'),
+               SUM(lead_status = 'Not Converted')
+        FROM leads
+        GROUP BY DATE(created_at)
+        """
+    )
+    days = cursor.rowcount
+    db.commit()
+    cursor.close()
+    bump_global_versions(["leads"])
+    return days
+
+
+# Per-partner totals come from the `partner_stats` rollup (one row per
+# partner with leads or payments), so a page never aggregates `leads` or
+# `payments`; see bump_partner_stats / rebuild_partner_stats.
+_LEADERBOARD_SELECT = """
         SELECT
           p.id AS partner_id,
           p.name AS partner_name,
-          COUNT(DISTINCT l.id) AS total_leads,
-          SUM(CASE WHEN l.lead_status = 'Converted' THEN 1 ELSE 0 END) AS converted_leads,
-          COALESCE(
-            SUM(CASE WHEN pay.status = 'Pending' THEN pay.amount END),
-            0
-          ) AS pending_amount,
-          COALESCE(
-            SUM(CASE WHEN pay.status = 'Released' THEN pay.amount END),
-            0
-          ) AS released_amount
+          COALESCE(s.total_leads, 0) AS total_leads,
+          COALESCE(s.converted_leads, 0) AS converted_leads,
+          COALESCE(s.converted_leads / NULLIF(s.total_leads, 0) * 100, 0)
+            AS conversion_rate,
+          COALESCE(s.pending_amount, 0) AS pending_amount,
+          COALESCE(s.released_amount, 0) AS released_amount
         FROM partners p
-        LEFT JOIN leads l ON l.partner_id = p.id
-        LEFT JOIN payments pay ON pay.partner_id = p.id
+        LEFT JOIN partner_stats s ON s.partner_id = p.id
         WHERE p.is_deleted = 0
-        GROUP BY p.id, p.name
-        ORDER BY total_leads DESC
-        """
+"""
+
+# Public sort key -> leaderboard column
+LEADERBOARD_SORTS = {
+    "total": "total_leads",
+    "converted": "converted_leads",
+    "conversion_rate": "conversion_rate",
+    "pending": "pending_amount",
+    "released": "released_amount",
+}
+
+
+@model_cache.cached(tags=("leads", "payments", "partners"))
+def get_partner_leaderboard(
+    sort: str = "total",
+    direction: str = "desc",
+    page: int = 1,
+    per_page: int = 20,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Paginated partner leaderboard for admin analytics.
+
+    `sort` is one of LEADERBOARD_SORTS; ties are broken by partner id so
+    pages are stable. Returns (rows, total_partners).
+    """
+    column = LEADERBOARD_SORTS.get(sort, "total_leads")
+    order = "ASC" if direction == "asc" else "DESC"
+    total = count_partners()
+
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
+    cursor.execute(
+        f"""
+        {_LEADERBOARD_SELECT}
+        ORDER BY {column} {order}, p.id ASC
+        LIMIT %s OFFSET %s
+        """,
+        (per_page, (page - 1) * per_page),
     )
     rows = cursor.fetchall()
     cursor.close()
+    return rows, total
+
+
+def get_partner_performance(limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Top partners by total leads for the admin dashboard.
+
+    Includes total leads, converted leads, and payment aggregates.
+    """
+    rows, _ = get_partner_leaderboard(sort="total", page=1, per_page=limit)
     return rows
 
 
+def iter_partner_performance() -> Iterator[Dict[str, Any]]:
+    """Stream partner-wise performance rows for all partners (exports)."""
+    return stream_rows(
+        f"""
+        {_LEADERBOARD_SELECT}
+        ORDER BY total_leads DESC, p.id ASC
+        """
+    )
+
+
+@model_cache.cached(tags=("partner:{partner_id}",))
 def get_partner_lead_metrics(partner_id: int) -> Dict[str, Any]:
     """Metrics for a specific partner."""
     db = get_db()
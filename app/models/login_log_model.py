@@ -1,43 +1,52 @@
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-from ..extensions import get_db
+from ..extensions import get_db, invalidation_bus, login_log_buffer, token_cache
+from ..write_behind import INSERT_SQL
 
 
 def log_login(user_type: str, user_id: int, ip_address: str, user_agent: str, jti: str):
     """
     Insert a login attempt record.
 
-    Expected table schema (adjust as needed):
+    Table schema (see app/migrations):
       login_logs(
         id, user_type, user_id, ip_address, user_agent,
         jti, login_time, logout_time, is_active
       )
+
+    With LOGIN_LOG_WRITE_BEHIND on, the row is queued and written in a
+    batch shortly after; `is_token_active` already treats it as active.
     """
+    record = (
+        user_type,
+        user_id,
+        ip_address,
+        user_agent[:255],
+        jti,
+        datetime.utcnow(),
+        None,
+        1,
+    )
+    if login_log_buffer.enabled and login_log_buffer.add(jti, record):
+        token_cache.set(jti, True)
+        return
+
     db = get_db()
     cursor = db.cursor()
-    cursor.execute(
-        """
-        INSERT INTO login_logs
-          (user_type, user_id, ip_address, user_agent, jti, login_time, is_active)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """,
-        (
-            user_type,
-            user_id,
-            ip_address,
-            user_agent[:255],
-            jti,
-            datetime.utcnow(),
-            1,
-        ),
-    )
+    cursor.execute(INSERT_SQL, record)
     db.commit()
     cursor.close()
+    token_cache.set(jti, True)
 
 
 def deactivate_session(jti: str):
     """Mark a login_log row as inactive based on JWT ID (logout)."""
+    now = datetime.utcnow()
+    if login_log_buffer.deactivate(jti, now):
+        # Not written yet: the queued record is written inactive instead.
+        invalidation_bus.publish("token", jti)
+        return
     db = get_db()
     cursor = db.cursor()
     cursor.execute(
@@ -46,14 +55,31 @@ def deactivate_session(jti: str):
         SET is_active = 0, logout_time = %s
         WHERE jti = %s AND is_active = 1
         """,
-        (datetime.utcnow(), jti),
+        (now, jti),
     )
     db.commit()
     cursor.close()
+    invalidation_bus.publish("token", jti)
 
 
 def is_token_active(jti: str) -> bool:
-    """Check if a given JWT ID is still marked as active."""
+    """
+    Check if a given JWT ID is still marked as active.
+
+    Active JTIs are cached per worker for TOKEN_CACHE_TTL seconds. A logout
+    evicts the entry on this worker immediately and is published on the
+    invalidation bus ("token"), so the other workers evict it within
+    INVALIDATION_POLL_INTERVAL plus one poll; should publishing fail, the
+    entry expires after TOKEN_CACHE_TTL. Inactive / unknown JTIs are never
+    cached.
+    """
+    queued = login_log_buffer.lookup(jti)
+    if queued is not None:
+        return queued
+    if token_cache.get(jti):
+        return True
+
+    generation = token_cache.generation()
     db = get_db()
     cursor = db.cursor(dictionary=True)
     cursor.execute(
@@ -66,5 +92,8 @@ def is_token_active(jti: str) -> bool:
     )
     row = cursor.fetchone()
     cursor.close()
-    return row is not None
+    if row is None:
+        return False
+    token_cache.set(jti, True, generation=generation)
+    return True
 
@@ -0,0 +1,137 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def clamp_page_size(per_page: Optional[int]) -> int:
+    """Page size from user input, bounded to 1..MAX_PAGE_SIZE."""
+    if not per_page:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(per_page, MAX_PAGE_SIZE))
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        # str() gives 'YYYY-MM-DD HH:MM:SS[.ffffff]' which MySQL parses back.
+        return str(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Opaque, URL-safe cursor for a (sort value, id) position."""
+    raw = json.dumps([_cursor_value(sort_value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Tuple[Any, int]]:
+    """Inverse of `encode_cursor`; returns None for missing or malformed cursors."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        return None
+    if not isinstance(value, list) or len(value) != 2 or not isinstance(value[1], int):
+        return None
+    return value[0], value[1]
+
+
+def fetch_keyset_page(
+    cursor,
+    select_sql: str,
+    filters: Sequence[str],
+    params: Sequence[Any],
+    sort_column: Optional[str],
+    id_column: str,
+    descending: bool,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    sort_key: Optional[str] = None,
+    sort_params: Sequence[Any] = (),
+    sort_type: Optional[Callable[[Any], Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Run `select_sql` with keyset pagination on (sort_column, id_column).
+
+    `select_sql` is everything up to (not including) WHERE. `after` pages
+    forward from a cursor, `before` pages backward. `sort_key` / "id" are the
+    keys used to read the position back from each row; with `sort_column`
+    None the listing is ordered by id alone. `sort_column` may be an
+    expression with placeholders (e.g. a MATCH ... AGAINST score), bound
+    from `sort_params` wherever it appears. `sort_type` converts the sort
+    value read back from a cursor (e.g. Decimal, so it is compared exactly
+    with a DECIMAL sort expression); a cursor it rejects is ignored.
+
+    Returns (rows, next_cursor, prev_cursor).
+    """
+    where = list(filters) or ["1=1"]
+    args: List[Any] = list(params)
+
+    position = decode_cursor(before) if before else decode_cursor(after)
+    if position is not None and sort_type is not None:
+        try:
+            position = (sort_type(position[0]), position[1])
+        except (TypeError, ValueError, ArithmeticError):
+            position = None
+    backward = bool(before) and position is not None
+    # Walking backward means flipping both the comparison and the order.
+    ascending = descending == backward
+    op = ">" if ascending else "<"
+    order = "ASC" if ascending else "DESC"
+
+    if position is not None:
+        sort_value, row_id = position
+        if sort_column:
+            where.append(
+                f"({sort_column} {op} %s OR ({sort_column} = %s AND {id_column} {op} %s))"
+            )
+            args.extend([*sort_params, sort_value, *sort_params, sort_value, row_id])
+        else:
+            where.append(f"{id_column} {op} %s")
+            args.append(row_id)
+
+    order_by = f"{id_column} {order}"
+    if sort_column:
+        order_by = f"{sort_column} {order}, {order_by}"
+        args.extend(sort_params)
+
+    cursor.execute(
+        f"""
+        {select_sql}
+        WHERE {" AND ".join(where)}
+        ORDER BY {order_by}
+        LIMIT %s
+        """,
+        (*args, limit + 1),
+    )
+    rows = cursor.fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+
+    def _cursor_for(row: Dict[str, Any]) -> str:
+        return encode_cursor(row[sort_key] if sort_key else None, row["id"])
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if backward:
+            next_cursor = _cursor_for(rows[-1])
+            if has_more:
+                prev_cursor = _cursor_for(rows[0])
+        else:
+            if has_more:
+                next_cursor = _cursor_for(rows[-1])
+            if position is not None:
+                prev_cursor = _cursor_for(rows[0])
+    return rows, next_cursor, prev_cursor
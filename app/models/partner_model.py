@@ -1,13 +1,68 @@
+import re
 from typing import Optional, Dict, Any, List, Tuple
 
-from ..extensions import get_db, hash_password
+from ..extensions import (
+    account_cache,
+    get_db,
+    hash_password,
+    invalidation_bus,
+    model_cache,
+    partner_directory,
+)
+from .data_version_model import bump_data_versions, bump_global_versions, partner_scope
+from .pagination import DEFAULT_PAGE_SIZE, fetch_keyset_page
+
+# Typeahead results per query; queries of digits match mobile prefixes.
+LOOKUP_LIMIT = 10
+_MOBILE_PREFIX = re.compile(r"^\d+$")
+
+
+def _like_prefix(text: str) -> str:
+    """LIKE pattern matching values that start with `text` literally."""
+    return re.sub(r"([\\%_])", r"\\\1", text) + "%"
+
+
+def _prefix_search(search: Optional[str]) -> Tuple[Optional[str], str]:
+    """(column, normalized text) for a prefix search: mobile if all digits, else name."""
+    search = " ".join((search or "").split())
+    if not search:
+        return None, ""
+    return ("mobile" if _MOBILE_PREFIX.match(search) else "name"), search
+
+
+def _bump_partner_counts(cursor, deltas: Dict[str, int]) -> None:
+    """
+    Apply per-status deltas to the `partner_counts` rollup (non-deleted
+    partners only). Must run in the transaction of the partner write.
+    """
+    deltas = {status: delta for status, delta in sorted(deltas.items()) if delta}
+    if not deltas:
+        return
+    cursor.execute(
+        f"""
+        INSERT INTO partner_counts (status, partner_count)
+        VALUES {", ".join(["(%s, %s)"] * len(deltas))}
+        ON DUPLICATE KEY UPDATE partner_count = partner_count + VALUES(partner_count)
+        """,
+        [value for item in deltas.items() for value in item],
+    )
+
+
+def _lock_partner_status(cursor, partner_id: int) -> Optional[str]:
+    """Current status of a non-deleted partner, row-locked until commit."""
+    cursor.execute(
+        "SELECT status FROM partners WHERE id = %s AND is_deleted = 0 FOR UPDATE",
+        (partner_id,),
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
 
 
 def get_partner_by_mobile(mobile: str) -> Optional[Dict[str, Any]]:
     """
     Fetch a partner row by mobile.
 
-    Expected table schema (adjust as needed):
+    Table schema (see app/migrations):
       partners(id, name, email, mobile, password_hash, status, is_deleted)
     """
     db = get_db()
@@ -43,19 +98,45 @@ def get_partner_by_id(partner_id: int) -> Optional[Dict[str, Any]]:
     return row
 
 
-def list_partners(
-    page: int = 1,
-    per_page: int = 20,
-    status: Optional[str] = None,
-) -> Tuple[List[Dict[str, Any]], int]:
+def is_partner_active(partner_id: int) -> bool:
     """
-    Paginated list of partners for admin.
+    Whether the partner exists, is not deleted and has status `active`.
 
-    Returns (rows, total_count).
+    Backed by the per-worker account cache; misses only read the two
+    status columns instead of the full partner row.
     """
+    key = ("partner", partner_id)
+    cached = account_cache.get(key)
+    if cached is not None:
+        return cached
+
+    generation = account_cache.generation()
     db = get_db()
     cursor = db.cursor(dictionary=True)
+    cursor.execute(
+        "SELECT status, is_deleted FROM partners WHERE id = %s", (partner_id,)
+    )
+    row = cursor.fetchone()
+    cursor.close()
+
+    active = bool(row and not row["is_deleted"] and row["status"] == "active")
+    account_cache.set(key, active, generation=generation)
+    return active
 
+
+def list_partners(
+    status: Optional[str] = None,
+    search: Optional[str] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Partners for the admin list, newest first, keyset-paginated on id.
+
+    `search` is a name prefix, or a mobile prefix when it is all digits.
+    Totals come from `count_partners`. Returns (rows, next_cursor, prev_cursor).
+    """
     filters = ["is_deleted = 0"]
     params: List[Any] = []
 
@@ -63,44 +144,129 @@ def list_partners(
         filters.append("status = %s")
         params.append(status)
 
-    where_clause = " AND ".join(filters)
+    column, search = _prefix_search(search)
+    if column:
+        filters.append(f"{column} LIKE %s")
+        params.append(_like_prefix(search))
+
+    cursor = get_db().cursor(dictionary=True)
+    page = fetch_keyset_page(
+        cursor,
+        """
+        SELECT id, name, email, mobile, status, shop_name, profession, address
+        FROM partners
+        """,
+        filters,
+        params,
+        None,
+        "id",
+        True,
+        after,
+        before,
+        limit,
+    )
+    cursor.close()
+    return page
+
+
+def lookup_partners(query: str, limit: int = LOOKUP_LIMIT) -> List[Dict[str, Any]]:
+    """
+    Non-deleted partners whose name (or, for digits, mobile) starts with
+    `query`, as [{"id", "name"}], for the admin filter typeahead.
 
-    # Total count
-    cursor.execute(f"SELECT COUNT(*) AS cnt FROM partners WHERE {where_clause}", params)
-    total = cursor.fetchone()["cnt"]
+    Cached per worker in `partner_directory`; partner writes clear it on
+    every worker.
+    """
+    column, query = _prefix_search(query)
+    if not column:
+        return []
+    key = ("lookup", query.lower(), limit)
+    cached = partner_directory.get(key)
+    if cached is not None:
+        return cached
 
-    offset = (page - 1) * per_page
+    generation = partner_directory.generation()
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
     cursor.execute(
         f"""
-        SELECT id, name, email, mobile, status, shop_name, profession, address
+        SELECT id, name
         FROM partners
-        WHERE {where_clause}
-        ORDER BY id DESC
-        LIMIT %s OFFSET %s
+        WHERE is_deleted = 0 AND {column} LIKE %s
+        ORDER BY {column}, id
+        LIMIT %s
         """,
-        (*params, per_page, offset),
+        (_like_prefix(query), limit),
     )
     rows = cursor.fetchall()
     cursor.close()
-    return rows, total
+    partner_directory.set(key, rows, generation=generation)
+    return rows
+
+
+def get_partner_name(partner_id: int) -> Optional[str]:
+    """Partner name (deleted partners included), cached like lookup_partners."""
+    key = ("name", partner_id)
+    cached = partner_directory.get(key)
+    if cached is not None:
+        return cached
+
+    generation = partner_directory.generation()
+    db = get_db()
+    cursor = db.cursor()
+    cursor.execute("SELECT name FROM partners WHERE id = %s", (partner_id,))
+    row = cursor.fetchone()
+    cursor.close()
+    if row is None:
+        return None
+    partner_directory.set(key, row[0], generation=generation)
+    return row[0]
+
+
+@model_cache.cached(tags=("partners",))
+def count_partners(status: Optional[str] = None) -> int:
+    """Non-deleted partners, optionally of one status, from `partner_counts`."""
+    db = get_db()
+    cursor = db.cursor()
+    if status:
+        cursor.execute(
+            "SELECT partner_count FROM partner_counts WHERE status = %s", (status,)
+        )
+    else:
+        cursor.execute("SELECT CAST(SUM(partner_count) AS SIGNED) FROM partner_counts")
+    row = cursor.fetchone()
+    cursor.close()
+    return (row[0] if row else None) or 0
 
 
 def count_active_partners() -> int:
     """Total number of non-deleted partners (any status)."""
+    return count_partners()
+
+
+@model_cache.invalidates()
+def rebuild_partner_counts() -> int:
+    """Recompute `partner_counts` from `partners`; returns the statuses written."""
     db = get_db()
-    cursor = db.cursor(dictionary=True)
+    cursor = db.cursor()
+    cursor.execute("DELETE FROM partner_counts")
     cursor.execute(
         """
-        SELECT COUNT(*) AS cnt
+        INSERT INTO partner_counts (status, partner_count)
+        SELECT status, COUNT(*)
         FROM partners
         WHERE is_deleted = 0
+        GROUP BY status
         """
     )
-    row = cursor.fetchone()
+    statuses = cursor.rowcount
+    db.commit()
     cursor.close()
-    return row["cnt"]
+    bump_global_versions(["partners"])
+    return statuses
 
 
+@model_cache.invalidates()
 def create_partner(
     name: str,
     mobile: str,
@@ -124,12 +290,16 @@ def create_partner(
         """,
         (name, mobile, email, password_hash, status, shop_name, profession, address),
     )
-    db.commit()
     partner_id = cursor.lastrowid
+    _bump_partner_counts(cursor, {status: 1})
+    db.commit()
     cursor.close()
+    bump_global_versions(["partners"])
+    invalidation_bus.publish("partner_directory")
     return partner_id
 
 
+@model_cache.invalidates()
 def update_partner_profile_admin(
     partner_id: int,
     name: str,
@@ -142,6 +312,7 @@ def update_partner_profile_admin(
     """Admin-side editable fields for partner profile (no password/mobile)."""
     db = get_db()
     cursor = db.cursor()
+    old_status = _lock_partner_status(cursor, partner_id)
     cursor.execute(
         """
         UPDATE partners
@@ -155,10 +326,17 @@ def update_partner_profile_admin(
         """,
         (name, email, status, shop_name, profession, address, partner_id),
     )
+    if old_status is not None and old_status != status:
+        _bump_partner_counts(cursor, {old_status: -1, status: 1})
+    bump_data_versions(cursor, [partner_scope(partner_id)])
     db.commit()
     cursor.close()
+    bump_global_versions(["partners"])
+    invalidation_bus.publish("account", ("partner", partner_id))
+    invalidation_bus.publish("partner_directory")
 
 
+@model_cache.invalidates()
 def update_partner_profile_self(
     partner_id: int,
     name: str,
@@ -186,14 +364,31 @@ def update_partner_profile_self(
         """,
         (name, shop_name, profession, email, address, partner_id),
     )
+    bump_data_versions(cursor, [partner_scope(partner_id)])
+    db.commit()
+    cursor.close()
+    bump_global_versions(["partners"])
+    invalidation_bus.publish("partner_directory")
+
+
+def update_partner_password_hash(partner_id: int, password_hash: str) -> None:
+    """Replace a partner's stored hash (e.g. after a bcrypt cost change)."""
+    db = get_db()
+    cursor = db.cursor()
+    cursor.execute(
+        "UPDATE partners SET password_hash = %s WHERE id = %s",
+        (password_hash, partner_id),
+    )
     db.commit()
     cursor.close()
 
 
+@model_cache.invalidates()
 def set_partner_status(partner_id: int, status: str) -> None:
     """Activate / deactivate partner account."""
     db = get_db()
     cursor = db.cursor()
+    old_status = _lock_partner_status(cursor, partner_id)
     cursor.execute(
         """
         UPDATE partners
@@ -202,14 +397,21 @@ def set_partner_status(partner_id: int, status: str) -> None:
         """,
         (status, partner_id),
     )
+    if old_status is not None and old_status != status:
+        _bump_partner_counts(cursor, {old_status: -1, status: 1})
+    bump_data_versions(cursor, [partner_scope(partner_id)])
     db.commit()
     cursor.close()
+    bump_global_versions(["partners"])
+    invalidation_bus.publish("account", ("partner", partner_id))
 
 
+@model_cache.invalidates()
 def soft_delete_partner(partner_id: int) -> None:
     """Soft delete partner – they can no longer log in or create leads."""
     db = get_db()
     cursor = db.cursor()
+    old_status = _lock_partner_status(cursor, partner_id)
     cursor.execute(
         """
         UPDATE partners
@@ -218,6 +420,12 @@ def soft_delete_partner(partner_id: int) -> None:
         """,
         (partner_id,),
     )
+    if old_status is not None:
+        _bump_partner_counts(cursor, {old_status: -1})
+    bump_data_versions(cursor, [partner_scope(partner_id)])
     db.commit()
     cursor.close()
+    bump_global_versions(["partners"])
+    invalidation_bus.publish("account", ("partner", partner_id))
+    invalidation_bus.publish("partner_directory")
 
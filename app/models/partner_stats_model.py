@@ -0,0 +1,77 @@
+from typing import Any, Dict, List
+
+from ..extensions import get_db, model_cache
+from .data_version_model import bump_global_versions
+
+_STAT_COLUMNS = ("total_leads", "converted_leads", "pending_amount", "released_amount")
+
+
+def bump_partner_stats(cursor, deltas: Dict[int, Dict[str, Any]]) -> None:
+    """
+    Apply per-partner deltas, e.g. {partner_id: {"total_leads": 1}}, to the
+    `partner_stats` rollup.
+
+    Must run in the same transaction as the lead / payment write it
+    accounts for. Partners are upserted in id order to keep row-lock order
+    stable.
+
+    Expected schema:
+      partner_stats(
+        partner_id PK, total_leads, converted_leads, pending_amount,
+        released_amount
+      )
+    """
+    rows: List[Any] = []
+    for partner_id, columns in sorted(deltas.items()):
+        rows.extend([partner_id, *(columns.get(col, 0) for col in _STAT_COLUMNS)])
+    if not rows:
+        return
+    placeholders = "(" + ", ".join(["%s"] * (len(_STAT_COLUMNS) + 1)) + ")"
+    cursor.execute(
+        f"""
+        INSERT INTO partner_stats (partner_id, {", ".join(_STAT_COLUMNS)})
+        VALUES {", ".join([placeholders] * len(deltas))}
+        ON DUPLICATE KEY UPDATE
+          {", ".join(f"{col} = {col} + VALUES({col})" for col in _STAT_COLUMNS)}
+        """,
+        rows,
+    )
+
+
+@model_cache.invalidates()
+def rebuild_partner_stats() -> int:
+    """
+    Recompute `partner_stats` from `leads` and `payments`; returns the
+    number of partners written. Lead and payment writes block on the locks
+    it takes until it commits; run it off-peak on large tables.
+    """
+    db = get_db()
+    cursor = db.cursor()
+    cursor.execute("DELETE FROM partner_stats")
+    cursor.execute(
+        """
+        INSERT INTO partner_stats (partner_id, total_leads, converted_leads)
+        SELECT partner_id, COUNT(*), SUM(lead_status = 'Converted')
+        FROM leads
+        GROUP BY partner_id
+        """
+    )
+    cursor.execute(
+        """
+        INSERT INTO partner_stats (partner_id, pending_amount, released_amount)
+        SELECT partner_id,
+               SUM(CASE WHEN status = 'Pending' THEN amount ELSE 0 END),
+               SUM(CASE WHEN status = 'Released' THEN amount ELSE 0 END)
+        FROM payments
+        GROUP BY partner_id
+        ON DUPLICATE KEY UPDATE
+          pending_amount = VALUES(pending_amount),
+          released_amount = VALUES(released_amount)
+        """
+    )
+    cursor.execute("SELECT COUNT(*) FROM partner_stats")
+    (partners,) = cursor.fetchone()
+    db.commit()
+    cursor.close()
+    bump_global_versions(["leads", "payments"])
+    return partners
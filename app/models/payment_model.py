@@ -1,9 +1,16 @@
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from flask import current_app
 
-from ..extensions import get_db
+from ..extensions import get_db, model_cache
+from .data_version_model import bump_data_versions, bump_global_versions, partner_scope
+from .pagination import DEFAULT_PAGE_SIZE, fetch_keyset_page
+from .partner_stats_model import bump_partner_stats
+from .streaming import stream_rows
+
+# Payments fall due this many days after the lead's conversion date.
+PAYMENT_DUE_DAYS = 15
 
 
 def payment_exists_for_lead(lead_id: int) -> bool:
@@ -23,6 +30,7 @@ def payment_exists_for_lead(lead_id: int) -> bool:
     return row is not None
 
 
+@model_cache.invalidates()
 def create_payment_for_conversion(lead_id: int, partner_id: int) -> Optional[int]:
     """
     Create a pending payment for a converted lead if one does not already exist.
@@ -43,7 +51,7 @@ def create_payment_for_conversion(lead_id: int, partner_id: int) -> Optional[int
 
     conversion_date = row["conversion_date"]
     amount = current_app.config.get("DEFAULT_CONVERSION_AMOUNT", 10000.0)
-    due_date = conversion_date + timedelta(days=15)
+    due_date = conversion_date + timedelta(days=PAYMENT_DUE_DAYS)
 
     cursor = db.cursor()
     cursor.execute(
@@ -54,22 +62,22 @@ def create_payment_for_conversion(lead_id: int, partner_id: int) -> Optional[int
         """,
         (partner_id, lead_id, amount, "Pending", due_date, datetime.utcnow()),
     )
-    db.commit()
     payment_id = cursor.lastrowid
+    bump_partner_stats(cursor, {partner_id: {"pending_amount": amount}})
+    bump_data_versions(cursor, [partner_scope(partner_id)])
+    db.commit()
     cursor.close()
+    bump_global_versions(["payments"])
     return payment_id
 
 
-def list_payments_admin(
-    partner_id: Optional[int] = None,
-    status: Optional[str] = None,
-    due_from: Optional[datetime] = None,
-    due_to: Optional[datetime] = None,
-) -> List[Dict[str, Any]]:
-    """Admin view of all payments."""
-    db = get_db()
-    cursor = db.cursor(dictionary=True)
-
+def _admin_payment_filters(
+    partner_id: Optional[int],
+    status: Optional[str],
+    due_from: Optional[datetime],
+    due_to: Optional[datetime],
+) -> Tuple[List[str], List[Any]]:
+    """WHERE fragments + params shared by the admin payment listing and export."""
     filters = ["1=1"]
     params: List[Any] = []
 
@@ -85,10 +93,10 @@ def list_payments_admin(
     if due_to:
         filters.append("p.due_date <= %s")
         params.append(due_to)
+    return filters, params
 
-    where_clause = " AND ".join(filters)
-    cursor.execute(
-        f"""
+
+_ADMIN_PAYMENT_SELECT = """
         SELECT p.id,
                p.partner_id,
                p.lead_id,
@@ -98,16 +106,113 @@ def list_payments_admin(
                p.released_date,
                p.created_at
         FROM payments p
-        WHERE {where_clause}
-        ORDER BY p.due_date ASC
+"""
+
+
+def insert_conversion_payments(cursor, lead_ids: List[int]) -> int:
+    """
+    Create pending payments for converted leads in one statement.
+
+    Runs on the caller's cursor so it joins the caller's transaction (no
+    commit here). Leads without a conversion date or that already have a
+    payment are skipped. Returns the number of payments created.
+    """
+    if not lead_ids:
+        return 0
+    amount = current_app.config.get("DEFAULT_CONVERSION_AMOUNT", 10000.0)
+    now = datetime.utcnow().replace(microsecond=0)
+    cursor.execute(
+        f"""
+        INSERT INTO payments
+          (partner_id, lead_id, amount, status, due_date, created_at)
+        SELECT l.partner_id,
+               l.id,
+               %s,
+               'Pending',
+               l.conversion_date + INTERVAL {PAYMENT_DUE_DAYS} DAY,
+               %s
+        FROM leads l
+        LEFT JOIN payments pay ON pay.lead_id = l.id
+        WHERE l.id IN ({", ".join(["%s"] * len(lead_ids))})
+          AND l.conversion_date IS NOT NULL
+          AND pay.id IS NULL
         """,
+        (amount, now, *lead_ids),
+    )
+    created = cursor.rowcount
+    if created:
+        # The rows just inserted are the ones with this call's timestamp.
+        cursor.execute(
+            f"""
+            INSERT INTO partner_stats (partner_id, pending_amount)
+            SELECT partner_id, SUM(amount)
+            FROM payments
+            WHERE lead_id IN ({", ".join(["%s"] * len(lead_ids))})
+              AND created_at = %s
+            GROUP BY partner_id
+            ORDER BY partner_id
+            ON DUPLICATE KEY UPDATE pending_amount = pending_amount + VALUES(pending_amount)
+            """,
+            (*lead_ids, now),
+        )
+    return created
+
+
+def list_payments_admin(
+    partner_id: Optional[int] = None,
+    status: Optional[str] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Admin view of all payments, earliest due first.
+
+    Keyset-paginated on (due_date, id): pass the `after` / `before` cursor
+    from a previous page. Returns (rows, next_cursor, prev_cursor).
+    """
+    db = get_db()
+    cursor = db.cursor(dictionary=True)
+
+    filters, params = _admin_payment_filters(partner_id, status, due_from, due_to)
+    page = fetch_keyset_page(
+        cursor,
+        _ADMIN_PAYMENT_SELECT,
+        filters,
         params,
+        sort_column="p.due_date",
+        id_column="p.id",
+        descending=False,
+        after=after,
+        before=before,
+        limit=limit,
+        sort_key="due_date",
     )
-    rows = cursor.fetchall()
     cursor.close()
-    return rows
+    return page
+
+
+def iter_payments_admin(
+    partner_id: Optional[int] = None,
+    status: Optional[str] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream every payment matching the admin filters, earliest due first (exports)."""
+    filters, params = _admin_payment_filters(partner_id, status, due_from, due_to)
+    return stream_rows(
+        f"""
+        {_ADMIN_PAYMENT_SELECT}
+        WHERE {" AND ".join(filters)}
+        ORDER BY p.due_date ASC, p.id ASC
+        """,
+        params,
+    )
 
 
+@model_cache.invalidates()
 def mark_payment_released(payment_id: int) -> None:
     """
     Set payment status to Released and set released_date.
@@ -126,10 +231,21 @@ def mark_payment_released(payment_id: int) -> None:
         """,
         ("Released", now, payment_id),
     )
+    released = cursor.rowcount
+    if released:
+        cursor.execute("SELECT partner_id, amount FROM payments WHERE id = %s", (payment_id,))
+        partner_id, amount = cursor.fetchone()
+        bump_partner_stats(
+            cursor, {partner_id: {"pending_amount": -amount, "released_amount": amount}}
+        )
+        bump_data_versions(cursor, [partner_scope(partner_id)])
     db.commit()
     cursor.close()
+    if released:
+        bump_global_versions(["payments"])
 
 
+@model_cache.cached(tags=("partner:{partner_id}",))
 def list_payments_for_partner(partner_id: int) -> List[Dict[str, Any]]:
     """Partner view of their payments."""
     db = get_db()
@@ -154,6 +270,7 @@ def list_payments_for_partner(partner_id: int) -> List[Dict[str, Any]]:
     return rows
 
 
+@model_cache.cached(tags=("payments",))
 def get_admin_payment_metrics() -> Dict[str, Any]:
     """Aggregate payment metrics for admin dashboard."""
     db = get_db()
@@ -184,6 +301,7 @@ def get_admin_payment_metrics() -> Dict[str, Any]:
     return metrics
 
 
+@model_cache.cached(tags=("partner:{partner_id}",))
 def get_partner_payment_metrics(partner_id: int) -> Dict[str, Any]:
     """Payment metrics for a specific partner."""
     db = get_db()
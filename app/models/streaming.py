@@ -0,0 +1,30 @@
+from typing import Any, Dict, Iterator, Sequence
+
+from ..extensions import db_pool
+
+
+def stream_rows(
+    sql: str, params: Sequence[Any] = (), batch_size: int = 1000
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield rows of `sql` one by one from an unbuffered server-side cursor.
+
+    Runs on its own pooled connection (not the request one) so memory stays
+    flat regardless of result size and the request connection remains usable.
+    If the consumer stops early the connection still has unread rows on the
+    wire, so it is closed instead of being returned to the pool.
+    """
+    conn = db_pool.acquire()
+    finished = False
+    try:
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+        cursor.close()
+        finished = True
+    finally:
+        db_pool.release(conn, discard=not finished)
@@ -1,7 +1,22 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+import csv
+import io
+import itertools
+
+from flask import (
+    Blueprint,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from ..auth.decorators import partner_required
+from ..reports.conditional import conditional_get
+from ..reports.routes import partner_summary_scopes
 from ..models.partner_model import (
     get_partner_by_id,
     update_partner_profile_self,
@@ -9,9 +24,12 @@ from ..models.partner_model import (
 from ..models.lead_model import (
     list_leads_for_partner,
     create_lead_for_partner,
-    has_lead_with_mobile,
+    import_leads_for_partner,
     get_partner_lead_metrics,
+    normalize_mobile,
+    MOBILE_DIGITS,
 )
+from ..models.pagination import clamp_page_size
 from ..models.payment_model import (
     list_payments_for_partner,
     get_partner_payment_metrics,
@@ -23,8 +41,9 @@ partner_bp = Blueprint("partner", __name__, template_folder="../templates/partne
 @partner_bp.get("/dashboard")
 @jwt_required()
 @partner_required
+@conditional_get(partner_summary_scopes)
 def dashboard():
-    """Partner dashboard with quick metrics."""
+    """Partner dashboard with quick metrics (supports If-None-Match)."""
     identity = get_jwt_identity() or {}
     partner_id = identity.get("id")
 
@@ -90,12 +109,24 @@ def profile_update():
 def leads_list():
     identity = get_jwt_identity() or {}
     partner_id = identity.get("id")
-    leads = list_leads_for_partner(partner_id)
-    duplicate = request.args.get("duplicate") == "1"
+    q = (request.args.get("q") or "").strip()
+    per_page = clamp_page_size(request.args.get("per_page", type=int))
+    leads, next_cursor, prev_cursor = list_leads_for_partner(
+        partner_id,
+        search=q or None,
+        after=request.args.get("after") or None,
+        before=request.args.get("before") or None,
+        limit=per_page,
+    )
+    duplicate = request.args.get("duplicate")
     return render_template(
         "partner/leads.html",
         leads=leads,
         duplicate=duplicate,
+        q=q,
+        per_page=per_page,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
     )
 
 
@@ -106,12 +137,6 @@ def leads_create():
     identity = get_jwt_identity() or {}
     partner_id = identity.get("id")
 
-    partner = get_partner_by_id(partner_id)
-    if not partner or partner.get("is_deleted") or partner.get("status") != "active":
-        # Extra guard, though decorator also enforces this.
-        flash("Your account is inactive. You cannot create leads.", "error")
-        return redirect(url_for("partner.leads_list"))
-
     form = request.form
     student_name = (form.get("student_name") or "").strip()
     mobile = (form.get("mobile") or "").strip()
@@ -123,22 +148,95 @@ def leads_create():
         flash("Student name and mobile are required.", "error")
         return redirect(url_for("partner.leads_list"))
 
-    duplicate = has_lead_with_mobile(partner_id, mobile)
+    if len(normalize_mobile(mobile)) < MOBILE_DIGITS:
+        flash(f"Enter a mobile number with {MOBILE_DIGITS} digits.", "error")
+        return redirect(url_for("partner.leads_list"))
 
-    create_lead_for_partner(
+    lead_id, duplicate = create_lead_for_partner(
         partner_id=partner_id,
         student_name=student_name,
         mobile=mobile,
         email=email,
         address=address,
         current_status=current_status,
+        duplicate_policy=current_app.config["LEAD_DUPLICATE_POLICY"],
     )
 
+    # Other partners' names are not shown to partners.
+    owner = None
+    if duplicate:
+        owner = "own" if duplicate["partner_id"] == partner_id else "other"
+    if lead_id is None:
+        first_seen = duplicate["first_seen_at"].strftime("%d %b %Y")
+        who = "you" if owner == "own" else "another partner"
+        flash(f"This mobile was already registered by {who} on {first_seen}.", "error")
+        return redirect(url_for("partner.leads_list"))
+
     flash("Lead created successfully.", "success")
     # Optional duplicate warning flag
-    return redirect(
-        url_for("partner.leads_list", duplicate="1" if duplicate else "0")
+    return redirect(url_for("partner.leads_list", duplicate=owner))
+
+
+@partner_bp.post("/leads/import")
+@jwt_required()
+@partner_required
+def leads_import():
+    """
+    Bulk lead upload.
+
+    Accepts either a CSV file upload (`file`, header row with student_name,
+    mobile, email, address, current_status) or a JSON body
+    {"leads": [...], "skip_duplicates": true}. JSON callers get the per-row
+    report back; form uploads get a flash summary.
+    """
+    identity = get_jwt_identity() or {}
+    partner_id = identity.get("id")
+    max_rows = current_app.config["LEAD_IMPORT_MAX_ROWS"]
+
+    if request.is_json:
+        data = request.get_json(silent=True) or {}
+        rows = data.get("leads")
+        skip_duplicates = bool(data.get("skip_duplicates", True))
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            return jsonify({"msg": "`leads` must be a list of objects"}), 400
+    else:
+        upload = request.files.get("file")
+        if not upload:
+            flash("Choose a CSV file to import.", "error")
+            return redirect(url_for("partner.leads_list"))
+        try:
+            text = io.TextIOWrapper(upload.stream, encoding="utf-8-sig")
+            # One row past the limit is enough to reject the file.
+            rows = list(itertools.islice(csv.DictReader(text), max_rows + 1))
+        except (UnicodeDecodeError, csv.Error):
+            flash("Could not read the file; upload a UTF-8 encoded CSV.", "error")
+            return redirect(url_for("partner.leads_list"))
+        # The form sends the checkbox value first, then a hidden "0".
+        skip_duplicates = request.form.get("skip_duplicates", "1") == "1"
+    if current_app.config["LEAD_DUPLICATE_POLICY"] == "reject":
+        skip_duplicates = True
+
+    if len(rows) > max_rows:
+        msg = f"Too many rows; the limit is {max_rows} per import."
+        if request.is_json:
+            return jsonify({"msg": msg}), 413
+        flash(msg, "error")
+        return redirect(url_for("partner.leads_list"))
+
+    report = import_leads_for_partner(partner_id, rows, skip_duplicates=skip_duplicates)
+    counts = {"created": 0, "duplicate": 0, "invalid": 0}
+    for entry in report:
+        counts[entry["status"]] += 1
+
+    if request.is_json:
+        return jsonify({**counts, "rows": report}), 200
+
+    flash(
+        f"Import finished: {counts['created']} created, "
+        f"{counts['duplicate']} duplicates skipped, {counts['invalid']} invalid.",
+        "success" if counts["created"] else "error",
     )
+    return redirect(url_for("partner.leads_list"))
 
 
 # -------------------------
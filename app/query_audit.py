@@ -0,0 +1,132 @@
+"""
+Opt-in query auditor for the `get_db()` connection (QUERY_AUDIT=1).
+
+Records every statement a request runs (normalized text, number of bound
+parameters, duration, calling model function and line), logs statements
+slower than QUERY_AUDIT_SLOW_MS, and flags statements repeated at least
+QUERY_AUDIT_REPEAT_THRESHOLD times in one request as N+1 candidates.
+With QUERY_AUDIT_REPORT (on by default in development) a per-request
+report is logged and the query count is sent in an X-Query-Count header.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from flask import current_app, g, has_app_context, has_request_context, request
+
+from .instrumentation import QueryEvent, add_query_listener
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"(\bVALUES\s*\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.IGNORECASE)
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Statement shape used to group queries: whitespace collapsed, literals
+    replaced by `?` and variable-length IN / VALUES lists folded.
+    """
+    text = " ".join(statement.split())
+    text = _STRING_LITERAL.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _IN_LIST.sub("IN (...)", text)
+    return _VALUES_LIST.sub(r"\1, ...", text)
+
+
+class QueryAuditor:
+    def __init__(self):
+        self.enabled = False
+        self.slow_ms = 100.0
+        self.repeat_threshold = 3
+        self.report = False
+
+    def init_app(self, app) -> None:
+        cfg = app.config
+        self.enabled = cfg.get("QUERY_AUDIT", False)
+        self.slow_ms = cfg.get("QUERY_AUDIT_SLOW_MS", self.slow_ms)
+        self.repeat_threshold = cfg.get("QUERY_AUDIT_REPEAT_THRESHOLD", self.repeat_threshold)
+        self.report = cfg.get("QUERY_AUDIT_REPORT", self.report)
+        if not self.enabled:
+            return
+
+        add_query_listener(self._on_query)
+        app.after_request(self._after_request)
+        app.extensions["query_audit"] = self
+
+    def _on_query(self, event: QueryEvent) -> None:
+        duration_ms = event.duration * 1000.0
+        record = {
+            "statement": normalize_statement(event.statement),
+            "params": event.params_count,
+            "many": event.many,
+            "duration_ms": duration_ms,
+            "caller": event.caller,
+            "call_site": event.call_site,
+        }
+        if duration_ms >= self.slow_ms and has_app_context():
+            current_app.logger.warning(
+                "Slow query %.1f ms in %s (%s): %s",
+                duration_ms,
+                record["caller"],
+                record["call_site"],
+                record["statement"],
+            )
+        if has_request_context():
+            g.setdefault("_query_audit", []).append(record)
+
+    def summarize(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Totals and N+1 candidates for one request's records."""
+        groups: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for record in records:
+            group = groups.setdefault(
+                record["statement"],
+                {
+                    "statement": record["statement"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "callers": [],
+                },
+            )
+            group["count"] += 1
+            group["total_ms"] += record["duration_ms"]
+            site = f"{record['caller']} ({record['call_site']})"
+            if site not in group["callers"]:
+                group["callers"].append(site)
+        return {
+            "queries": len(records),
+            "total_ms": sum(record["duration_ms"] for record in records),
+            "repeated": [
+                group for group in groups.values() if group["count"] >= self.repeat_threshold
+            ],
+        }
+
+    def _after_request(self, response):
+        records = g.pop("_query_audit", [])
+        summary = self.summarize(records)
+        where = f"{request.method} {request.path}"
+        logger = current_app.logger
+
+        for group in summary["repeated"]:
+            logger.warning(
+                "Possible N+1 in %s: %d x %s from %s",
+                where,
+                group["count"],
+                group["statement"],
+                ", ".join(group["callers"]),
+            )
+
+        if self.report:
+            lines = [
+                f"{where}: {summary['queries']} queries, {summary['total_ms']:.1f} ms in DB"
+            ]
+            for record in records:
+                lines.append(
+                    f"  {record['duration_ms']:8.2f} ms  {record['caller']}"
+                    f"  [{record['params']} params{' x many' if record['many'] else ''}]"
+                    f"  {record['statement']}"
+                )
+            logger.info("\n".join(lines))
+            response.headers["X-Query-Count"] = str(summary["queries"])
+        return response
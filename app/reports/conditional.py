@@ -0,0 +1,53 @@
+import hashlib
+import json
+from functools import wraps
+from typing import Callable, List
+
+from flask import make_response, request, session
+
+from ..models.data_version_model import get_data_versions
+
+# Bump when a response format changes so clients drop cached copies.
+_ETAG_FORMAT = "1"
+
+
+def conditional_get(scopes: Callable[[], List[str]]):
+    """
+    ETag / 304 support for read endpoints backed by `data_versions`.
+
+    `scopes()` names the data the endpoint depends on. The ETag is derived
+    from the endpoint name and those scopes' counters, so a matching
+    If-None-Match is answered with 304 before the view (and its metric
+    queries) runs. Place below the auth decorators. A view can opt out for
+    one response by setting `Cache-Control: no-store` on it; pages with
+    pending flash messages are always rendered.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if session.get("_flashes"):
+                return fn(*args, **kwargs)
+
+            versions = get_data_versions(scopes())
+            raw = json.dumps([_ETAG_FORMAT, request.endpoint, versions], sort_keys=True)
+            etag = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+            if request.if_none_match.contains(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if "no-store" in (response.headers.get("Cache-Control") or ""):
+                    return response
+
+            response.set_etag(etag)
+            # Responses depend on who is asking (header or cookie JWT);
+            # never share them.
+            response.headers["Cache-Control"] = "private, no-cache"
+            response.vary.add("Authorization")
+            response.vary.add("Cookie")
+            return response
+
+        return wrapper
+
+    return decorator
@@ -1,40 +1,86 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from ..auth.decorators import admin_required, partner_required
-from ..models.partner_model import count_active_partners
+from ..extensions import (
+    db_pool,
+    invalidation_bus,
+    login_log_buffer,
+    model_cache,
+    password_hasher,
+    token_cache,
+    account_cache,
+)
+from ..models.data_version_model import partner_scope
 from ..models.lead_model import (
-    get_admin_lead_metrics,
     get_partner_lead_metrics,
-    get_partner_performance,
-)
-from ..models.payment_model import (
-    get_admin_payment_metrics,
-    get_partner_payment_metrics,
+    get_partner_leaderboard,
+    LEADERBOARD_SORTS,
 )
+from ..models.pagination import clamp_page_size
+from ..models.payment_model import get_partner_payment_metrics
+from .conditional import conditional_get
+from .snapshot import get_admin_dashboard_snapshot
 
 reports_bp = Blueprint("reports", __name__)
 
 
+def admin_summary_scopes():
+    return ["leads", "payments", "partners"]
+
+
+def partner_summary_scopes():
+    identity = get_jwt_identity() or {}
+    return [partner_scope(identity.get("id"))]
+
+
 @reports_bp.get("/admin/summary")
 @jwt_required()
 @admin_required
+@conditional_get(admin_summary_scopes)
 def admin_summary():
     """
     JSON summary for admin analytics dashboard.
+
+    `partial` / `timed_out` / `failed` report aggregates that did not finish
+    in time or raised.
+    Supports If-None-Match; partial snapshots are never cached.
+    """
+    snapshot = get_admin_dashboard_snapshot()
+    response = jsonify(snapshot)
+    if snapshot["partial"]:
+        response.headers["Cache-Control"] = "no-store"
+    return response, 200
+
+
+@reports_bp.get("/admin/leaderboard")
+@jwt_required()
+@admin_required
+def admin_leaderboard():
+    """
+    Paginated partner leaderboard.
+
+    Query args: sort (total, converted, conversion_rate, pending, released),
+    dir (asc / desc), page, per_page. `per_page=N&page=1` gives the top N.
     """
-    total_partners = count_active_partners()
-    lead_metrics = get_admin_lead_metrics()
-    payment_metrics = get_admin_payment_metrics()
-    partner_perf = get_partner_performance()
+    sort = request.args.get("sort", "total")
+    if sort not in LEADERBOARD_SORTS:
+        return jsonify({"msg": "Invalid sort", "allowed": sorted(LEADERBOARD_SORTS)}), 400
+    direction = "asc" if request.args.get("dir") == "asc" else "desc"
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = clamp_page_size(request.args.get("per_page", 20, type=int))
 
+    rows, total = get_partner_leaderboard(
+        sort=sort, direction=direction, page=page, per_page=per_page
+    )
     return (
         jsonify(
             {
-                "total_partners": total_partners,
-                "lead_metrics": lead_metrics,
-                "payment_metrics": payment_metrics,
-                "partner_performance": partner_perf,
+                "partners": rows,
+                "total": total,
+                "page": page,
+                "per_page": per_page,
+                "has_next": total > page * per_page,
             }
         ),
         200,
@@ -44,9 +90,10 @@ def admin_summary():
 @reports_bp.get("/partner/summary")
 @jwt_required()
 @partner_required
+@conditional_get(partner_summary_scopes)
 def partner_summary():
     """
-    JSON summary of metrics for a specific partner.
+    JSON summary of metrics for a specific partner (supports If-None-Match).
     """
     identity = get_jwt_identity() or {}
     partner_id = identity.get("id")
@@ -65,3 +112,24 @@ def partner_summary():
     )
 
 
+@reports_bp.get("/admin/runtime-stats")
+@jwt_required()
+@admin_required
+def runtime_stats():
+    """
+    Per-worker runtime counters (connection pool usage etc.) for capacity sizing.
+    """
+    return (
+        jsonify(
+            {
+                "db_pool": db_pool.stats(),
+                "token_cache": token_cache.stats(),
+                "account_cache": account_cache.stats(),
+                "password_hasher": password_hasher.stats(),
+                "login_log_buffer": login_log_buffer.stats(),
+                "model_cache": model_cache.stats(),
+                "invalidation_bus": invalidation_bus.stats(),
+            }
+        ),
+        200,
+    )
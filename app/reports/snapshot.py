@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Tuple
+
+from flask import current_app
+
+from ..extensions import get_db
+from ..models.partner_model import count_active_partners
+from ..models.lead_model import get_admin_lead_metrics, get_partner_performance
+from ..models.payment_model import get_admin_payment_metrics
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_slots = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+class _DeadlinePassed(Exception):
+    """A task was still queued when the snapshot's deadline passed."""
+
+
+def _get_executor(
+    max_workers: int, max_pending: int
+) -> Tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    """
+    Process-wide executor and its slots for queued + running tasks,
+    recreated after a fork (threads do not survive it).
+    """
+    global _executor, _executor_slots, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="dashboard"
+            )
+            _executor_slots = threading.BoundedSemaphore(max_pending)
+            _executor_pid = os.getpid()
+        return _executor, _executor_slots
+
+
+def _run_in_app_context(app, fn: Callable[[], Any], deadline: float) -> Any:
+    # Each task gets its own app context, hence its own pooled connection,
+    # which teardown_appcontext hands back when the task finishes.
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if remaining_ms <= 0:
+        raise _DeadlinePassed()
+    with app.app_context():
+        db = get_db()
+        cursor = db.cursor()
+        # The server aborts SELECTs still running at the deadline instead
+        # of letting them hold the connection after the page has gone out.
+        cursor.execute("SET SESSION max_execution_time = %s", (remaining_ms,))
+        try:
+            return fn()
+        finally:
+            cursor.execute("SET SESSION max_execution_time = DEFAULT")
+            cursor.close()
+
+
+def get_admin_dashboard_snapshot() -> Dict[str, Any]:
+    """
+    Admin dashboard metrics, with the independent aggregates run concurrently.
+
+    Every aggregate runs on its own pooled connection, its statements capped
+    by max_execution_time at DASHBOARD_QUERY_TIMEOUT seconds. An aggregate
+    that has not finished by then, or could not be queued because
+    DASHBOARD_MAX_PENDING tasks are already waiting, is reported as None and
+    listed in `timed_out`; one that raised is reported as None and listed in
+    `failed`. Either sets `partial`.
+    """
+    app = current_app._get_current_object()
+    cfg = app.config
+    top_partners = cfg["DASHBOARD_TOP_PARTNERS"]
+
+    tasks: Dict[str, Callable[[], Any]] = {
+        "total_partners": count_active_partners,
+        "lead_metrics": get_admin_lead_metrics,
+        "payment_metrics": get_admin_payment_metrics,
+        "partner_performance": lambda: get_partner_performance(limit=top_partners),
+    }
+
+    executor, slots = _get_executor(
+        cfg["DASHBOARD_MAX_WORKERS"], cfg["DASHBOARD_MAX_PENDING"]
+    )
+    deadline = time.monotonic() + cfg["DASHBOARD_QUERY_TIMEOUT"]
+    snapshot: Dict[str, Any] = {}
+    timed_out = []
+    failed = []
+
+    futures = {}
+    for name, fn in tasks.items():
+        if not slots.acquire(blocking=False):
+            snapshot[name] = None
+            timed_out.append(name)
+            continue
+        future = executor.submit(_run_in_app_context, app, fn, deadline)
+        future.add_done_callback(lambda _: slots.release())
+        futures[name] = future
+
+    for name, future in futures.items():
+        try:
+            snapshot[name] = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except (FutureTimeoutError, _DeadlinePassed):
+            future.cancel()
+            snapshot[name] = None
+            timed_out.append(name)
+        except Exception:
+            logger.exception("Dashboard aggregate %s failed", name)
+            snapshot[name] = None
+            failed.append(name)
+
+    snapshot["partial"] = bool(timed_out or failed)
+    snapshot["timed_out"] = timed_out
+    snapshot["failed"] = failed
+    return snapshot
@@ -0,0 +1,318 @@
+"""
+Synthetic data at production-like volumes (`flask seed`).
+
+Appends partners, leads with a skewed per-partner distribution, their
+status history, payments for converted leads and login logs, using
+multi-row INSERTs committed per batch. Ids are assigned here (after the
+current MAX(id) of each table), so a run is fully determined by its
+arguments and `seed` and the generated rows can reference each other
+without reading anything back. Meant for local / benchmark databases only.
+"""
+
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from flask import current_app
+
+from .extensions import get_db, hash_password
+from .models.data_version_model import bump_global_versions
+from .models.lead_model import normalize_mobile, rebuild_lead_daily_stats
+from .models.partner_model import rebuild_partner_counts
+from .models.partner_stats_model import rebuild_partner_stats
+from .models.payment_model import PAYMENT_DUE_DAYS
+
+BENCH_ADMIN_EMAIL = "bench-admin@example.com"
+SEED_PASSWORD = "password123"
+
+# Share of leads per final status, and of current_status values.
+LEAD_STATUS_WEIGHTS = {
+    "Pending": 40,
+    "In-Process": 25,
+    "Converted": 20,
+    "Not Converted": 15,
+}
+CURRENT_STATUS_WEIGHTS = {"Study": 60, "Job": 30, "Drop": 10}
+
+_FIRST_NAMES = (
+    "Aarav", "Vivaan", "Aditya", "Vihaan", "Arjun", "Sai", "Reyansh", "Ayaan",
+    "Ananya", "Diya", "Saanvi", "Aadhya", "Pari", "Anika", "Navya", "Myra",
+    "Rahul", "Priya", "Rohan", "Sneha", "Karan", "Pooja", "Amit", "Neha",
+)
+_LAST_NAMES = (
+    "Sharma", "Verma", "Gupta", "Singh", "Kumar", "Patel", "Shah", "Mehta",
+    "Jain", "Agarwal", "Bansal", "Reddy", "Nair", "Iyer", "Das", "Yadav",
+)
+_USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0",
+    "Mozilla/5.0 (Linux; Android 13) Chrome/120.0 Mobile",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) Safari/604.1",
+)
+
+
+def _next_id(cursor, table: str) -> int:
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+    return cursor.fetchone()[0] + 1
+
+
+def _insert(
+    cursor, table: str, columns: Sequence[str], rows: List[tuple], ignore: bool = False
+) -> None:
+    if rows:
+        cursor.executemany(
+            f"INSERT {'IGNORE ' if ignore else ''}INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})",
+            rows,
+        )
+
+
+def _weighted(rng: random.Random, weights: Dict[str, int]) -> Callable[[], str]:
+    values = list(weights)
+    cum = list(accumulate(weights.values()))
+    return lambda: rng.choices(values, cum_weights=cum)[0]
+
+
+def _random_time(rng: random.Random, start: datetime, end: datetime) -> datetime:
+    span = max(int((end - start).total_seconds()), 1)
+    return start + timedelta(seconds=rng.randrange(span))
+
+
+def seed(
+    partners: int = 1000,
+    leads: int = 100000,
+    login_logs: int = 100000,
+    days: int = 365,
+    skew: float = 1.1,
+    batch_size: int = 5000,
+    seed_value: int = 42,
+    echo: Optional[Callable[[str], Any]] = print,
+) -> Dict[str, int]:
+    """
+    Append generated rows and rebuild `lead_daily_stats`, `partner_counts`
+    and `partner_stats`.
+
+    Leads are spread over partners with Zipf-like weights (rank ** -skew),
+    so a few partners own most leads, as in production. All seeded accounts
+    (and the bench admin, BENCH_ADMIN_EMAIL) use SEED_PASSWORD.
+
+    Returns the number of rows written per table. Must be called inside an
+    app context.
+    """
+    echo = echo or (lambda message: None)
+    rng = random.Random(seed_value)
+    db = get_db()
+    cursor = db.cursor()
+    now = datetime.utcnow().replace(microsecond=0)
+    start = now - timedelta(days=days)
+    amount = current_app.config.get("DEFAULT_CONVERSION_AMOUNT", 10000.0)
+    password_hash = hash_password(SEED_PASSWORD)
+    counts = dict.fromkeys(
+        ("partners", "leads", "lead_mobiles", "lead_status_history", "payments", "login_logs"),
+        0,
+    )
+
+    # Bulk-load settings for this session only. The connection goes back to
+    # the pool afterwards, so they are restored even when seeding fails.
+    cursor.execute("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+    try:
+        cursor.execute(
+            """
+            INSERT INTO admins (email, password_hash, name, is_active)
+            VALUES (%s, %s, %s, 1)
+            ON DUPLICATE KEY UPDATE password_hash = VALUES(password_hash), is_active = 1
+            """,
+            (BENCH_ADMIN_EMAIL, password_hash, "Bench Admin"),
+        )
+        cursor.execute("SELECT id FROM admins WHERE email = %s", (BENCH_ADMIN_EMAIL,))
+        admin_id = cursor.fetchone()[0]
+        db.commit()
+
+        # Partners -------------------------------------------------------------
+        first_partner = _next_id(cursor, "partners")
+        partner_ids = list(range(first_partner, first_partner + partners))
+        for chunk_start in range(0, partners, batch_size):
+            rows = []
+            for partner_id in partner_ids[chunk_start:chunk_start + batch_size]:
+                roll = rng.random()
+                rows.append(
+                    (
+                        partner_id,
+                        f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)} {partner_id}",
+                        f"partner{partner_id}@example.com",
+                        f"9{partner_id:09d}",
+                        password_hash,
+                        "inactive" if roll < 0.05 else "active",
+                        1 if roll > 0.98 else 0,
+                        f"Shop {partner_id}",
+                        rng.choice(("Teacher", "Consultant", "Shop owner", "Student")),
+                        _random_time(rng, start, now),
+                    )
+                )
+            _insert(
+                cursor,
+                "partners",
+                ("id", "name", "email", "mobile", "password_hash", "status",
+                 "is_deleted", "shop_name", "profession", "created_at"),
+                rows,
+            )
+            db.commit()
+            counts["partners"] += len(rows)
+        echo(f"partners: {counts['partners']}")
+
+        # Leads, status history and payments -------------------------------------
+        if partner_ids and leads:
+            partner_cum = list(
+                accumulate(rank ** -skew for rank in range(1, len(partner_ids) + 1))
+            )
+            shuffled = partner_ids[:]
+            rng.shuffle(shuffled)  # so heavy partners are not simply the lowest ids
+            lead_status = _weighted(rng, LEAD_STATUS_WEIGHTS)
+            current_status = _weighted(rng, CURRENT_STATUS_WEIGHTS)
+            next_lead = _next_id(cursor, "leads")
+            last_lead = next_lead + leads
+
+            while next_lead < last_lead:
+                size = min(batch_size, last_lead - next_lead)
+                owners = rng.choices(shuffled, cum_weights=partner_cum, k=size)
+                lead_rows, mobile_rows, history_rows, payment_rows = [], [], [], []
+                for offset, partner_id in enumerate(owners):
+                    lead_id = next_lead + offset
+                    mobile = str(rng.randint(6000000000, 9999999999))
+                    created_at = _random_time(rng, start, now)
+                    status = lead_status()
+                    conversion_date = None
+                    if status == "Converted":
+                        conversion_date = min(created_at + timedelta(days=rng.randint(1, 60)), now)
+                    lead_rows.append(
+                        (
+                            lead_id,
+                            partner_id,
+                            f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}",
+                            mobile,
+                            normalize_mobile(mobile),
+                            f"student{lead_id}@example.com" if rng.random() < 0.6 else None,
+                            current_status(),
+                            status,
+                            created_at,
+                            conversion_date,
+                        )
+                    )
+                    mobile_rows.append((normalize_mobile(mobile), partner_id, created_at))
+
+                    if status != "Pending":
+                        changed_at = min(created_at + timedelta(days=rng.randint(0, 10)), now)
+                        history_rows.append(
+                            (lead_id, "Pending", "In-Process", "admin", admin_id, changed_at)
+                        )
+                        if status != "In-Process":
+                            history_rows.append(
+                                (
+                                    lead_id,
+                                    "In-Process",
+                                    status,
+                                    "admin",
+                                    admin_id,
+                                    conversion_date or min(changed_at + timedelta(days=5), now),
+                                )
+                            )
+
+                    if conversion_date is not None:
+                        due_date = conversion_date + timedelta(days=PAYMENT_DUE_DAYS)
+                        released = due_date < now and rng.random() < 0.7
+                        payment_rows.append(
+                            (
+                                partner_id,
+                                lead_id,
+                                amount,
+                                "Released" if released else "Pending",
+                                due_date,
+                                due_date + timedelta(days=rng.randint(0, 5)) if released else None,
+                                conversion_date,
+                            )
+                        )
+
+                _insert(
+                    cursor,
+                    "leads",
+                    ("id", "partner_id", "student_name", "mobile", "mobile_normalized",
+                     "email", "current_status", "lead_status", "created_at",
+                     "conversion_date"),
+                    lead_rows,
+                )
+                # Random mobiles can repeat; the first lead inserted keeps the claim.
+                _insert(
+                    cursor,
+                    "lead_mobiles",
+                    ("mobile_normalized", "partner_id", "first_seen_at"),
+                    mobile_rows,
+                    ignore=True,
+                )
+                counts["lead_mobiles"] += cursor.rowcount
+                _insert(
+                    cursor,
+                    "lead_status_history",
+                    ("lead_id", "old_status", "new_status", "changed_by_type",
+                     "changed_by_id", "changed_at"),
+                    history_rows,
+                )
+                _insert(
+                    cursor,
+                    "payments",
+                    ("partner_id", "lead_id", "amount", "status", "due_date",
+                     "released_date", "created_at"),
+                    payment_rows,
+                )
+                db.commit()
+                counts["leads"] += len(lead_rows)
+                counts["lead_status_history"] += len(history_rows)
+                counts["payments"] += len(payment_rows)
+                next_lead += size
+                echo(f"leads: {counts['leads']}/{leads}")
+
+        # Login logs ---------------------------------------------------------------
+        written = 0
+        while written < login_logs and partner_ids:
+            size = min(batch_size, login_logs - written)
+            rows = []
+            for _ in range(size):
+                login_time = _random_time(rng, start, now)
+                is_admin = rng.random() < 0.05
+                # Most sessions are long over; recent ones may still be active.
+                active = login_time > now - timedelta(days=1) and rng.random() < 0.5
+                rows.append(
+                    (
+                        "admin" if is_admin else "partner",
+                        admin_id if is_admin else rng.choice(partner_ids),
+                        f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                        rng.choice(_USER_AGENTS),
+                        f"{rng.getrandbits(128):032x}",
+                        login_time,
+                        None if active else login_time + timedelta(minutes=rng.randint(1, 120)),
+                        1 if active else 0,
+                    )
+                )
+            _insert(
+                cursor,
+                "login_logs",
+                ("user_type", "user_id", "ip_address", "user_agent", "jti",
+                 "login_time", "logout_time", "is_active"),
+                rows,
+            )
+            db.commit()
+            written += size
+            echo(f"login_logs: {written}/{login_logs}")
+        counts["login_logs"] = written
+    finally:
+        cursor.execute("SET SESSION unique_checks = 1, foreign_key_checks = 1")
+        cursor.close()
+
+    bump_global_versions(["leads", "payments", "partners"])
+
+    days_written = rebuild_lead_daily_stats()
+    echo(f"lead_daily_stats rebuilt ({days_written} days).")
+    rebuild_partner_counts()
+    echo("partner_counts rebuilt.")
+    rebuild_partner_stats()
+    echo("partner_stats rebuilt.")
+    return counts
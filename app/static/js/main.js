@@ -10,3 +10,51 @@ document.addEventListener("click", (event) => {
   setTimeout(() => btn.classList.remove("btn-active"), 150);
 });
 
+
+// Partner filter typeahead (admin leads / payments). Suggestions come from
+// /admin/partners/lookup and are shown as "Name #id"; picking one fills the
+// hidden partner_id field, clearing the box removes the filter. The request
+// is authenticated by the access-token cookie set at login.
+const PARTNER_ID_SUFFIX = /#(\d+)$/;
+
+document.querySelectorAll(".partner-typeahead").forEach((input, index) => {
+  const target = input.form.elements[input.dataset.target];
+  const list = document.createElement("datalist");
+  list.id = `partner-typeahead-${index}`;
+  input.setAttribute("list", list.id);
+  input.after(list);
+
+  let timer = null;
+  let controller = null;
+
+  input.addEventListener("input", () => {
+    const match = input.value.match(PARTNER_ID_SUFFIX);
+    target.value = match ? match[1] : "";
+    clearTimeout(timer);
+    const query = input.value.trim();
+    if (!query || match) return;
+
+    timer = setTimeout(async () => {
+      if (controller) controller.abort();
+      controller = new AbortController();
+      const url = `${input.dataset.lookupUrl}?q=${encodeURIComponent(query)}`;
+      try {
+        const response = await fetch(url, {
+          credentials: "same-origin",
+          signal: controller.signal,
+        });
+        if (!response.ok) return;
+        const data = await response.json();
+        list.replaceChildren(
+          ...data.partners.map((partner) => {
+            const option = document.createElement("option");
+            option.value = `${partner.name} #${partner.id}`;
+            return option;
+          })
+        );
+      } catch (err) {
+        if (err.name !== "AbortError") throw err;
+      }
+    }, 200);
+  });
+});
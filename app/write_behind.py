@@ -0,0 +1,221 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from mysql.connector import errors
+
+logger = logging.getLogger(__name__)
+
+
+INSERT_SQL = """
+    INSERT INTO login_logs
+      (user_type, user_id, ip_address, user_agent, jti,
+       login_time, logout_time, is_active)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+      logout_time = COALESCE(logout_time, VALUES(logout_time)),
+      is_active = LEAST(is_active, VALUES(is_active))
+"""
+
+# Errors caused by the rows themselves; anything else (a lost connection,
+# a pool timeout) says nothing about them and the rows stay queued.
+_ROW_ERRORS = (errors.IntegrityError, errors.DataError, errors.ProgrammingError)
+
+
+class LoginLogBuffer:
+    """
+    Optional write-behind queue for `login_logs` inserts.
+
+    Records are kept in-process, keyed by JTI, and written by a background
+    thread with multi-row INSERTs once `batch_size` records are waiting or
+    `flush_interval` seconds have passed, and once more at interpreter exit.
+    While a record is buffered, `lookup()` lets the token check treat
+    its JTI as active, and a logout only marks the queued record inactive.
+
+    Rows are upserted on the JTI, so a retried or re-queued record is
+    harmless. When the database is unreachable the queue is kept and
+    retried with backoff (up to MAX_BACKOFF seconds); it is bounded by
+    `max_size`, beyond which logins are written synchronously. Only when
+    a batch is rejected for its data are the rows written one at a time,
+    and those rejected again are logged and dropped.
+
+    Other workers only see a login once it is flushed, so keep the interval
+    short (or leave the feature off) when requests of one session may land
+    on different workers.
+    """
+
+    MAX_BACKOFF = 30.0
+
+    def __init__(self):
+        self.enabled = False
+        self.batch_size = 200
+        self.flush_interval = 1.0
+        self.max_size = 10000
+        self._pending: "OrderedDict[str, Tuple[Any, ...]]" = OrderedDict()
+        self._lock = threading.Condition(threading.Lock())
+        # Serialises flushes so a synchronous flush waits for the background one.
+        self._flush_lock = threading.Lock()
+        self._thread_pid: Optional[int] = None
+        self._atexit_registered = False
+        self.flushed = 0
+        self.batches = 0
+        self.overflowed = 0
+        self.failures = 0
+        self.dropped = 0
+
+    def init_app(self, app) -> None:
+        cfg = app.config
+        self.enabled = cfg.get("LOGIN_LOG_WRITE_BEHIND", self.enabled)
+        self.batch_size = cfg.get("LOGIN_LOG_BATCH_SIZE", self.batch_size)
+        self.flush_interval = cfg.get("LOGIN_LOG_FLUSH_INTERVAL", self.flush_interval)
+        self.max_size = cfg.get("LOGIN_LOG_QUEUE_SIZE", self.max_size)
+        app.extensions["login_log_buffer"] = self
+
+    def _ensure_thread(self) -> None:
+        # Called with the lock held; threads do not survive a fork, so each
+        # worker process starts its own flusher on first use.
+        if self._thread_pid == os.getpid():
+            return
+        self._thread_pid = os.getpid()
+        self._pending.clear()
+        thread = threading.Thread(
+            target=self._run, name="login-log-flusher", daemon=True
+        )
+        thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+
+    def add(self, jti: str, record: Tuple[Any, ...]) -> bool:
+        """
+        Queue one `login_logs` row (column order as in INSERT_SQL).
+
+        Returns False when the queue is full; the caller should then write
+        the row synchronously.
+        """
+        with self._lock:
+            self._ensure_thread()
+            if len(self._pending) >= self.max_size:
+                self.overflowed += 1
+                return False
+            self._pending[jti] = record
+            if len(self._pending) >= self.batch_size:
+                self._lock.notify()
+            return True
+
+    def lookup(self, jti: str) -> Optional[bool]:
+        """Whether a queued JTI is active; None when it is not queued."""
+        with self._lock:
+            record = self._pending.get(jti)
+        return None if record is None else bool(record[-1])
+
+    def deactivate(self, jti: str, logout_time: Any) -> bool:
+        """
+        Mark a queued record logged out; it is written inactive. Returns
+        False when the JTI is not queued (its row is in the table).
+        """
+        with self._lock:
+            record = self._pending.get(jti)
+            if record is None:
+                return False
+            # A flush already writing the old record leaves this one queued.
+            self._pending[jti] = record[:-2] + (logout_time, 0)
+            return True
+
+    def _run(self) -> None:
+        failed_rounds = 0
+        while True:
+            with self._lock:
+                self._lock.wait_for(
+                    lambda: len(self._pending) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+            try:
+                self.flush()
+                failed_rounds = 0
+            except Exception:
+                # Rows stay queued and are retried after a growing pause.
+                logger.exception("Flushing buffered login logs failed")
+                failed_rounds += 1
+                time.sleep(min(self.flush_interval * 2 ** failed_rounds, self.MAX_BACKOFF))
+
+    def flush(self) -> int:
+        """Write every queued record now; returns the number written."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending or self._thread_pid != os.getpid():
+                    return 0
+                batch = list(self._pending.items())
+
+            try:
+                try:
+                    self._write([record for _, record in batch])
+                    written = len(batch)
+                except _ROW_ERRORS:
+                    logger.exception("Buffered login logs rejected; writing rows one by one")
+                    written = self._write_each(batch)
+            except Exception:
+                with self._lock:
+                    self.failures += 1
+                raise
+
+            # Only forget the JTIs once their rows are committed (or
+            # dropped), and keep records changed meanwhile (a logout) for
+            # the next flush.
+            with self._lock:
+                for jti, record in batch:
+                    if self._pending.get(jti) is record:
+                        del self._pending[jti]
+                self.flushed += written
+                self.batches += 1
+            return written
+
+    def _write(self, records) -> None:
+        from .extensions import db_pool
+
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(records), self.batch_size):
+                cursor.executemany(INSERT_SQL, records[start : start + self.batch_size])
+            conn.commit()
+            cursor.close()
+
+    def _write_each(self, batch: List[Tuple[str, Tuple[Any, ...]]]) -> int:
+        # One connection for the whole pass. Rows rejected for their data
+        # are dropped; any other error propagates and keeps the batch
+        # queued (rows committed so far are upserted again, harmlessly).
+        from .extensions import db_pool
+
+        written = 0
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for jti, record in batch:
+                    try:
+                        cursor.execute(INSERT_SQL, record)
+                        conn.commit()
+                        written += 1
+                    except _ROW_ERRORS:
+                        conn.rollback()
+                        logger.exception("Dropping buffered login log for jti %s", jti)
+                        with self._lock:
+                            self.dropped += 1
+            finally:
+                cursor.close()
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "pending": len(self._pending),
+                "flushed": self.flushed,
+                "batches": self.batches,
+                "overflowed": self.overflowed,
+                "failures": self.failures,
+                "dropped": self.dropped,
+            }
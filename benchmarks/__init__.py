@@ -0,0 +1 @@
+"""Benchmarks and load tests; run against a seeded database (see `flask seed`)."""
@@ -0,0 +1,368 @@
+"""
+Concurrent load harness for the login-to-dashboard flows.
+
+    gunicorn -w 4 --threads 4 "app:create_app()" -b 127.0.0.1:8000 &
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 \
+        --users 50 --admin-ratio 0.1 --duration 60
+
+    python -m benchmarks.load --serve --users 20   # in-process threaded server
+
+Each virtual user runs one scenario in a loop on its own keep-alive HTTP
+connection until `--duration` is over:
+
+    partner: login -> dashboard -> leads list -> create lead
+    admin:   login -> dashboard -> leads filter -> status update -> payment release
+
+Accounts and ids come from the configured database, which should hold
+`flask seed` data (seeded partners and the bench admin share one password).
+Status updates and releases really write, so run it against a scratch
+database. Redirects are not followed; any 2xx / 3xx counts as success.
+
+Reports requests, errors, throughput and p50 / p95 / p99 latency per step,
+plus MySQL `Threads_connected` sampled every second while the test runs.
+Exits with status 1 when any request failed (including 503 "busy").
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from app import create_app
+from app.extensions import db_pool
+from app.seed import BENCH_ADMIN_EMAIL, SEED_PASSWORD
+
+from .models import percentile
+
+
+class Recorder:
+    """Thread-safe per-step latency / error collection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, step: str, elapsed: float, status: int) -> None:
+        with self._lock:
+            self.samples[step].append(elapsed * 1000.0)
+            self.statuses[step][status] += 1
+            if not 200 <= status < 400:
+                self.errors[step] += 1
+
+    def report(self, duration: float) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                step: {
+                    "requests": len(samples),
+                    "errors": self.errors[step],
+                    "rps": len(samples) / duration if duration else 0.0,
+                    "p50_ms": percentile(samples, 50),
+                    "p95_ms": percentile(samples, 95),
+                    "p99_ms": percentile(samples, 99),
+                    "max_ms": max(samples) if samples else 0.0,
+                    "statuses": dict(self.statuses[step]),
+                }
+                for step, samples in sorted(self.samples.items())
+            }
+
+
+class Client:
+    """One keep-alive connection with bearer auth; never follows redirects."""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.https = parts.scheme == "https"
+        self.timeout = timeout
+        self.token: Optional[str] = None
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            self._conn = cls(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def request(
+        self, method: str, path: str, json_body: Any = None, form: Any = None
+    ) -> Tuple[int, bytes]:
+        headers = {"User-Agent": "portal-load/1.0"}
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body)
+            headers["Content-Type"] = "application/json"
+        elif form is not None:
+            body = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        try:
+            conn = self._connection()
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            return 0, b""
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class Fixtures:
+    """Accounts and row ids the scenarios draw from (shared between users)."""
+
+    def __init__(self, partner_mobiles, partner_ids, lead_ids, payment_ids):
+        self.partner_mobiles = partner_mobiles
+        self.partner_ids = partner_ids
+        self._lead_ids = itertools.cycle(lead_ids or [0])
+        self._payment_ids = iter(payment_ids)
+        self._lock = threading.Lock()
+
+    def next_lead_id(self) -> int:
+        with self._lock:
+            return next(self._lead_ids)
+
+    def next_payment_id(self) -> Optional[int]:
+        # Each pending payment can be released once.
+        with self._lock:
+            return next(self._payment_ids, None)
+
+
+def load_fixtures(app, limit: int) -> Fixtures:
+    with app.app_context(), db_pool.connection() as conn:
+        cursor = conn.cursor()
+
+        def column(sql):
+            cursor.execute(sql, (limit,))
+            return [row[0] for row in cursor.fetchall()]
+
+        cursor.execute(
+            """
+            SELECT id, mobile FROM partners
+            WHERE status = 'active' AND is_deleted = 0
+            ORDER BY id DESC LIMIT %s
+            """,
+            (limit,),
+        )
+        partners = cursor.fetchall()
+        fixtures = Fixtures(
+            partner_mobiles=[mobile for _, mobile in partners],
+            partner_ids=[partner_id for partner_id, _ in partners],
+            lead_ids=column(
+                "SELECT id FROM leads WHERE lead_status = 'Pending' ORDER BY id DESC LIMIT %s"
+            ),
+            payment_ids=column(
+                "SELECT id FROM payments WHERE status = 'Pending' ORDER BY id DESC LIMIT %s"
+            ),
+        )
+        cursor.close()
+    if not fixtures.partner_mobiles:
+        raise SystemExit("No active partners found; run `flask seed` first.")
+    return fixtures
+
+
+def _step(
+    client: Client, recorder: Recorder, step: str, method: str, path: str, **kw
+) -> Tuple[int, bytes]:
+    started = time.perf_counter()
+    status, body = client.request(method, path, **kw)
+    recorder.record(step, time.perf_counter() - started, status)
+    return status, body
+
+
+def _login(client, recorder, step, path, payload) -> bool:
+    client.token = None
+    status, body = _step(client, recorder, step, "POST", path, json_body=payload)
+    if status != 200:
+        return False
+    client.token = json.loads(body).get("access_token")
+    return bool(client.token)
+
+
+def partner_scenario(client: Client, recorder: Recorder, fx: Fixtures, rng: random.Random):
+    mobile = rng.choice(fx.partner_mobiles)
+    if not _login(
+        client,
+        recorder,
+        "partner.login",
+        "/auth/partner-login",
+        {"mobile": mobile, "password": SEED_PASSWORD},
+    ):
+        return
+    _step(client, recorder, "partner.dashboard", "GET", "/partner/dashboard")
+    _step(client, recorder, "partner.leads_list", "GET", "/partner/leads")
+    _step(
+        client,
+        recorder,
+        "partner.create_lead",
+        "POST",
+        "/partner/leads/create",
+        form={
+            "student_name": f"Load Test {rng.randrange(10 ** 6)}",
+            "mobile": str(rng.randint(6000000000, 9999999999)),
+            "current_status": "Study",
+        },
+    )
+
+
+def admin_scenario(client: Client, recorder: Recorder, fx: Fixtures, rng: random.Random):
+    if not _login(
+        client,
+        recorder,
+        "admin.login",
+        "/auth/admin-login",
+        {"email": BENCH_ADMIN_EMAIL, "password": SEED_PASSWORD},
+    ):
+        return
+    _step(client, recorder, "admin.dashboard", "GET", "/admin/dashboard")
+    query = urlencode({"status": "Pending", "partner_id": rng.choice(fx.partner_ids)})
+    _step(client, recorder, "admin.leads_filter", "GET", f"/admin/leads?{query}")
+    _step(
+        client,
+        recorder,
+        "admin.status_update",
+        "POST",
+        f"/admin/leads/{fx.next_lead_id()}/status",
+        form={"status": "In-Process"},
+    )
+    payment_id = fx.next_payment_id()
+    if payment_id is not None:
+        _step(
+            client,
+            recorder,
+            "admin.payment_release",
+            "POST",
+            f"/admin/payments/{payment_id}/release",
+        )
+
+
+def monitor_connections(app, stop: threading.Event, samples: List[int]) -> None:
+    """Sample MySQL Threads_connected once a second (includes this monitor)."""
+    with app.app_context(), db_pool.connection() as conn:
+        cursor = conn.cursor()
+        while not stop.is_set():
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Threads_connected'")
+            row = cursor.fetchone()
+            if row:
+                samples.append(int(row[1]))
+            stop.wait(1.0)
+        cursor.close()
+
+
+def serve_in_process(app, port: int) -> str:
+    from werkzeug.serving import make_server
+
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="load-server", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--serve", action="store_true", help="Serve the app in this process.")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users.")
+    parser.add_argument("--admin-ratio", type=float, default=0.1, help="Share of admin users.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run.")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pause between scenarios.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout.")
+    parser.add_argument("--fixtures", type=int, default=1000, help="Accounts / ids to sample.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the report as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    fixtures = load_fixtures(app, args.fixtures)
+    base_url = serve_in_process(app, 0) if args.serve else args.base_url.rstrip("/")
+
+    recorder = Recorder()
+    stop = threading.Event()
+    connections: List[int] = []
+    monitor = threading.Thread(
+        target=monitor_connections, args=(app, stop, connections), daemon=True
+    )
+    monitor.start()
+
+    admins = round(args.users * args.admin_ratio)
+    deadline = time.monotonic() + args.duration
+
+    def virtual_user(index: int) -> None:
+        rng = random.Random(args.seed + index)
+        scenario = admin_scenario if index < admins else partner_scenario
+        client = Client(base_url, args.timeout)
+        try:
+            while time.monotonic() < deadline:
+                scenario(client, recorder, fixtures, rng)
+                if args.think_time:
+                    time.sleep(args.think_time)
+        finally:
+            client.close()
+
+    print(f"{args.users} users ({admins} admin) for {args.duration:.0f}s against {base_url}")
+    started = time.monotonic()
+    users = [
+        threading.Thread(target=virtual_user, args=(i,), name=f"user-{i}")
+        for i in range(args.users)
+    ]
+    for thread in users:
+        thread.start()
+    for thread in users:
+        thread.join()
+    elapsed = time.monotonic() - started
+    stop.set()
+    monitor.join(timeout=5)
+
+    steps = recorder.report(elapsed)
+    total = sum(step["requests"] for step in steps.values())
+    print(
+        f"{'step':26s} {'reqs':>7s} {'errs':>6s} {'rps':>8s} "
+        f"{'p50':>8s} {'p95':>8s} {'p99':>8s}"
+    )
+    for name, step in steps.items():
+        print(
+            f"{name:26s} {step['requests']:7d} {step['errors']:6d} {step['rps']:8.1f} "
+            f"{step['p50_ms']:8.1f} {step['p95_ms']:8.1f} {step['p99_ms']:8.1f}"
+        )
+    print(f"total {total} requests, {total / elapsed:.1f} req/s over {elapsed:.1f}s")
+    if connections:
+        print(
+            f"MySQL Threads_connected: max {max(connections)}, "
+            f"avg {sum(connections) / len(connections):.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "users": args.users,
+                    "admin_users": admins,
+                    "duration_s": elapsed,
+                    "requests": total,
+                    "rps": total / elapsed if elapsed else 0.0,
+                    "steps": steps,
+                    "threads_connected": {
+                        "max": max(connections) if connections else None,
+                        "samples": connections,
+                    },
+                },
+                fh,
+                indent=2,
+            )
+    return 1 if any(step["errors"] for step in steps.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
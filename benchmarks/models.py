@@ -0,0 +1,350 @@
+"""
+Micro-benchmarks for the model layer.
+
+    python -m benchmarks.models --sizes 10000,100000,1000000 \
+        --output bench.json --baseline bench-baseline.json --max-regression 20
+
+Each model function runs `--iterations` times on one connection whose
+`commit()` is disabled and which is rolled back after every call, so write
+functions (status updates, payment creation / release) are measured
+without changing the data. The per-worker caches are disabled so lookups
+really reach MySQL.
+
+With `--sizes`, the database is topped up with `flask seed` data to each
+lead count in turn (rows are appended and kept), and the suite runs once
+per size. Without it the current database is measured as-is.
+
+Results (p50 / p95 / p99 / mean latency, statements per call, rows
+returned) are written as JSON. With `--baseline`, a function whose
+`--metric` latency grew by more than `--max-regression` percent (and by
+at least `--min-delta-ms`) fails the run with exit status 1.
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import g
+
+from app import create_app
+from app.extensions import account_cache, db_pool, model_cache, partner_directory, token_cache
+from app.instrumentation import add_query_listener, instrument, remove_query_listener
+
+Case = Tuple[str, Callable[..., Any], tuple, dict, Optional[Callable[[], Any]]]
+
+
+class _NoCommitConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def commit(self):
+        # Every iteration is rolled back by the runner.
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (which need not be sorted)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100.0 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def _row_count(result: Any) -> int:
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return len(result[0])  # (rows, cursor...) / (rows, total)
+    if isinstance(result, list):
+        return len(result)
+    return 0 if result is None else 1
+
+
+def _scalar(conn, sql: str, params: tuple = ()) -> Any:
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    row = cursor.fetchone()
+    cursor.close()
+    return row[0] if row else None
+
+
+def sample_ids(conn) -> Dict[str, Any]:
+    """Representative ids; partner cases use the partner with the most leads."""
+    return {
+        "admin_email": _scalar(conn, "SELECT email FROM admins ORDER BY id LIMIT 1"),
+        "partner_id": _scalar(
+            conn,
+            """
+            SELECT partner_id FROM leads
+            GROUP BY partner_id ORDER BY COUNT(*) DESC LIMIT 1
+            """,
+        )
+        or 1,
+        "pending_lead_id": _scalar(
+            conn, "SELECT id FROM leads WHERE lead_status = 'Pending' ORDER BY id DESC LIMIT 1"
+        )
+        or 1,
+        "mobile": _scalar(conn, "SELECT mobile FROM leads ORDER BY id DESC LIMIT 1") or "0",
+        "pending_payment_id": _scalar(
+            conn, "SELECT id FROM payments WHERE status = 'Pending' ORDER BY id DESC LIMIT 1"
+        )
+        or 1,
+        "jti": _scalar(conn, "SELECT jti FROM login_logs ORDER BY id DESC LIMIT 1") or "none",
+    }
+
+
+def model_cases(ids: Dict[str, Any]) -> List[Case]:
+    """(name, function, args, kwargs, setup) for every benchmarked model call."""
+    from app.models import admin_model, data_version_model, lead_model
+    from app.models import login_log_model, partner_model, payment_model
+
+    partner_id = ids["partner_id"]
+    lead_id = ids["pending_lead_id"]
+
+    def convert_lead():
+        # Runs inside the iteration's transaction, before the timer starts.
+        lead_model.update_lead_status(lead_id, "Converted", "admin", 0)
+
+    def case(name, fn, *args, setup=None, **kwargs) -> Case:
+        return name, fn, args, kwargs, setup
+
+    return [
+        case("admin.get_admin_by_email", admin_model.get_admin_by_email, ids["admin_email"]),
+        case("partner.get_partner_by_id", partner_model.get_partner_by_id, partner_id),
+        case("partner.is_partner_active", partner_model.is_partner_active, partner_id),
+        case("partner.list_partners", partner_model.list_partners),
+        case("partner.list_partners[status]", partner_model.list_partners, status="active"),
+        case("partner.list_partners[search]", partner_model.list_partners, search="Sha"),
+        case("partner.count_active_partners", partner_model.count_active_partners),
+        case("partner.count_partners[status]", partner_model.count_partners, "active"),
+        case("partner.lookup_partners[name]", partner_model.lookup_partners, "Sha"),
+        case("partner.lookup_partners[mobile]", partner_model.lookup_partners, "90000"),
+        case("partner.get_partner_name", partner_model.get_partner_name, partner_id),
+        case("lead.list_leads_admin", lead_model.list_leads_admin),
+        case("lead.list_leads_admin[status]", lead_model.list_leads_admin, status="Pending"),
+        case(
+            "lead.list_leads_admin[partner]", lead_model.list_leads_admin, partner_id=partner_id
+        ),
+        case(
+            "lead.list_leads_admin[search mobile]",
+            lead_model.list_leads_admin,
+            search=ids["mobile"][:5],
+        ),
+        case("lead.list_leads_admin[search name]", lead_model.list_leads_admin, search="Sharma"),
+        case("lead.list_leads_for_partner", lead_model.list_leads_for_partner, partner_id),
+        case("lead.get_mobile_owner", lead_model.get_mobile_owner, ids["mobile"]),
+        case(
+            "lead.create_lead_for_partner",
+            lead_model.create_lead_for_partner,
+            partner_id,
+            "Bench Student",
+            ids["mobile"],
+            None,
+            None,
+            "Study",
+        ),
+        case(
+            "lead.create_lead_for_partner[new mobile]",
+            lead_model.create_lead_for_partner,
+            partner_id,
+            "Bench Student",
+            "0000000000",
+            None,
+            None,
+            "Study",
+        ),
+        case(
+            "lead.update_lead_status",
+            lead_model.update_lead_status,
+            lead_id,
+            "In-Process",
+            "admin",
+            0,
+        ),
+        case("lead.get_admin_lead_metrics", lead_model.get_admin_lead_metrics),
+        case("lead.get_partner_leaderboard", lead_model.get_partner_leaderboard),
+        case("lead.get_partner_lead_metrics", lead_model.get_partner_lead_metrics, partner_id),
+        case("payment.list_payments_admin", payment_model.list_payments_admin),
+        case(
+            "payment.list_payments_for_partner",
+            payment_model.list_payments_for_partner,
+            partner_id,
+        ),
+        case("payment.get_admin_payment_metrics", payment_model.get_admin_payment_metrics),
+        case(
+            "payment.get_partner_payment_metrics",
+            payment_model.get_partner_payment_metrics,
+            partner_id,
+        ),
+        case(
+            "payment.create_payment_for_conversion",
+            payment_model.create_payment_for_conversion,
+            lead_id,
+            partner_id,
+            setup=convert_lead,
+        ),
+        case(
+            "payment.mark_payment_released",
+            payment_model.mark_payment_released,
+            ids["pending_payment_id"],
+        ),
+        case("login_log.is_token_active", login_log_model.is_token_active, ids["jti"]),
+        case(
+            "data_version.get_data_versions",
+            data_version_model.get_data_versions,
+            ["leads", "payments", "partners"],
+        ),
+    ]
+
+
+def run_suite(iterations: int, warmup: int, only: Optional[str] = None) -> Dict[str, Any]:
+    """Run every case; must be called inside an app context."""
+    queries = [0]
+
+    def count_query(event):
+        queries[0] += 1
+
+    token_cache.configure(ttl=0)
+    account_cache.configure(ttl=0)
+    partner_directory.configure(ttl=0)
+    model_cache.enabled = False
+    add_query_listener(count_query)
+    conn = db_pool.acquire()
+    results: Dict[str, Any] = {}
+    try:
+        ids = sample_ids(conn)
+        g.db = _NoCommitConnection(instrument(conn))
+        for name, fn, args, kwargs, setup in model_cases(ids):
+            if only and only not in name:
+                continue
+            samples: List[float] = []
+            statements = rows = 0
+            for i in range(warmup + iterations):
+                if setup is not None:
+                    setup()
+                queries[0] = 0
+                started = time.perf_counter()
+                result = fn(*args, **kwargs)
+                elapsed = time.perf_counter() - started
+                conn.rollback()
+                if i >= warmup:
+                    samples.append(elapsed * 1000.0)
+                    statements, rows = queries[0], _row_count(result)
+            results[name] = {
+                "iterations": len(samples),
+                "p50_ms": percentile(samples, 50),
+                "p95_ms": percentile(samples, 95),
+                "p99_ms": percentile(samples, 99),
+                "mean_ms": sum(samples) / len(samples) if samples else 0.0,
+                "queries": statements,
+                "rows": rows,
+            }
+    finally:
+        remove_query_listener(count_query)
+        g.pop("db", None)
+        conn.rollback()
+        db_pool.release(conn)
+    return results
+
+
+def top_up(target_leads: int, seed_value: int) -> None:
+    """Append seed data until the leads table holds `target_leads` rows."""
+    from app.extensions import get_db
+    from app.seed import seed
+
+    missing = target_leads - _scalar(get_db(), "SELECT COUNT(*) FROM leads")
+    if missing > 0:
+        seed(
+            partners=max(missing // 100, 1),
+            leads=missing,
+            login_logs=missing,
+            seed_value=seed_value + target_leads,
+        )
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    metric: str,
+    max_regression: float,
+    min_delta_ms: float,
+) -> List[str]:
+    """Regression messages for cases slower than the baseline (same dataset)."""
+    failures = []
+    for dataset, cases in results.items():
+        for name, current in cases.items():
+            before = baseline.get(dataset, {}).get(name)
+            if not before or not before.get(metric):
+                continue
+            old, new = before[metric], current[metric]
+            change = (new - old) / old * 100.0
+            if change > max_regression and new - old >= min_delta_ms:
+                failures.append(
+                    f"{dataset} {name}: {metric} {old:.2f} ms -> {new:.2f} ms (+{change:.0f}%)"
+                )
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", help="Comma-separated lead counts to seed up to and measure.")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", help="Only run cases whose name contains this text.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for --sizes top-ups.")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--baseline", help="Earlier --output file to compare against.")
+    parser.add_argument(
+        "--metric", choices=("p50_ms", "p95_ms", "p99_ms", "mean_ms"), default="p95_ms"
+    )
+    parser.add_argument(
+        "--max-regression", type=float, default=20.0, help="Allowed slowdown, in percent."
+    )
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore smaller slowdowns.")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else [None]
+    datasets: Dict[str, Any] = {}
+    for size in sorted(sizes, key=lambda s: s or 0):
+        with app.app_context():
+            if size is not None:
+                top_up(size, args.seed)
+        with app.app_context():
+            label = f"leads={size}" if size is not None else "current"
+            print(f"== {label}")
+            datasets[label] = run_suite(args.iterations, args.warmup, args.only)
+            for name, r in datasets[label].items():
+                print(
+                    f"  {name:42s} p50 {r['p50_ms']:8.2f}  p95 {r['p95_ms']:8.2f}  "
+                    f"p99 {r['p99_ms']:8.2f} ms  {r['queries']:3d} q  {r['rows']:5d} rows"
+                )
+
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(
+            {"created_at": datetime.utcnow().isoformat(timespec="seconds"), "results": datasets},
+            fh,
+            indent=2,
+        )
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)["results"]
+        failures = compare(datasets, baseline, args.metric, args.max_regression, args.min_delta_ms)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            return 1
+        print(f"No regressions over {args.max_regression:.0f}% on {args.metric}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
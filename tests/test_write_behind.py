@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from app.db_pool import PoolTimeoutError
+from app.write_behind import LoginLogBuffer
+
+
+def _buffer_with(jti):
+    buffer = LoginLogBuffer()
+    buffer.enabled = True
+    # Pretend this process's flusher is running so no thread is started.
+    buffer._thread_pid = os.getpid()
+    record = ("partner", 1, "127.0.0.1", "pytest", jti, None, None, 1)
+    assert buffer.add(jti, record)
+    return buffer
+
+
+def test_buffered_jti_survives_pool_timeout():
+    buffer = _buffer_with("jti-1")
+
+    def pool_exhausted(records):
+        raise PoolTimeoutError("Timed out waiting for a database connection.")
+
+    buffer._write = pool_exhausted
+    for _ in range(5):
+        with pytest.raises(PoolTimeoutError):
+            buffer.flush()
+
+    assert buffer.lookup("jti-1") is True
+    assert buffer.stats()["pending"] == 1
+    assert buffer.stats()["dropped"] == 0
+
+    written = []
+    buffer._write = written.extend
+    assert buffer.flush() == 1
+    assert written[0][4] == "jti-1"
+    assert buffer.lookup("jti-1") is None